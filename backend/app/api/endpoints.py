@@ -2,62 +2,182 @@
 API endpoints for video ingestion and conversational chat.
 
 Provides RESTful interface for:
-- POST /ingest: Process YouTube video and store transcript
+- POST /ingest: Queue a YouTube video for background transcript indexing
+- GET /jobs/{job_id}: Poll ingestion stage, progress, chat readiness and errors
 - POST /chat: Query ingested video content via RAG pipeline
+- POST /chat/stream: Same as /chat, streaming answer tokens as Server-Sent Events
+- POST /chat/batch: Answer many questions about one video in a single request
+- GET /videos: List videos currently warm in the vector catalog
+- GET /admission: Chat and ingest queue depth, limits and wait times
+- GET /metrics: Prometheus stage latencies and pipeline counters
+
+Ingest and chat are admitted through separate bounded pools; a request
+that does not fit is shed with 503 and a Retry-After header (see
+Overloaded in main.py) rather than queuing until the client times out.
 """
 
 from fastapi import APIRouter, HTTPException
-from backend.app.models.schemas import IngestRequest, IngestResponse, ChatRequest, ChatResponse
-from backend.app.services.ingestion import IngestionService
-from backend.app.services.rag_service import RAGService
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+import json
+import time
+from backend.app.core import config, metrics
+from backend.app.models.schemas import (
+    IngestRequest, IngestResponse, JobStatusResponse, ChatRequest, ChatResponse,
+    ChatBatchRequest, ChatBatchItem, ChatBatchResponse,
+)
+from backend.app.services.admission import AdmissionPool
+from backend.app.services.caption_dedup import DedupStats
+from backend.app.services.job_queue import IngestionJob, IngestionJobQueue
+from backend.app.services.service_container import ServiceContainer
 
 router = APIRouter()
 
-# Singleton service instances for POC
+# Singleton service instances for POC, built on first use (or by the startup
+# warm-up) so importing this module stays cheap on cold starts
 # Production: Consider dependency injection or session-based instances
-ingestion_service = IngestionService()
-rag_service = RAGService()
+services = ServiceContainer()
+
+# Chat requests (a batch counts as one) beyond the pool's concurrency wait in
+# a bounded queue; ingest jobs yield to them (see ingestion_jobs below)
+chat_admission = AdmissionPool(
+    "chat",
+    max_concurrency=config.CHAT_MAX_CONCURRENCY,
+    max_queue=config.CHAT_QUEUE_MAX,
+    queue_timeout_s=config.CHAT_QUEUE_TIMEOUT_SECONDS,
+)
+
+def _run_ingestion(job: IngestionJob):
+    """
+    Background ingestion runner executed by the job queue's worker pool.
+    
+    Updates the job's stage and chunk progress as the pipeline advances.
+    """
+    with metrics.stage("ingest", "total"):
+        # Extract transcript and chunk for optimal retrieval
+        job.stage = "fetching_transcript"
+        dedup_stats = DedupStats()
+        chunks = services.ingestion.process_video(
+            job.url, chunk_size=job.chunk_size, chunk_overlap=job.chunk_overlap, dedup_stats=dedup_stats
+        )
+        if config.CAPTION_DEDUP_ENABLED:
+            job.dedup = dedup_stats.to_dict()
+        
+        # Store chunks in vector database with embeddings
+        ingestion_jobs.yield_to_priority()
+        job.stage = "embedding"
+        job.chunks_total = len(chunks)
+        
+        def on_progress(embedded: int, total: int):
+            job.chunks_embedded = embedded
+        
+        def on_searchable():
+            # Chat opens here, possibly while the rest is still embedding
+            job.chat_ready_at = time.time()
+        
+        services.rag.ingest_chunks(job.video_id, chunks, on_progress=on_progress, on_searchable=on_searchable)
+        
+        # Optional summary tree for whole-video questions
+        build_summary = job.build_summary if job.build_summary is not None else config.SUMMARY_INDEX_ENABLED
+        if build_summary:
+            ingestion_jobs.yield_to_priority()
+            job.stage = "summarizing"
+            services.rag.build_summary(job.video_id, chunks)
+
+ingestion_jobs = IngestionJobQueue(
+    runner=_run_ingestion,
+    max_workers=config.INGEST_WORKERS,
+    history_limit=config.INGEST_JOB_HISTORY,
+    max_queued=config.INGEST_QUEUE_MAX,
+    yield_to=chat_admission,
+    max_yield_s=config.INGEST_YIELD_MAX_SECONDS,
+)
+
+async def _require_video(rag_service, video_id: str):
+    """
+    Raise 400 unless the video can be chatted with (resident, or restorable from a snapshot).
+    
+    A video still being embedded below CHAT_MIN_INDEXED_FRACTION gets its
+    progress in the detail instead of "not ingested".
+    """
+    if await rag_service.vector_store_service.ahas_video(video_id):
+        return
+    job = ingestion_jobs.active_for(video_id)
+    if job is not None:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Video is still being indexed ({job.chunks_embedded}/{job.chunks_total} chunks); "
+                f"chat opens at {config.CHAT_MIN_INDEXED_FRACTION:.0%}."
+            ),
+        )
+    raise HTTPException(
+        status_code=400, 
+        detail="Video not ingested. Please ingest the video first."
+    )
 
-@router.post("/ingest", response_model=IngestResponse)
+@router.post("/ingest", response_model=IngestResponse, status_code=202)
 async def ingest_video(request: IngestRequest):
     """
-    Extract and store YouTube video transcript for semantic search.
+    Queue a YouTube video for transcript extraction and indexing.
     
-    Process flow:
-        1. Validate YouTube URL format
-        2. Fetch transcript using yt-dlp
-        3. Split into semantic chunks
-        4. Generate embeddings and store in vector database
+    Process flow (in the background worker pool):
+        1. Fetch transcript using yt-dlp
+        2. Split into semantic chunks
+        3. Generate embeddings and store in vector database
+        4. Optionally summarize sections into a summary tree (build_summary)
         
     Args:
-        request: IngestRequest containing YouTube URL
+        request: IngestRequest containing YouTube URL and optional
+            chunk_size/chunk_overlap/build_summary overrides
         
     Returns:
-        IngestResponse with success message and video ID
+        IngestResponse with the job ID to poll via GET /jobs/{job_id}
         
     Raises:
-        HTTPException 500: If transcript extraction or storage fails
+        HTTPException 400: If the URL is not a valid YouTube URL
+        Overloaded (503): If INGEST_QUEUE_MAX jobs are already waiting
         
     Note:
-        This overwrites any previously ingested video (single-video limitation).
-        For multi-video support, implement session-based vector stores.
+        Returns immediately. A submission for a video that already has a
+        queued or running job returns that job instead of starting another.
+        Each video gets its own collection in the vector catalog; other
+        videos stay warm until evicted by the catalog's LRU budget.
     """
-    try:
-        # Extract transcript and chunk for optimal retrieval
-        chunks = ingestion_service.process_video(request.url)
-        
-        # Store chunks in vector database with embeddings
-        rag_service.ingest_chunks(chunks)
-        
-        # Extract video ID for response tracking
-        video_id = ingestion_service._extract_video_id(request.url)
+    # Video ID keys the per-video collection in the catalog
+    ingestion_service = await services.aingestion()
+    video_id = ingestion_service._extract_video_id(request.url)
+    if not video_id:
+        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
+    
+    job, created = ingestion_jobs.submit(
+        video_id, request.url, chunk_size=request.chunk_size, chunk_overlap=request.chunk_overlap,
+        build_summary=request.build_summary,
+    )
+    
+    return IngestResponse(
+        message="Ingestion queued" if created else "Ingestion already in progress",
+        video_id=video_id,
+        job_id=job.job_id,
+        status=job.status,
+    )
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """
+    Report the progress of a background ingestion job.
+    
+    Returns:
+        JobStatusResponse with status, stage, chunks embedded/total, when
+        chat became available (chat_ready_at) and error
         
-        return IngestResponse(
-            message="Video ingested successfully", 
-            video_id=video_id or "unknown"
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    Raises:
+        HTTPException 404: If the job ID is unknown (or aged out of history)
+    """
+    job = ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobStatusResponse(**job.to_dict())
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
@@ -71,26 +191,198 @@ async def chat(request: ChatRequest):
         4. Return answer in speaker's tone
         
     Args:
-        request: ChatRequest containing user question
+        request: ChatRequest containing user question and target video ID
         
     Returns:
-        ChatResponse with AI-generated answer
+        ChatResponse with AI-generated answer and the fraction of the video
+        indexed when it was answered (coverage)
         
     Raises:
-        HTTPException 400: If no video has been ingested yet
+        HTTPException 400: If the video has not been ingested (or was evicted),
+            or is still below CHAT_MIN_INDEXED_FRACTION
+        Overloaded (503): If the chat pool and its queue are full, or the wait times out
         
     Note:
         Answers are strictly grounded in transcript context to prevent hallucination.
         System prompt enforces first-person perspective matching video speaker.
+        A video being ingested can be chatted with once CHAT_MIN_INDEXED_FRACTION
+        of its chunks are embedded; such answers have coverage below 1.0.
     """
-    # Validate that vector store has been populated
-    if not rag_service.vector_store_service.vector_store:
+    rag_service = await services.arag()
+    # Validate that the requested video is resident in the catalog
+    await _require_video(rag_service, request.video_id)
+    
+    # Execute RAG pipeline off the event loop: retrieve + generate
+    async with chat_admission.aslot():
+        result = await rag_service.aask_question(request.question, request.video_id)
+    
+    return ChatResponse(
+        answer=result.answer, cached=result.cached, sources=result.sources, coverage=result.coverage
+    )
+
+@router.post("/chat/batch", response_model=ChatBatchResponse)
+async def chat_batch(request: ChatBatchRequest):
+    """
+    Answer a batch of questions about one ingested video.
+    
+    Process flow:
+        1. Embed all questions in one batched embedding request
+        2. Retrieve context for every question in one vectorized search
+        3. Generate answers concurrently (CHAT_BATCH_CONCURRENCY at a time)
+        
+    Args:
+        request: ChatBatchRequest with the video ID and questions
+        
+    Returns:
+        ChatBatchResponse with one item per question, in request order;
+        a failed item carries error instead of failing the whole batch
+        
+    Raises:
+        HTTPException 400: If the video has not been ingested (or was evicted)
+            or the batch exceeds CHAT_BATCH_MAX_QUESTIONS
+        Overloaded (503): If the chat pool and its queue are full, or the wait times out
+    """
+    if len(request.questions) > config.CHAT_BATCH_MAX_QUESTIONS:
         raise HTTPException(
-            status_code=400, 
-            detail="No video ingested. Please ingest a video first."
+            status_code=400,
+            detail=f"Too many questions: at most {config.CHAT_BATCH_MAX_QUESTIONS} per batch",
         )
+    rag_service = await services.arag()
+    await _require_video(rag_service, request.video_id)
     
-    # Execute RAG pipeline: retrieve + generate
-    answer = rag_service.ask_question(request.question)
+    started = time.perf_counter()
+    async with chat_admission.aslot():
+        results = await rag_service.aask_batch(request.questions, request.video_id)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    failed = sum(1 for result in results if result.error)
+    print(f"Chat batch for {request.video_id}: {len(results)} questions, {failed} failed, {elapsed_ms:.0f}ms")
+    
+    return ChatBatchResponse(
+        video_id=request.video_id,
+        answers=[
+            ChatBatchItem(
+                question=question,
+                answer=result.answer,
+                cached=result.cached,
+                sources=result.sources,
+                error=result.error,
+            )
+            for question, result in zip(request.questions, results)
+        ],
+        coverage=min(result.coverage for result in results),
+    )
+
+def _sse_event(event: str, data: dict) -> str:
+    """Encode one Server-Sent Event frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Stream a RAG answer token-by-token over Server-Sent Events.
     
-    return ChatResponse(answer=answer)
+    Event stream:
+        - token: {"text": "..."} for each LLM output fragment
+        - done:  {"ttft_ms": ..., "total_ms": ..., "cached": bool, "sources": [...],
+                  "coverage": float} once generation finishes
+        - error: {"detail": "..."} if generation fails mid-stream
+        
+    Args:
+        request: ChatRequest containing user question and target video ID
+        
+    Returns:
+        text/event-stream response
+        
+    Raises:
+        HTTPException 400: If the video has not been ingested (or was evicted)
+        Overloaded (503): If the chat pool and its queue are full, or the wait times out
+        
+    Note:
+        Tokens are sent as soon as retrieval finishes and Gemini starts producing
+        output. Time-to-first-token is tracked separately from total latency.
+    """
+    rag_service = await services.arag()
+    await _require_video(rag_service, request.video_id)
+    
+    # Admitted before the 200 is sent; the slot is held until the stream ends
+    await chat_admission.aacquire()
+    admission = chat_admission.ticket()
+    
+    def event_stream():
+        # Sync generator: Starlette iterates it in a worker thread, so the
+        # blocking retrieval/LLM calls never stall the event loop
+        try:
+            yield from answer_events()
+        finally:
+            admission.release()
+    
+    def answer_events():
+        started = time.perf_counter()
+        ttft_ms = None
+        cached = False
+        sources = []
+        coverage = 1.0
+        try:
+            streamed = rag_service.stream_answer(request.question, request.video_id)
+            cached = streamed.cached
+            sources = streamed.sources
+            coverage = streamed.coverage
+            for token in streamed.tokens:
+                if ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - started) * 1000
+                yield _sse_event("token", {"text": token})
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Error generating answer: {str(e)}"})
+            return
+        total_ms = (time.perf_counter() - started) * 1000
+        print(f"Chat stream for {request.video_id}: ttft={ttft_ms or total_ms:.0f}ms total={total_ms:.0f}ms cached={cached}")
+        yield _sse_event("done", {
+            "ttft_ms": round(ttft_ms or total_ms, 1),
+            "total_ms": round(total_ms, 1),
+            "cached": cached,
+            "sources": sources,
+            "coverage": coverage,
+        })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also covers a stream that never started (client gone); release is idempotent
+        background=BackgroundTask(admission.release),
+    )
+
+@router.get("/videos")
+async def list_videos():
+    """
+    List videos currently warm in the vector catalog.
+    
+    Returns:
+        dict: Video IDs (least to most recently used) and catalog occupancy
+    """
+    rag_service = await services.arag()
+    catalog = rag_service.vector_store_service.catalog
+    return {"video_ids": catalog.video_ids(), "catalog": catalog.stats()}
+
+@router.get("/admission")
+async def admission_status():
+    """
+    Report admission pools: running, queued and limits, plus recent waits.
+    
+    Returns:
+        dict: Per pool (chat, ingest) active/queued counts, limits, admitted
+            and rejected totals, and average/p95 queue wait in ms
+    """
+    return {"chat": chat_admission.status(), "ingest": ingestion_jobs.status()}
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus scrape endpoint.
+    
+    Exposes videotwin_stage_seconds{pipeline,stage} histograms for ingest,
+    embed and chat stages, plus counters for embedding requests, retries,
+    429s, backoff time, chunks embedded and cache hits/misses.
+    """
+    payload, content_type = metrics.render()
+    return Response(content=payload, media_type=content_type)
@@ -0,0 +1,172 @@
+"""
+Runtime configuration for the Video Twin backend.
+
+All settings are read from environment variables so the same image can be
+tuned per deployment (Cloud Run env vars locally mirrored in backend/.env).
+"""
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to default."""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"⚠ Invalid integer for {name}={value!r}, using {default}")
+        return default
+
+
+# Cloud Run instances have read-only root filesystem
+# /tmp is the only writable location for ephemeral storage
+CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "/tmp/chroma_db")
+
+# Vector catalog budget: how many videos stay warm on one instance.
+# Eviction is least-recently-used once either limit is exceeded.
+VECTOR_CATALOG_MAX_VIDEOS = _env_int("VECTOR_CATALOG_MAX_VIDEOS", 20)
+VECTOR_CATALOG_MAX_BYTES = _env_int("VECTOR_CATALOG_MAX_BYTES", 256 * 1024 * 1024)
+
+# text-embedding-004 output dimensionality, used for memory estimates
+EMBEDDING_DIMENSIONS = _env_int("EMBEDDING_DIMENSIONS", 768)
+
+# Persistent embedding cache (content-addressed by model/task_type/text hash)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "/tmp/embedding_cache/embeddings.sqlite3")
+EMBEDDING_CACHE_MAX_BYTES = _env_int("EMBEDDING_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+
+# Embedding pipeline: initial values adapt (AIMD) to observed 429s
+EMBED_REQUESTS_PER_SECOND = float(os.getenv("EMBED_REQUESTS_PER_SECOND", "1.0"))
+EMBED_MAX_REQUESTS_PER_SECOND = float(os.getenv("EMBED_MAX_REQUESTS_PER_SECOND", "10.0"))
+EMBED_CONCURRENCY = _env_int("EMBED_CONCURRENCY", 2)
+EMBED_MAX_CONCURRENCY = _env_int("EMBED_MAX_CONCURRENCY", 8)
+EMBED_BATCH_SIZE = _env_int("EMBED_BATCH_SIZE", 20)
+EMBED_MIN_BATCH_SIZE = _env_int("EMBED_MIN_BATCH_SIZE", 5)
+EMBED_MAX_BATCH_SIZE = _env_int("EMBED_MAX_BATCH_SIZE", 100)
+EMBED_MAX_RETRIES = _env_int("EMBED_MAX_RETRIES", 5)
+
+# Semantic answer cache: reuse answers to near-identical questions per video
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+ANSWER_CACHE_TTL_SECONDS = _env_int("ANSWER_CACHE_TTL_SECONDS", 3600)
+ANSWER_CACHE_MAX_PER_VIDEO = _env_int("ANSWER_CACHE_MAX_PER_VIDEO", 256)
+ANSWER_CACHE_MAX_ENTRIES = _env_int("ANSWER_CACHE_MAX_ENTRIES", 4096)
+
+# Background ingestion: concurrent jobs and finished jobs kept for polling
+INGEST_WORKERS = _env_int("INGEST_WORKERS", 2)
+INGEST_JOB_HISTORY = _env_int("INGEST_JOB_HISTORY", 500)
+
+# Progressive ingestion: embedded batches are searchable as they land, and a
+# new video opens for chat once this fraction of its chunks is indexed (1.0 =
+# only after the whole video). Answers report the fraction they were drawn from.
+CHAT_MIN_INDEXED_FRACTION = float(os.getenv("CHAT_MIN_INDEXED_FRACTION", "0.2"))
+
+# Admission control: beyond these limits requests are shed with 503 +
+# Retry-After instead of queuing until clients time out. Chat has priority:
+# ingests about to start (and between stages) wait while chat requests are
+# queued, for at most INGEST_YIELD_MAX_SECONDS, and summary building only
+# gets an LLM slot no chat call is waiting for.
+CHAT_MAX_CONCURRENCY = _env_int("CHAT_MAX_CONCURRENCY", 32)
+CHAT_QUEUE_MAX = _env_int("CHAT_QUEUE_MAX", 64)
+CHAT_QUEUE_TIMEOUT_SECONDS = float(os.getenv("CHAT_QUEUE_TIMEOUT_SECONDS", "10"))
+INGEST_QUEUE_MAX = _env_int("INGEST_QUEUE_MAX", 20)
+INGEST_YIELD_MAX_SECONDS = float(os.getenv("INGEST_YIELD_MAX_SECONDS", "5"))
+
+# Chat path: executor threads for blocking retrieval/LLM work and a cap on
+# concurrent Gemini calls (excess requests wait for a free slot)
+CHAT_WORKERS = _env_int("CHAT_WORKERS", 32)
+LLM_MAX_CONCURRENCY = _env_int("LLM_MAX_CONCURRENCY", 16)
+
+# Context assembly: retrieval candidates per question, merged/de-duplicated
+# and selected by score gap under an estimated token budget
+CONTEXT_CANDIDATES = _env_int("CONTEXT_CANDIDATES", 8)
+CONTEXT_TOKEN_BUDGET = _env_int("CONTEXT_TOKEN_BUDGET", 1200)
+CONTEXT_MIN_CHUNKS = _env_int("CONTEXT_MIN_CHUNKS", 2)
+CONTEXT_SCORE_GAP = float(os.getenv("CONTEXT_SCORE_GAP", "0.3"))
+CONTEXT_DEDUP_SIMILARITY = float(os.getenv("CONTEXT_DEDUP_SIMILARITY", "0.8"))
+CHARS_PER_TOKEN = float(os.getenv("CHARS_PER_TOKEN", "4"))
+
+# /chat/batch: questions accepted per request and concurrent generations per batch
+CHAT_BATCH_MAX_QUESTIONS = _env_int("CHAT_BATCH_MAX_QUESTIONS", 500)
+CHAT_BATCH_CONCURRENCY = _env_int("CHAT_BATCH_CONCURRENCY", 8)
+
+# On-disk transcript cache: skips yt-dlp entirely for recently fetched videos
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "true").lower() == "true"
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", "/tmp/transcript_cache")
+TRANSCRIPT_CACHE_TTL_SECONDS = _env_int("TRANSCRIPT_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+TRANSCRIPT_CACHE_MAX_BYTES = _env_int("TRANSCRIPT_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+# Transcript fetch client (one per process): cookies are prepared once and
+# subtitle downloads share a pooled HTTP session with timeouts and retries
+TRANSCRIPT_HTTP_TIMEOUT_SECONDS = float(os.getenv("TRANSCRIPT_HTTP_TIMEOUT_SECONDS", "15"))
+TRANSCRIPT_HTTP_RETRIES = _env_int("TRANSCRIPT_HTTP_RETRIES", 3)
+TRANSCRIPT_HTTP_POOL_SIZE = _env_int("TRANSCRIPT_HTTP_POOL_SIZE", 10)
+
+# Caption dedup between parsing and chunking: exact repeated segments and
+# rolling-window repeats (auto captions) of at least CAPTION_DEDUP_MIN_WORDS
+# words are dropped, and chunks whose MinHash similarity to an earlier chunk
+# reaches CAPTION_DEDUP_NEAR_THRESHOLD are not embedded
+CAPTION_DEDUP_ENABLED = os.getenv("CAPTION_DEDUP_ENABLED", "true").lower() == "true"
+CAPTION_DEDUP_MIN_WORDS = _env_int("CAPTION_DEDUP_MIN_WORDS", 3)
+CAPTION_DEDUP_NEAR_THRESHOLD = float(os.getenv("CAPTION_DEDUP_NEAR_THRESHOLD", "0.85"))
+
+# Transcript chunking defaults (overridable per ingest request)
+CHUNK_SIZE = _env_int("CHUNK_SIZE", 1000)
+CHUNK_OVERLAP = _env_int("CHUNK_OVERLAP", 200)
+
+# Vector backend: "numpy" (in-process flat index, saved under VECTOR_INDEX_DIR;
+# set it empty to keep indexes in memory only) or "chroma"
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "numpy").lower()
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", "/tmp/vector_index")
+
+# Quantized vector storage for the numpy backend: "none" (float32), "float16"
+# or "int8" (per-vector scale). Searches scan the compact rows for
+# VECTOR_RERANK_CANDIDATES hits (at least 4 * k) and re-score those exactly
+# against the float32 rows, which stay on disk (memory-mapped from
+# VECTOR_INDEX_DIR or the snapshot) instead of in memory.
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "none").lower()
+VECTOR_RERANK_CANDIDATES = _env_int("VECTOR_RERANK_CANDIDATES", 32)
+
+# Durable index snapshots: one versioned, checksummed file per video, written
+# after each ingest (and by python -m backend.bulk_ingest) and restored
+# memory-mapped when the RAG service starts. Empty disables snapshots.
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "")
+SNAPSHOT_VERIFY_CHECKSUM = os.getenv("SNAPSHOT_VERIFY_CHECKSUM", "true").lower() == "true"
+
+# Hybrid retrieval: BM25 + vector rankings fused with reciprocal-rank fusion.
+# Clear keyword hits (top chunk covers most of the query's idf mass and
+# outscores the runner-up by the ratio) skip the embedding call entirely.
+HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() == "true"
+HYBRID_CANDIDATES = _env_int("HYBRID_CANDIDATES", 20)
+RRF_K = _env_int("RRF_K", 60)
+LEXICAL_FAST_PATH_ENABLED = os.getenv("LEXICAL_FAST_PATH_ENABLED", "true").lower() == "true"
+LEXICAL_FAST_PATH_COVERAGE = float(os.getenv("LEXICAL_FAST_PATH_COVERAGE", "0.8"))
+LEXICAL_FAST_PATH_RATIO = float(os.getenv("LEXICAL_FAST_PATH_RATIO", "1.5"))
+
+# Model providers: "google" (needs GOOGLE_API_KEY) or "fake" (deterministic local
+# stand-ins for offline runs and benchmarks, with simulated latency and 429s)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "google").lower()
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "google").lower()
+FAKE_EMBED_LATENCY_S = float(os.getenv("FAKE_EMBED_LATENCY_S", "0.05"))
+FAKE_EMBED_RATE_LIMIT_EVERY = _env_int("FAKE_EMBED_RATE_LIMIT_EVERY", 0)
+FAKE_EMBED_QUOTA_PER_SECOND = float(os.getenv("FAKE_EMBED_QUOTA_PER_SECOND", "0"))
+FAKE_LLM_LATENCY_S = float(os.getenv("FAKE_LLM_LATENCY_S", "0.3"))
+FAKE_LLM_TOKEN_LATENCY_S = float(os.getenv("FAKE_LLM_TOKEN_LATENCY_S", "0.01"))
+FAKE_LLM_RATE_LIMIT_EVERY = _env_int("FAKE_LLM_RATE_LIMIT_EVERY", 0)
+
+# Startup: services (and the Google SDK / yt-dlp imports) are built lazily on
+# first use; warm-up builds them in a background thread once the server is
+# accepting connections. GET /ready reports 200 only when they are built.
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+# Hierarchical summary index (optional, built at ingest with the chat model):
+# sections of consecutive chunks are summarized and rolled up into a video
+# summary. Broad questions ("summarize the video") are answered from it.
+SUMMARY_INDEX_ENABLED = os.getenv("SUMMARY_INDEX_ENABLED", "false").lower() == "true"
+SUMMARY_ROUTING_ENABLED = os.getenv("SUMMARY_ROUTING_ENABLED", "true").lower() == "true"
+SUMMARY_SECTION_CHUNKS = _env_int("SUMMARY_SECTION_CHUNKS", 8)
+SUMMARY_FANOUT = _env_int("SUMMARY_FANOUT", 6)
+SUMMARY_SENTENCES = _env_int("SUMMARY_SENTENCES", 4)
+SUMMARY_CONCURRENCY = _env_int("SUMMARY_CONCURRENCY", 4)
@@ -0,0 +1,114 @@
+"""
+Prometheus metrics shared by the ingestion, embedding and chat pipelines.
+
+Stage latencies go into one histogram labelled by pipeline and stage, so a
+slow /ingest or /chat can be attributed to yt-dlp, the subtitle download,
+embedding, retrieval or generation. Counters track embedding requests,
+retries, 429s, backoff sleep, chunks embedded and cache hits; gauges and a
+histogram track admission queue depth and wait per pool. All of it is
+in-process and lock-cheap; /metrics renders the default registry.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Sub-millisecond index lookups up to multi-minute embedding runs
+_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+STAGE_SECONDS = Histogram(
+    "videotwin_stage_seconds",
+    "Time spent in each pipeline stage",
+    ["pipeline", "stage"],
+    buckets=_BUCKETS,
+)
+EMBEDDING_REQUESTS = Counter(
+    "videotwin_embedding_requests_total",
+    "Embedding API batch requests by outcome",
+    ["outcome"],  # success | rate_limited | error
+)
+EMBEDDING_RETRIES = Counter(
+    "videotwin_embedding_retries_total",
+    "Embedding batches re-queued after a failure",
+    ["reason"],  # rate_limited | error
+)
+BACKOFF_SECONDS = Counter(
+    "videotwin_embedding_backoff_seconds_total",
+    "Time spent sleeping in embedding retry backoff",
+)
+CHUNKS_EMBEDDED = Counter(
+    "videotwin_chunks_embedded_total",
+    "Chunks written to vector indexes by vector source",
+    ["source"],  # cache | api
+)
+CACHE_REQUESTS = Counter(
+    "videotwin_cache_requests_total",
+    "Cache lookups by cache and result",
+    ["cache", "result"],  # cache: embedding | answer | transcript; result: hit | miss
+)
+TRANSCRIPT_FETCHES = Counter(
+    "videotwin_transcript_fetches_total",
+    "Transcript loads by whether the caller ran the load or joined one in flight",
+    ["role"],  # leader | coalesced
+)
+ADMISSION_ACTIVE = Gauge(
+    "videotwin_admission_active",
+    "Requests (chat) or jobs (ingest) currently admitted",
+    ["pool"],  # chat | ingest
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "videotwin_admission_queue_depth",
+    "Requests or jobs waiting for admission",
+    ["pool"],
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "videotwin_admission_wait_seconds",
+    "Time spent queued before admission",
+    ["pool"],
+    buckets=_BUCKETS,
+)
+ADMISSION_REJECTED = Counter(
+    "videotwin_admission_rejected_total",
+    "Requests shed with 503 by pool and reason",
+    ["pool", "reason"],  # reason: queue_full | timeout
+)
+DEDUP_SAVED = Counter(
+    "videotwin_dedup_saved_total",
+    "Work avoided by caption dedup at ingest",
+    ["unit"],  # chars | embeddings
+)
+TIME_TO_SEARCHABLE = Histogram(
+    "videotwin_time_to_searchable_seconds",
+    "Time from the start of embedding until a newly ingested video can be chatted with",
+    buckets=_BUCKETS,
+)
+RETRIEVAL_PATHS = Counter(
+    "videotwin_retrieval_total",
+    "Chat retrievals by path",
+    ["path"],  # summary | lexical | hybrid
+)
+
+
+@contextmanager
+def stage(pipeline: str, name: str) -> Iterator[None]:
+    """Time a block into videotwin_stage_seconds{pipeline, stage} (also on error)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(pipeline, name).observe(time.perf_counter() - started)
+
+
+def cache_result(cache: str, hits: int, misses: int):
+    """Count hit/miss lookups for a cache."""
+    if hits:
+        CACHE_REQUESTS.labels(cache, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache, "miss").inc(misses)
+
+
+def render() -> tuple:
+    """(payload, content type) for the /metrics endpoint."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,14 +1,71 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+from typing import Dict, List, Optional
 
 class IngestRequest(BaseModel):
     url: str
+    # Optional chunking overrides; defaults come from CHUNK_SIZE/CHUNK_OVERLAP
+    chunk_size: Optional[int] = Field(default=None, ge=100, le=8000)
+    chunk_overlap: Optional[int] = Field(default=None, ge=0)
+    # Build the hierarchical summary index; defaults to SUMMARY_INDEX_ENABLED
+    build_summary: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def _overlap_below_size(self):
+        if self.chunk_size is not None and self.chunk_overlap is not None and self.chunk_overlap >= self.chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        return self
 
 class IngestResponse(BaseModel):
     message: str
     video_id: str
+    job_id: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    video_id: str
+    status: str
+    stage: str
+    chunks_total: int
+    chunks_embedded: int
+    chunk_size: Optional[int] = None
+    chunk_overlap: Optional[int] = None
+    build_summary: Optional[bool] = None
+    dedup: Optional[Dict[str, int]] = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    chat_ready_at: Optional[float] = None
+    finished_at: Optional[float] = None
 
 class ChatRequest(BaseModel):
     question: str
+    video_id: str
+
+class Source(BaseModel):
+    start_ms: int
+    end_ms: int
+    timestamp: str
 
 class ChatResponse(BaseModel):
     answer: str
+    cached: bool = False
+    sources: List[Source] = []
+    # Fraction of the video's chunks searchable when answered (< 1.0 while still ingesting)
+    coverage: float = 1.0
+
+class ChatBatchRequest(BaseModel):
+    video_id: str
+    questions: List[str] = Field(min_length=1)
+
+class ChatBatchItem(BaseModel):
+    question: str
+    answer: str = ""
+    cached: bool = False
+    sources: List[Source] = []
+    error: Optional[str] = None
+
+class ChatBatchResponse(BaseModel):
+    video_id: str
+    answers: List[ChatBatchItem]
+    coverage: float = 1.0
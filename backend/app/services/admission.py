@@ -0,0 +1,311 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+import asyncio
+import math
+import threading
+import time
+
+from backend.app.core import metrics
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed because its pool's queue is full or the wait timed out."""
+
+    def __init__(self, pool: str, reason: str, retry_after_s: int):
+        super().__init__(f"{pool} is overloaded ({reason}), retry in {retry_after_s}s")
+        self.pool = pool
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+def retry_after_seconds(hold_s: float, queued: int, slots: int, cap: int = 60) -> int:
+    """Rough time until a new arrival would get a slot: queued work spread over the slots."""
+    return max(1, min(cap, math.ceil(hold_s * (queued + 1) / max(1, slots))))
+
+
+class WaitStats:
+    """Recent queue waits and hold (service) times for one pool, for stats() and Retry-After."""
+
+    def __init__(self, pool: str, window: int = 1000):
+        self.pool = pool
+        self._waits = deque(maxlen=window)
+        self._hold_s = 0.0
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.rejected = 0
+
+    def waited(self, seconds: float):
+        metrics.ADMISSION_WAIT_SECONDS.labels(self.pool).observe(seconds)
+        with self._lock:
+            self.admitted += 1
+            self._waits.append(seconds)
+
+    def held(self, seconds: float):
+        with self._lock:
+            # EWMA keeps Retry-After responsive to the current workload
+            self._hold_s = seconds if not self._hold_s else 0.8 * self._hold_s + 0.2 * seconds
+
+    def shed(self, reason: str):
+        metrics.ADMISSION_REJECTED.labels(self.pool, reason).inc()
+        with self._lock:
+            self.rejected += 1
+
+    @property
+    def hold_s(self) -> float:
+        return self._hold_s or 1.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+        p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_ms_avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "wait_ms_p95": round(p95 * 1000, 1),
+            "hold_ms_avg": round(self._hold_s * 1000, 1),
+        }
+
+
+class AdmissionPool:
+    """
+    Concurrency limit with a bounded wait queue, for the chat endpoints.
+
+    Up to max_concurrency requests run at once; up to max_queue more wait
+    (at most queue_timeout_s each). Anything beyond is rejected at once
+    with Overloaded, so overload turns into a fast 503 + Retry-After
+    instead of requests piling up until clients time out.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout_s: float):
+        """
+        Args:
+            name: Pool label for metrics and errors
+            max_concurrency: Requests admitted at once
+            max_queue: Requests allowed to wait for a slot
+            queue_timeout_s: Longest a request waits before being shed
+        """
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout_s = queue_timeout_s
+        self.active = 0
+        self.waiting = 0
+        self.stats = WaitStats(name)
+        lock = threading.Lock()
+        self._cond = threading.Condition(lock)
+        # Signalled when the queue drains, for wait_until_idle()
+        self._idle = threading.Condition(lock)
+        # Async callers wait in these threads (one per queued request at most)
+        self._waiters = ThreadPoolExecutor(
+            max_workers=max(1, self.max_queue), thread_name_prefix=f"{name}-admission"
+        )
+
+    @property
+    def busy(self) -> bool:
+        """Whether requests are queued behind a full pool (lower-priority work should hold off)."""
+        return self.waiting > 0
+
+    def wait_until_idle(self, max_wait_s: float) -> float:
+        """
+        Hold off lower-priority work while requests are queued, for at most max_wait_s.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.perf_counter()
+        with self._idle:
+            self._idle.wait_for(lambda: not self.waiting, max_wait_s)
+        return time.perf_counter() - started
+
+    def _overloaded(self, reason: str) -> Overloaded:
+        self.stats.shed(reason)
+        return Overloaded(
+            self.name, reason, retry_after_seconds(self.stats.hold_s, self.waiting, self.max_concurrency)
+        )
+
+    def _gauges(self):
+        metrics.ADMISSION_ACTIVE.labels(self.name).set(self.active)
+        metrics.ADMISSION_QUEUE_DEPTH.labels(self.name).set(self.waiting)
+
+    def _try_enter(self) -> bool:
+        """Take a free slot (True) or a queue place (False). Caller holds the lock."""
+        if self.active < self.max_concurrency and not self.waiting:
+            self.active += 1
+            self._gauges()
+            return True
+        if self.waiting >= self.max_queue:
+            raise self._overloaded("queue_full")
+        self.waiting += 1
+        self._gauges()
+        return False
+
+    def _wait_queued(self, started: float):
+        with self._cond:
+            try:
+                deadline = started + self.queue_timeout_s
+                while self.active >= self.max_concurrency:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise self._overloaded("timeout")
+                    self._cond.wait(remaining)
+                self.active += 1
+            finally:
+                self.waiting -= 1
+                self._gauges()
+                # release() wakes one waiter; pass the wakeup on if a slot is
+                # still free (two quick releases, or this waiter timed out)
+                if self.active < self.max_concurrency and self.waiting:
+                    self._cond.notify()
+                if not self.waiting:
+                    self._idle.notify_all()
+
+    def acquire(self) -> float:
+        """
+        Block until admitted.
+
+        Returns:
+            Seconds spent queued
+
+        Raises:
+            Overloaded: If the queue is full or the wait exceeds queue_timeout_s
+        """
+        started = time.perf_counter()
+        with self._cond:
+            admitted = self._try_enter()
+        if not admitted:
+            self._wait_queued(started)
+        waited = time.perf_counter() - started
+        self.stats.waited(waited)
+        return waited
+
+    async def aacquire(self) -> float:
+        """acquire() for the event loop: a free slot or a full queue is decided without a thread hop."""
+        started = time.perf_counter()
+        with self._cond:
+            admitted = self._try_enter()
+        if not admitted:
+            queued = asyncio.get_running_loop().run_in_executor(self._waiters, self._wait_queued, started)
+            try:
+                await asyncio.shield(queued)
+            except asyncio.CancelledError:
+                # Client went away while queued: hand the slot straight back if it is granted
+                queued.add_done_callback(lambda f: f.exception() is None and self.release())
+                raise
+        waited = time.perf_counter() - started
+        self.stats.waited(waited)
+        return waited
+
+    def release(self, held_s: Optional[float] = None):
+        """Free a slot (from any thread), recording how long it was held."""
+        if held_s is not None:
+            self.stats.held(held_s)
+        with self._cond:
+            self.active -= 1
+            self._gauges()
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        await self.aacquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def ticket(self) -> "AdmissionTicket":
+        """An idempotent release handle for work that outlives the request handler (streams)."""
+        return AdmissionTicket(self)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            **self.stats.snapshot(),
+        }
+
+
+class AdmissionTicket:
+    """Releases its pool slot exactly once, whichever of several cleanup paths runs first."""
+
+    def __init__(self, pool: AdmissionPool):
+        self.pool = pool
+        self._started = time.perf_counter()
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self.pool.release(time.perf_counter() - self._started)
+
+
+class PrioritySlots:
+    """
+    Counting semaphore where foreground waiters always go before background ones.
+
+    Used for the shared LLM concurrency cap: chat generation enters with
+    `with slots:`, background work (summary building at ingest) with
+    `with slots.background:` and only gets a slot no chat call is waiting for.
+    """
+
+    def __init__(self, slots: int):
+        self._cond = threading.Condition()
+        self._free = max(1, slots)
+        self._foreground_waiting = 0
+        self.background = _BackgroundSlots(self)
+
+    def acquire(self, background: bool = False):
+        with self._cond:
+            if not background:
+                self._foreground_waiting += 1
+            try:
+                while not self._free or (background and self._foreground_waiting):
+                    self._cond.wait()
+                self._free -= 1
+            finally:
+                if not background:
+                    self._foreground_waiting -= 1
+                    if not self._foreground_waiting:
+                        self._cond.notify_all()
+
+    def release(self):
+        with self._cond:
+            self._free += 1
+            self._cond.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class _BackgroundSlots:
+    def __init__(self, slots: PrioritySlots):
+        self._slots = slots
+
+    def __enter__(self):
+        self._slots.acquire(background=True)
+        return self
+
+    def __exit__(self, *exc):
+        self._slots.release()
+
@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from backend.app.core import metrics
+
+
+@dataclass
+class CachedAnswer:
+    """A previously generated answer and the normalized embedding of its question."""
+    question: str
+    answer: str
+    vector: np.ndarray
+    sources: List[Dict[str, Any]] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+
+
+class SemanticAnswerCache:
+    """
+    Per-video cache of answers keyed by question embedding.
+
+    A new question reuses a stored answer when its cosine similarity to a
+    cached question on the same video meets the threshold. Entries expire
+    after a TTL; size is bounded per video and globally (oldest first).
+    Each invalidation starts a new generation of the video; answers
+    generated against an earlier one are not stored.
+    """
+
+    def __init__(self, similarity_threshold: float, ttl_seconds: float, max_per_video: int, max_entries: int):
+        """
+        Args:
+            similarity_threshold: Minimum cosine similarity for a hit (0-1)
+            ttl_seconds: Entry lifetime
+            max_per_video: Entries kept per video
+            max_entries: Entries kept across all videos
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_per_video = max_per_video
+        self.max_entries = max_entries
+        self._videos: Dict[str, "OrderedDict[int, CachedAnswer]"] = {}
+        self._generations: Dict[str, int] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def _expire(self, entries: "OrderedDict[int, CachedAnswer]", now: float):
+        """Drop expired entries; insertion order is creation order. Caller holds the lock."""
+        while entries:
+            entry_id, entry = next(iter(entries.items()))
+            if now - entry.created_at < self.ttl_seconds:
+                break
+            del entries[entry_id]
+
+    def lookup(self, video_id: str, vector) -> Optional[CachedAnswer]:
+        """Return the closest cached answer above the threshold, if any."""
+        query = self._normalize(vector)
+        with self._lock:
+            entries = self._videos.get(video_id)
+            if entries:
+                self._expire(entries, time.time())
+            if not entries:
+                self.misses += 1
+                metrics.cache_result("answer", 0, 1)
+                return None
+            candidates: List[CachedAnswer] = list(entries.values())
+            scores = np.stack([entry.vector for entry in candidates]) @ query
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity_threshold:
+                self.hits += 1
+                metrics.cache_result("answer", 1, 0)
+                return candidates[best]
+            self.misses += 1
+            metrics.cache_result("answer", 0, 1)
+            return None
+
+    def generation(self, video_id: str) -> int:
+        """Current generation of a video; read it before retrieval and pass it to store()."""
+        with self._lock:
+            return self._generations.get(video_id, 0)
+
+    def store(
+        self,
+        video_id: str,
+        question: str,
+        vector,
+        answer: str,
+        sources: Optional[List[Dict[str, Any]]] = None,
+        generation: Optional[int] = None,
+    ):
+        """
+        Cache an answer (and its timestamp citations), enforcing per-video and global bounds.
+
+        Args:
+            generation: The video's generation() read before retrieval; the
+                answer is dropped if the video was invalidated since (None = always store)
+        """
+        entry = CachedAnswer(
+            question=question, answer=answer, vector=self._normalize(vector), sources=sources or []
+        )
+        with self._lock:
+            if generation is not None and generation != self._generations.get(video_id, 0):
+                return
+            entries = self._videos.setdefault(video_id, OrderedDict())
+            entries[next(self._ids)] = entry
+            while len(entries) > self.max_per_video:
+                entries.popitem(last=False)
+            while sum(len(e) for e in self._videos.values()) > self.max_entries:
+                # Evict the globally oldest entry (heads are oldest per video)
+                oldest_video = min(
+                    (vid for vid, e in self._videos.items() if e),
+                    key=lambda vid: next(iter(self._videos[vid].values())).created_at,
+                )
+                self._videos[oldest_video].popitem(last=False)
+
+    def invalidate(self, video_id: str):
+        """Forget every cached answer for a video (e.g. on re-ingest) and start a new generation."""
+        with self._lock:
+            self._videos.pop(video_id, None)
+            self._generations[video_id] = self._generations.get(video_id, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and occupancy for diagnostics."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": sum(len(e) for e in self._videos.values()),
+                "videos": len(self._videos),
+            }
@@ -0,0 +1,206 @@
+from array import array
+from dataclasses import dataclass, asdict
+from langchain_core.documents import Document
+from typing import Dict, List, Sequence, Tuple
+import hashlib
+import io
+
+import numpy as np
+
+from backend.app.services.transcript import Transcript
+
+@dataclass
+class DedupStats:
+    """What the dedup stage removed from one transcript before embedding."""
+    segments_dropped: int = 0    # exact repeats, or fully covered by the rolling window
+    segments_trimmed: int = 0    # leading words repeated from the previous caption removed
+    chunks_skipped: int = 0      # near-duplicate chunks not embedded
+    chars_saved: int = 0         # characters removed from the text and skipped chunks
+    embeddings_saved: int = 0    # chunk embeddings avoided (text dedup + skipped chunks)
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def _words(text: str) -> List[str]:
+    return text.split()
+
+
+def _normalized(words: Sequence[str]) -> List[str]:
+    return [word.lower().strip(".,!?;:\"'") for word in words]
+
+
+def dedupe_segments(transcript: Transcript, stats: DedupStats, min_words: int = 3, window_words: int = 48) -> Transcript:
+    """
+    Drop repeated caption text segment by segment.
+
+    Auto-generated captions repeat themselves: a caption line is emitted
+    again unchanged, or each line restarts with the tail of the previous
+    one (rolling window). At every segment boundary the next words are
+    compared with the end of the text emitted so far; the longest repeat
+    of at least min_words words is removed, dropping every segment it
+    covers and trimming the one it ends in. Words are matched across
+    segment boundaries, so JSON3 auto captions (one segment per word or
+    short phrase) are deduplicated the same way as whole caption lines.
+    Repeats shorter than min_words ("no, no") are left alone as likely
+    genuine speech.
+
+    Args:
+        transcript: Parsed transcript
+        stats: Receives the segments dropped/trimmed and characters saved
+        min_words: Shortest repeat (in words) treated as a caption artifact
+        window_words: Trailing emitted words compared against the next words
+
+    Returns:
+        The deduplicated transcript (timing of dropped segments is folded
+        into the segment before them), or transcript itself when nothing
+        was repeated
+    """
+    text = transcript.text
+    bounds = list(transcript.offsets) + [len(text) + 1]
+    segments = [_words(text[bounds[i] : bounds[i + 1] - 1]) for i in range(len(transcript))]
+    # Normalized words of the whole transcript, and where each segment's words start
+    flat: List[str] = []
+    firsts: List[int] = []
+    for words in segments:
+        firsts.append(len(flat))
+        flat.extend(_normalized(words))
+
+    buffer = io.StringIO()
+    starts, durations, offsets = array("i"), array("i"), array("i")
+    position = 0
+    tail: List[str] = []
+    skip = 0  # words of a detected repeat still to remove
+    dropped = trimmed = 0
+
+    for i, words in enumerate(segments):
+        if not words:
+            continue
+        start, duration = transcript.starts_ms[i], transcript.durations_ms[i]
+
+        if not skip:
+            upcoming = flat[firsts[i] : firsts[i] + window_words]
+            first = upcoming[0]
+            for overlap in range(min(len(upcoming), len(tail)), min_words - 1, -1):
+                if tail[-overlap] == first and upcoming[:overlap] == tail[-overlap:]:
+                    skip = overlap
+                    break
+
+        if skip >= len(words):
+            skip -= len(words)
+            dropped += 1
+            stats.chars_saved += bounds[i + 1] - bounds[i]
+            if offsets:
+                # The repeat was still on screen: extend the segment before it
+                end = max(starts[-1] + durations[-1], start + duration)
+                durations[-1] = end - starts[-1]
+            continue
+        if skip:
+            trimmed += 1
+            stats.chars_saved += len(" ".join(words[:skip])) + 1
+            words = words[skip:]
+            skip = 0
+
+        if offsets:
+            buffer.write(" ")
+            position += 1
+        offsets.append(position)
+        starts.append(start)
+        durations.append(duration)
+        position += buffer.write(" ".join(words))
+        tail = (tail + _normalized(words))[-window_words:]
+
+    stats.segments_dropped += dropped
+    stats.segments_trimmed += trimmed
+    if not dropped and not trimmed:
+        return transcript
+    return Transcript(buffer.getvalue(), starts, durations, offsets)
+
+
+class NearDuplicateFilter:
+    """
+    MinHash + LSH banding over word shingles to spot near-duplicate chunks.
+
+    Each chunk gets a signature of num_perm minimum hashes; chunks sharing
+    any band of rows_per_band values are candidates, and a candidate whose
+    exact shingle Jaccard similarity to an earlier kept chunk reaches
+    threshold is a near duplicate (the signature estimate alone is too
+    noisy to decide near the threshold). Cost is linear in the number of
+    chunks.
+    """
+
+    def __init__(self, threshold: float = 0.85, shingle_words: int = 5, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        """
+        Args:
+            threshold: Jaccard similarity of the shingle sets at which a chunk is a duplicate
+            shingle_words: Words per shingle
+            num_perm: Hash permutations per signature
+            bands: LSH bands (num_perm must be divisible by it)
+
+        Raises:
+            ValueError: If num_perm is not divisible by bands
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.shingle_words = shingle_words
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        # Multiply-shift hashing: (a * h + b) mod 2**64 (uint64 wrap-around), top 32 bits
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, np.iinfo(np.uint64).max, num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self._b = rng.integers(0, np.iinfo(np.uint64).max, num_perm, dtype=np.uint64, endpoint=True)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Sorted unique 64-bit hashes of the text's word shingles."""
+        words = _normalized(_words(text))
+        n = self.shingle_words
+        shingles = {" ".join(words[i : i + n]) for i in range(max(1, len(words) - n + 1))}
+        return np.unique(np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+            dtype=np.uint64, count=len(shingles),
+        ))
+
+    def signature(self, shingles: np.ndarray) -> np.ndarray:
+        return ((shingles[:, None] * self._a + self._b) >> np.uint64(32)).min(axis=0)
+
+    @staticmethod
+    def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+        common = len(np.intersect1d(a, b, assume_unique=True))
+        return common / (len(a) + len(b) - common)
+
+    def duplicates(self, texts: Sequence[str]) -> List[int]:
+        """
+        Indices of texts that nearly duplicate an earlier (kept) text.
+
+        The first occurrence is always kept, so transcript order decides
+        which copy survives.
+        """
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        kept: Dict[int, np.ndarray] = {}
+        duplicates = []
+        for i, text in enumerate(texts):
+            shingles = self.shingles(text)
+            signature = self.signature(shingles)
+            keys = [
+                (band, signature[band * self.rows_per_band : (band + 1) * self.rows_per_band].tobytes())
+                for band in range(self.bands)
+            ]
+            candidates = {j for key in keys for j in buckets.get(key, ())}
+            if any(self.jaccard(kept[j], shingles) >= self.threshold for j in candidates):
+                duplicates.append(i)
+                continue
+            kept[i] = shingles
+            for key in keys:
+                buckets.setdefault(key, []).append(i)
+        return duplicates
+
+
+def drop_near_duplicates(chunks: List[Document], dedup: NearDuplicateFilter, stats: DedupStats) -> List[Document]:
+    """Chunks minus near duplicates of earlier chunks, counting what was skipped into stats."""
+    skipped = set(dedup.duplicates([chunk.page_content for chunk in chunks]))
+    if not skipped:
+        return chunks
+    stats.chunks_skipped += len(skipped)
+    stats.chars_saved += sum(len(chunks[i].page_content) for i in skipped)
+    return [chunk for i, chunk in enumerate(chunks) if i not in skipped]
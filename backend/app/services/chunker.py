@@ -0,0 +1,84 @@
+from typing import List, Tuple
+
+
+class TranscriptChunker:
+    """
+    Single-pass, offset-based chunker for caption transcripts.
+
+    Produces (start_offset, end_offset) spans into the original text instead
+    of copied strings. Semantics follow the 1000/200 character splitter the
+    pipeline used before: every chunk is at most chunk_size characters,
+    breaks fall on whitespace (newlines preferred) whenever possible, and
+    consecutive chunks share at most chunk_overlap characters, starting on a
+    word boundary. The cursor only moves forward, so cost is linear in the
+    transcript length.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        """
+        Args:
+            chunk_size: Maximum characters per chunk
+            chunk_overlap: Maximum characters shared by consecutive chunks
+
+        Raises:
+            ValueError: If sizes are not positive or overlap >= chunk_size
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if chunk_overlap < 0 or chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be >= 0 and smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def _break_point(self, text: str, start: int, hard_end: int) -> int:
+        """Best cut position in (start, hard_end]: last newline in the back half, else last space."""
+        newline = text.rfind("\n", start + self.chunk_size // 2, hard_end + 1)
+        if newline > start:
+            return newline
+        space = text.rfind(" ", start + 1, hard_end + 1)
+        if space > start:
+            return space
+        return hard_end  # One long token: hard cut
+
+    def split(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Split text into overlapping chunk spans.
+
+        Args:
+            text: Full transcript buffer
+
+        Returns:
+            (start_offset, end_offset) pairs; text[start:end] is the chunk,
+            trimmed of surrounding whitespace
+        """
+        spans: List[Tuple[int, int]] = []
+        length = len(text)
+        start = 0
+
+        while start < length:
+            # Chunks never begin with whitespace
+            while start < length and text[start].isspace():
+                start += 1
+            if start >= length:
+                break
+
+            hard_end = start + self.chunk_size
+            cut = length if hard_end >= length else self._break_point(text, start, hard_end)
+
+            end = cut
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            spans.append((start, end))
+            if cut >= length:
+                break
+
+            # Next chunk starts at the first word boundary inside the overlap window
+            next_start = max(end - self.chunk_overlap, start + 1)
+            if self.chunk_overlap and not text[next_start - 1].isspace():
+                boundary = text.find(" ", next_start, end)
+                next_start = boundary + 1 if boundary != -1 else cut
+            elif not self.chunk_overlap:
+                next_start = cut
+            start = next_start
+
+        return spans
@@ -0,0 +1,160 @@
+from dataclasses import dataclass, field
+from langchain_core.documents import Document
+from typing import List, Sequence, Set, Tuple
+import math
+import re
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """Rough token count for prompt budgeting (no tokenizer round trip)."""
+    return math.ceil(len(text) / chars_per_token) if text else 0
+
+
+def _shingles(text: str, size: int = 3) -> Set[Tuple[str, ...]]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+@dataclass
+class AssembledContext:
+    """Passages chosen for the prompt, best first, and their estimated size."""
+    docs: List[Document] = field(default_factory=list)
+    tokens: int = 0
+    candidates: int = 0
+    selected: int = 0
+
+
+class ContextAssembler:
+    """
+    Turns scored retrieval hits into a compact, token-budgeted prompt context.
+
+    Stages:
+        1. Score-gap selection: keep hits until the score drops sharply
+           (relative to the best hit), but never fewer than min_chunks
+        2. Merge: chunks whose transcript spans overlap or touch become one
+           passage, so the 200-character chunk overlap is sent only once
+        3. Near-duplicate removal: passages whose word 3-gram Jaccard
+           similarity with a kept passage reaches dedup_similarity are dropped
+        4. Budget: passages are added best first until token_budget is used;
+           the first passage is truncated rather than dropped
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 1500,
+        min_chunks: int = 2,
+        score_gap: float = 0.3,
+        dedup_similarity: float = 0.8,
+        chars_per_token: float = 4.0,
+    ):
+        """
+        Args:
+            token_budget: Maximum estimated tokens of context
+            min_chunks: Hits always considered regardless of score gaps
+            score_gap: Drop between consecutive scores (as a fraction of the
+                best score) that ends selection
+            dedup_similarity: Jaccard threshold for near-duplicate passages
+            chars_per_token: Characters per token for estimates
+        """
+        self.token_budget = token_budget
+        self.min_chunks = min_chunks
+        self.score_gap = score_gap
+        self.dedup_similarity = dedup_similarity
+        self.chars_per_token = chars_per_token
+
+    def tokens(self, text: str) -> int:
+        return estimate_tokens(text, self.chars_per_token)
+
+    def _select(self, scored: Sequence[Tuple[Document, float]]) -> List[Tuple[Document, float]]:
+        """Keep hits up to the first large score gap."""
+        if not scored:
+            return []
+        top = scored[0][1]
+        selected = [scored[0]]
+        for previous, current in zip(scored, scored[1:]):
+            if len(selected) >= self.min_chunks and top > 0 and (previous[1] - current[1]) / top > self.score_gap:
+                break
+            selected.append(current)
+        return selected
+
+    @staticmethod
+    def _merge(scored: List[Tuple[Document, float]]) -> List[Tuple[Document, float]]:
+        """Merge hits with overlapping or adjacent transcript spans; order by best member score."""
+        spanned, passages = [], []
+        for doc, score in scored:
+            has_span = "start_offset" in doc.metadata and "end_offset" in doc.metadata
+            (spanned if has_span else passages).append((doc, score))
+
+        group_doc, group_score = None, 0.0
+        for doc, score in sorted(spanned, key=lambda item: item[0].metadata["start_offset"]):
+            if group_doc is not None and doc.metadata["start_offset"] <= group_doc.metadata["end_offset"] + 1:
+                meta = group_doc.metadata
+                overlap = meta["end_offset"] - doc.metadata["start_offset"]
+                if overlap >= 0:
+                    tail = doc.page_content[overlap:] if doc.metadata["end_offset"] > meta["end_offset"] else ""
+                    text = group_doc.page_content + tail
+                else:
+                    text = group_doc.page_content + " " + doc.page_content
+                merged_meta = dict(meta)
+                merged_meta["end_offset"] = max(meta["end_offset"], doc.metadata["end_offset"])
+                if "start_ms" in meta and "start_ms" in doc.metadata:
+                    merged_meta["start_ms"] = min(meta["start_ms"], doc.metadata["start_ms"])
+                    merged_meta["end_ms"] = max(meta["end_ms"], doc.metadata["end_ms"])
+                group_doc = Document(id=group_doc.id, page_content=text, metadata=merged_meta)
+                group_score = max(group_score, score)
+                continue
+            if group_doc is not None:
+                passages.append((group_doc, group_score))
+            group_doc, group_score = doc, score
+        if group_doc is not None:
+            passages.append((group_doc, group_score))
+
+        passages.sort(key=lambda item: item[1], reverse=True)
+        return passages
+
+    def _dedup(self, passages: List[Tuple[Document, float]]) -> List[Document]:
+        kept: List[Document] = []
+        kept_shingles: List[Set[Tuple[str, ...]]] = []
+        for doc, _ in passages:
+            shingles = _shingles(doc.page_content)
+            duplicate = any(
+                shingles and other and len(shingles & other) / len(shingles | other) >= self.dedup_similarity
+                for other in kept_shingles
+            )
+            if not duplicate:
+                kept.append(doc)
+                kept_shingles.append(shingles)
+        return kept
+
+    def assemble(self, scored: Sequence[Tuple[Document, float]]) -> AssembledContext:
+        """
+        Build the context from retrieval hits.
+
+        Args:
+            scored: (Document, score) pairs, best first (any score scale where
+                higher is better)
+
+        Returns:
+            AssembledContext with the passages to format into the prompt
+        """
+        selected = self._select(scored)
+        passages = self._dedup(self._merge(selected))
+
+        docs: List[Document] = []
+        used = 0
+        for doc in passages:
+            cost = self.tokens(doc.page_content)
+            if used + cost > self.token_budget:
+                if docs:
+                    continue  # A smaller later passage may still fit
+                limit = int(self.token_budget * self.chars_per_token)
+                doc = Document(id=doc.id, page_content=doc.page_content[:limit], metadata=doc.metadata)
+                cost = self.tokens(doc.page_content)
+            docs.append(doc)
+            used += cost
+        return AssembledContext(docs=docs, tokens=used, candidates=len(scored), selected=len(selected))
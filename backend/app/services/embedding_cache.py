@@ -0,0 +1,222 @@
+from langchain_core.embeddings import Embeddings
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from backend.app.core import metrics
+
+
+class EmbeddingCache:
+    """
+    Persistent content-addressed store of embedding vectors.
+
+    Vectors are keyed by (model name, task_type, SHA-256 of the text) and kept
+    in a local SQLite file as packed float32 blobs (~3 KB per 768-d vector).
+    Total size is bounded: once it exceeds max_bytes, least-recently-used
+    rows are evicted down to a low-water mark.
+    """
+
+    # Evict down to this fraction of max_bytes to avoid evicting on every put
+    LOW_WATER_RATIO = 0.9
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            max_bytes: Upper bound on stored vector bytes
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One shared connection guarded by a lock; SQLite serialises writers anyway
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)"
+        )
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()
+        self._total_bytes = row[0]
+
+    @staticmethod
+    def make_key(model: str, task_type: Optional[str], text: str) -> str:
+        """Content address for one (model, task_type, text) triple."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}|{task_type or ''}|{digest}"
+
+    @staticmethod
+    def _pack(vector: Iterable[float]) -> bytes:
+        return array("f", vector).tobytes()
+
+    @staticmethod
+    def _unpack(blob: bytes) -> List[float]:
+        values = array("f")
+        values.frombytes(blob)
+        return values.tolist()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors, updating hit/miss counters and recency.
+
+        Returns:
+            Mapping of found keys to vectors; missing keys are absent
+        """
+        if not keys:
+            return {}
+        found: Dict[str, List[float]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            # SQLite limits bound parameters per statement; query in slices
+            for i in range(0, len(unique_keys), 500):
+                part = unique_keys[i : i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    part,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = self._unpack(blob)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        metrics.cache_result("embedding", hits, len(keys) - hits)
+        return found
+
+    def put_many(self, items: List[Tuple[str, List[float]]]):
+        """Store vectors and evict least-recently-used rows if over budget."""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, vector in items:
+            blob = self._pack(vector)
+            rows.append((key, blob, len(blob), now))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            for key, blob, size, used in rows:
+                previous = self._conn.execute(
+                    "SELECT size FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embeddings(key, vector, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, blob, size, used),
+                )
+                self._total_bytes += size - (previous[0] if previous else 0)
+            self._conn.execute("COMMIT")
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete oldest rows down to the low-water mark. Caller holds the lock."""
+        target = int(self.max_bytes * self.LOW_WATER_RATIO)
+        cursor = self._conn.execute(
+            "SELECT key, size FROM embeddings ORDER BY last_used ASC"
+        )
+        doomed = []
+        total = self._total_bytes
+        for key, size in cursor:
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        cursor.close()
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", doomed)
+        self._total_bytes = total
+        self.evictions += len(doomed)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and occupancy for diagnostics."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    LangChain Embeddings wrapper that only sends cache misses to the provider.
+
+    Duplicate texts within one call are embedded once. Vectors returned by the
+    provider are written back to the cache before returning.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model: str, task_type: Optional[str]):
+        """
+        Args:
+            embeddings: Underlying provider (e.g. GoogleGenerativeAIEmbeddings)
+            cache: Persistent vector cache
+            model: Model name, part of the cache key
+            task_type: Provider task type, part of the cache key
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.task_type = task_type
+
+    def _key(self, text: str) -> str:
+        return EmbeddingCache.make_key(self.model, self.task_type, text)
+
+    def cached_vectors(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Cached vector per text, or None where the provider must be called."""
+        found = self.cache.get_many([self._key(text) for text in texts])
+        return [found.get(self._key(text)) for text in texts]
+
+    def remember(self, texts: List[str], vectors: List[List[float]]):
+        """Write vectors computed outside this wrapper back to the cache."""
+        self.cache.put_many([(self._key(text), vector) for text, vector in zip(texts, vectors)])
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        found = self.cache.get_many(keys)
+
+        # Deduplicate misses so repeated caption text is embedded once
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            fresh = list(zip(missing.keys(), vectors))
+            self.cache.put_many(fresh)
+            found.update(fresh)
+
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        found = self.cache.get_many([key])
+        if key in found:
+            return found[key]
+        vector = self.embeddings.embed_query(text)
+        self.cache.put_many([(key, vector)])
+        return vector
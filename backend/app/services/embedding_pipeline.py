@@ -0,0 +1,299 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+import threading
+import time
+
+from backend.app.core import metrics
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """
+    Detect quota errors (HTTP 429 / RESOURCE_EXHAUSTED) from the embedding API.
+
+    Walks the exception chain because LangChain wraps the google-genai
+    ClientError (which carries the numeric code) in its own error type.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        for attr in ("code", "status_code"):
+            if getattr(exc, attr, None) == 429:
+                return True
+        if "RESOURCE_EXHAUSTED" in str(getattr(exc, "status", "")):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket request limiter with AIMD control of rate, concurrency and batch size.
+
+    Every successful request additively raises the request rate and, after a
+    streak of successes, the batch size and number of in-flight requests.
+    A 429 multiplicatively cuts all three and drains the bucket, so the
+    pipeline converges on the real quota instead of fixed sleeps.
+
+    The in-flight limit is enforced here, across every pipeline sharing the
+    limiter: acquire() takes a slot as well as a token and release() frees
+    it. Each decrease starts a new epoch; 429s on requests sent before it
+    belong to the same congestion event and do not cut again.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        max_requests_per_second: float,
+        concurrency: int,
+        max_concurrency: int,
+        batch_size: int,
+        min_batch_size: int,
+        max_batch_size: int,
+        increase_every: int = 5,
+    ):
+        """
+        Args:
+            requests_per_second: Initial token refill rate
+            max_requests_per_second: Ceiling for additive rate increase
+            concurrency: Initial number of in-flight requests
+            max_concurrency: Ceiling for in-flight requests
+            batch_size: Initial texts per request
+            min_batch_size: Floor for multiplicative batch decrease
+            max_batch_size: Ceiling for additive batch increase
+            increase_every: Successes between concurrency/batch increases
+        """
+        self.rate = requests_per_second
+        self.max_rate = max_requests_per_second
+        self.min_rate = min(0.2, requests_per_second)
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.increase_every = increase_every
+
+        # Burst capacity follows concurrency so a fresh bucket can fill every slot
+        self._tokens = float(concurrency)
+        self._last_refill = time.monotonic()
+        self._success_streak = 0
+        self._inflight = 0
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._slots = threading.Condition(self._lock)
+        self.rate_limited_count = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        capacity = max(1.0, float(self.concurrency))
+        self._tokens = min(capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self) -> int:
+        """
+        Block until an in-flight slot and a request token are available.
+
+        Returns:
+            The epoch the request is sent in; pass it to on_rate_limited()
+            if the request gets a 429. Call release() when it completes.
+        """
+        with self._slots:
+            while True:
+                if self._inflight >= self.concurrency:
+                    self._slots.wait()
+                    continue
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self._inflight += 1
+                    return self._epoch
+                self._slots.wait((1.0 - self._tokens) / self.rate)
+
+    def release(self):
+        """Free the in-flight slot taken by acquire()."""
+        with self._slots:
+            self._inflight -= 1
+            self._slots.notify()
+
+    def on_success(self):
+        """Additive increase after a successful request."""
+        with self._slots:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+            self._success_streak += 1
+            if self._success_streak >= self.increase_every:
+                self._success_streak = 0
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+                self.batch_size = min(self.max_batch_size, self.batch_size + self.min_batch_size)
+                self._slots.notify_all()
+
+    def on_rate_limited(self, epoch: Optional[int] = None) -> bool:
+        """
+        Multiplicative decrease after a 429; also drains the bucket to pause new requests.
+
+        Args:
+            epoch: Value acquire() returned for the rate-limited request
+                (None = always decrease)
+
+        Returns:
+            False if the request was sent before the last decrease, which
+            already accounted for this congestion event
+        """
+        with self._slots:
+            if epoch is not None and epoch != self._epoch:
+                return False
+            self._epoch += 1
+            self.rate_limited_count += 1
+            self._success_streak = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.concurrency = max(1, self.concurrency // 2)
+            self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+            self._tokens = 0.0
+            self._last_refill = time.monotonic()
+            return True
+
+
+@dataclass
+class _Batch:
+    """A contiguous slice of the input texts plus its retry count."""
+    start: int
+    end: int
+    attempts: int = 0
+    rate_limited: int = 0
+    epoch: int = 0  # limiter epoch of the last send
+
+
+class EmbeddingPipelineError(Exception):
+    """Raised when some batches could not be embedded after all retries."""
+
+    def __init__(self, failed_indices: List[int], errors: List[str]):
+        self.failed_indices = failed_indices
+        self.errors = errors
+        super().__init__(
+            f"{len(failed_indices)} chunk(s) failed to embed after retries: "
+            + "; ".join(errors[:3])
+        )
+
+
+class EmbeddingPipeline:
+    """
+    Concurrent embedding stage driven by an AdaptiveRateLimiter.
+
+    Texts are carved into batches sized by the limiter's current batch size and
+    embedded on a thread pool; the limiter caps in-flight requests across
+    all pipelines sharing it. Rate-limited
+    batches are split and re-queued under a separate, larger retry budget;
+    other failures retry with exponential backoff. Batches that exhaust their
+    budget are reported, never silently dropped.
+    """
+
+    def __init__(self, embeddings, limiter: AdaptiveRateLimiter, max_retries: int = 5):
+        """
+        Args:
+            embeddings: LangChain Embeddings provider (embed_documents)
+            limiter: Shared rate limiter controlling rate/concurrency/batch size
+            max_retries: Attempts per batch for non-429 errors; 429s get 4x this
+        """
+        self.embeddings = embeddings
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.max_rate_limit_retries = max_retries * 4
+
+    def _embed_batch(self, texts: List[str], batch: _Batch) -> List[List[float]]:
+        # Non-429 retries back off exponentially: 1s, 2s, 4s, ...
+        if batch.attempts:
+            delay = min(30, 2 ** (batch.attempts - 1))
+            metrics.BACKOFF_SECONDS.inc(delay)
+            time.sleep(delay)
+        batch.epoch = self.limiter.acquire()
+        try:
+            return self.embeddings.embed_documents(texts[batch.start : batch.end])
+        finally:
+            self.limiter.release()
+
+    def embed(
+        self,
+        texts: List[str],
+        on_batch: Optional[Callable[[int, List[List[float]]], None]] = None,
+    ) -> List[List[float]]:
+        """
+        Embed all texts, preserving order.
+
+        Args:
+            texts: Texts to embed
+            on_batch: Called as on_batch(start_index, vectors) for every completed
+                batch, in completion order, from the calling thread
+
+        Returns:
+            One vector per input text
+
+        Raises:
+            EmbeddingPipelineError: If any batch exhausted its retries
+        """
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        retry_queue = deque()
+        cursor = 0
+        failed: List[int] = []
+        errors: List[str] = []
+        inflight = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.limiter.max_concurrency,
+            thread_name_prefix="embed",
+        ) as executor:
+            while cursor < len(texts) or retry_queue or inflight:
+                # Fill free slots: retries first, then fresh batches
+                while len(inflight) < self.limiter.concurrency and (retry_queue or cursor < len(texts)):
+                    if retry_queue:
+                        batch = retry_queue.popleft()
+                    else:
+                        end = min(len(texts), cursor + self.limiter.batch_size)
+                        batch = _Batch(cursor, end)
+                        cursor = end
+                    inflight[executor.submit(self._embed_batch, texts, batch)] = batch
+
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = inflight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        rate_limited = is_rate_limit_error(e)
+                        metrics.EMBEDDING_REQUESTS.labels("rate_limited" if rate_limited else "error").inc()
+                        if rate_limited and batch.rate_limited + 1 < self.max_rate_limit_retries:
+                            metrics.EMBEDDING_RETRIES.labels("rate_limited").inc()
+                            batch.rate_limited += 1
+                            # One decrease per congestion event, not per in-flight batch
+                            if self.limiter.on_rate_limited(batch.epoch):
+                                print(
+                                    f"  Rate limit hit on chunks {batch.start}-{batch.end}; "
+                                    f"batch size now {self.limiter.batch_size}, "
+                                    f"concurrency {self.limiter.concurrency}"
+                                )
+                            retry_queue.extend(self._split(batch, self.limiter.batch_size))
+                        elif batch.attempts + 1 < self.max_retries:
+                            metrics.EMBEDDING_RETRIES.labels("error").inc()
+                            print(f"  Error on chunks {batch.start}-{batch.end} (attempt {batch.attempts + 1}): {e}")
+                            retry_queue.append(_Batch(batch.start, batch.end, batch.attempts + 1, batch.rate_limited))
+                        else:
+                            failed.extend(range(batch.start, batch.end))
+                            errors.append(f"chunks {batch.start}-{batch.end}: {e}")
+                        continue
+
+                    metrics.EMBEDDING_REQUESTS.labels("success").inc()
+                    self.limiter.on_success()
+                    vectors[batch.start : batch.end] = result
+                    if on_batch:
+                        on_batch(batch.start, result)
+
+        if failed:
+            raise EmbeddingPipelineError(failed, errors)
+        return vectors
+
+    @staticmethod
+    def _split(batch: _Batch, size: int) -> List[_Batch]:
+        """Re-slice a rate-limited batch to the limiter's reduced batch size."""
+        return [
+            _Batch(start, min(batch.end, start + size), batch.attempts, batch.rate_limited)
+            for start in range(batch.start, batch.end, size)
+        ]
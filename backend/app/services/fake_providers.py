@@ -0,0 +1,154 @@
+"""
+Deterministic local stand-ins for the Google embedding and chat models.
+
+Used by the benchmarks (and EMBEDDING_PROVIDER/LLM_PROVIDER=fake) to exercise
+the real pipeline without network access or API keys. Latency is simulated
+with blocking sleeps, matching how the synchronous Google clients behave
+inside the service. 429s are simulated deterministically: every Nth call,
+and/or whenever a per-second request quota is exceeded.
+"""
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+from typing import Any, Iterator, List, Optional
+import threading
+import time
+
+from backend.app.core import config
+
+
+class FakeRateLimitError(Exception):
+    """Stand-in for a Google 429 (RESOURCE_EXHAUSTED); detected via its code."""
+
+    code = 429
+
+    def __init__(self, message: str = "429 Resource has been exhausted (simulated)"):
+        super().__init__(message)
+
+
+class _Throttle:
+    """Deterministic 429 trigger shared by the fake providers."""
+
+    def __init__(self):
+        self.calls = 0
+        self.window_start = 0.0
+        self.window_calls = 0
+        self.lock = threading.Lock()
+
+    def check(self, rate_limit_every: int, quota_per_second: float):
+        with self.lock:
+            self.calls += 1
+            if rate_limit_every and self.calls % rate_limit_every == 0:
+                raise FakeRateLimitError()
+            if quota_per_second:
+                now = time.monotonic()
+                if now - self.window_start >= 1.0:
+                    self.window_start, self.window_calls = now, 0
+                self.window_calls += 1
+                if self.window_calls > quota_per_second:
+                    raise FakeRateLimitError()
+
+
+class FakeEmbeddings(DeterministicFakeEmbedding):
+    """
+    Hash-seeded vectors (same text, same vector) with per-request latency.
+
+    rate_limit_every=N fails every Nth request with a 429; quota_per_second
+    fails requests beyond that many per one-second window. Both are counted
+    per request, not per text, like the real batch endpoint.
+    """
+
+    latency_s: float = 0.0
+    rate_limit_every: int = 0
+    quota_per_second: float = 0.0
+    _throttle: _Throttle = PrivateAttr(default_factory=_Throttle)
+
+    @property
+    def requests(self) -> int:
+        """Requests received so far, including rate-limited ones."""
+        return self._throttle.calls
+
+    def _request(self):
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        self._throttle.check(self.rate_limit_every, self.quota_per_second)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self._request()
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        self._request()
+        return super().embed_query(text)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model returning a fixed-shape answer after simulated latency.
+
+    latency_s is paid before the first token; token_latency_s between
+    streamed tokens, so invoke() takes latency_s + n_tokens * token_latency_s.
+    rate_limit_every=N fails every Nth call with a 429.
+    """
+
+    latency_s: float = 0.0
+    token_latency_s: float = 0.0
+    answer_words: int = 40
+    rate_limit_every: int = 0
+    _throttle: _Throttle = PrivateAttr(default_factory=_Throttle)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _answer_tokens(self) -> List[str]:
+        return [f"word{i} " for i in range(self.answer_words)]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self._throttle.check(self.rate_limit_every, 0)
+        tokens = self._answer_tokens()
+        time.sleep(self.latency_s + self.token_latency_s * len(tokens))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens)))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        self._throttle.check(self.rate_limit_every, 0)
+        time.sleep(self.latency_s)
+        for token in self._answer_tokens():
+            if self.token_latency_s:
+                time.sleep(self.token_latency_s)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def create_fake_embeddings() -> FakeEmbeddings:
+    """FakeEmbeddings configured from FAKE_EMBED_* settings (EMBEDDING_PROVIDER=fake)."""
+    return FakeEmbeddings(
+        size=config.EMBEDDING_DIMENSIONS,
+        latency_s=config.FAKE_EMBED_LATENCY_S,
+        rate_limit_every=config.FAKE_EMBED_RATE_LIMIT_EVERY,
+        quota_per_second=config.FAKE_EMBED_QUOTA_PER_SECOND,
+    )
+
+
+def create_fake_llm() -> FakeChatModel:
+    """FakeChatModel configured from FAKE_LLM_* settings (LLM_PROVIDER=fake)."""
+    return FakeChatModel(
+        latency_s=config.FAKE_LLM_LATENCY_S,
+        token_latency_s=config.FAKE_LLM_TOKEN_LATENCY_S,
+        rate_limit_every=config.FAKE_LLM_RATE_LIMIT_EVERY,
+    )
@@ -0,0 +1,205 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+import hashlib
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+# File layout (all integers little-endian):
+#   magic (8 bytes) | version, header length (2 x uint32) | header JSON
+#   | zero padding to a 64-byte boundary | payload
+# The payload holds the float32 vector matrix first (so it can be
+# memory-mapped in place), then the chunk JSON and an optional summary JSON.
+# Header offsets are relative to the payload start; the header's sha256
+# covers the whole payload.
+MAGIC = b"VTWINIDX"
+VERSION = 1
+SNAPSHOT_SUFFIX = ".vtidx"
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGN = 64
+_HASH_BLOCK = 1 << 20
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, truncated, corrupt or of an unknown version."""
+
+
+@dataclass
+class IndexSnapshot:
+    """
+    One video's index, as written to or read from a snapshot file.
+
+    vectors are L2-normalized float32 rows; after read_snapshot() they are
+    a read-only memory map of the file, paged in on demand.
+    """
+    video_id: str
+    embedding_model: str
+    ids: List[int]
+    vectors: np.ndarray
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    summary: Optional[Dict[str, Any]] = None
+    info: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+
+def snapshot_path(directory: str, video_id: str) -> str:
+    return os.path.join(directory, f"{video_id}{SNAPSHOT_SUFFIX}")
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_snapshot(path: str, snapshot: IndexSnapshot) -> int:
+    """
+    Write a snapshot durably: temp file, fsync, atomic rename, directory fsync.
+
+    A crash mid-write leaves the previous snapshot (or none) in place,
+    never a partial file under the final name.
+
+    Returns:
+        Bytes written
+    """
+    vectors = np.ascontiguousarray(snapshot.vectors, dtype="<f4")
+    if vectors.ndim != 2 or len(vectors) != len(snapshot.ids):
+        raise ValueError("vectors must be a 2-D matrix with one row per chunk id")
+    vector_bytes = vectors.tobytes()
+    chunk_bytes = json.dumps(
+        {"ids": list(snapshot.ids), "texts": list(snapshot.texts), "metadatas": list(snapshot.metadatas)},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    summary_bytes = json.dumps(snapshot.summary, separators=(",", ":")).encode("utf-8") if snapshot.summary else b""
+
+    payload = (vector_bytes, chunk_bytes, summary_bytes)
+    digest = hashlib.sha256()
+    for part in payload:
+        digest.update(part)
+    header = json.dumps({
+        "video_id": snapshot.video_id,
+        "embedding_model": snapshot.embedding_model,
+        "rows": int(vectors.shape[0]),
+        "dim": int(vectors.shape[1]),
+        "chunks_offset": len(vector_bytes),
+        "chunks_length": len(chunk_bytes),
+        "summary_offset": len(vector_bytes) + len(chunk_bytes),
+        "summary_length": len(summary_bytes),
+        "sha256": digest.hexdigest(),
+        "created_at": snapshot.created_at,
+        "info": snapshot.info,
+    }).encode("utf-8")
+    preamble = _PREAMBLE.pack(MAGIC, VERSION, len(header))
+    padding = b"\0" * (_aligned(len(preamble) + len(header)) - len(preamble) - len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        for part in (preamble, header, padding) + payload:
+            f.write(part)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # Directory fsync is unsupported on some filesystems
+    return len(preamble) + len(header) + len(padding) + sum(len(part) for part in payload)
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """
+    Parse and check a snapshot's header without touching the payload.
+
+    Raises:
+        SnapshotError: If the file is not a snapshot, is truncated or has an unsupported version
+    """
+    try:
+        with open(path, "rb") as f:
+            preamble = f.read(_PREAMBLE.size)
+            if len(preamble) < _PREAMBLE.size:
+                raise SnapshotError(f"{path}: truncated header")
+            magic, version, header_length = _PREAMBLE.unpack(preamble)
+            if magic != MAGIC:
+                raise SnapshotError(f"{path}: not an index snapshot")
+            if version != VERSION:
+                raise SnapshotError(f"{path}: unsupported snapshot version {version} (expected {VERSION})")
+            header = json.loads(f.read(header_length).decode("utf-8"))
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"{path}: unreadable header: {e}") from e
+    header["payload_offset"] = _aligned(_PREAMBLE.size + header_length)
+    payload_length = header["summary_offset"] + header["summary_length"]
+    if os.path.getsize(path) != header["payload_offset"] + payload_length:
+        raise SnapshotError(f"{path}: size does not match header (truncated or appended)")
+    return header
+
+
+def _verify(path: str, header: Dict[str, Any]):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        f.seek(header["payload_offset"])
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    if digest.hexdigest() != header["sha256"]:
+        raise SnapshotError(f"{path}: checksum mismatch")
+
+
+def read_snapshot(path: str, verify: bool = True) -> IndexSnapshot:
+    """
+    Load a snapshot with its vectors memory-mapped (nothing is copied up front).
+
+    Args:
+        path: Snapshot file
+        verify: Check the payload's sha256 before use (reads the file once)
+
+    Raises:
+        SnapshotError: If the file is invalid, corrupt or of an unsupported version
+    """
+    header = read_header(path)
+    if verify:
+        _verify(path, header)
+    offset = header["payload_offset"]
+    rows, dim = header["rows"], header["dim"]
+    try:
+        if rows:
+            vectors = np.memmap(path, dtype="<f4", mode="r", offset=offset, shape=(rows, dim))
+        else:
+            vectors = np.empty((0, dim), dtype=np.float32)
+        with open(path, "rb") as f:
+            f.seek(offset + header["chunks_offset"])
+            chunks = json.loads(f.read(header["chunks_length"]).decode("utf-8"))
+            summary = None
+            if header["summary_length"]:
+                f.seek(offset + header["summary_offset"])
+                summary = json.loads(f.read(header["summary_length"]).decode("utf-8"))
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"{path}: unreadable payload: {e}") from e
+    return IndexSnapshot(
+        video_id=header["video_id"],
+        embedding_model=header["embedding_model"],
+        ids=chunks["ids"],
+        vectors=vectors,
+        texts=chunks["texts"],
+        metadatas=chunks["metadatas"],
+        summary=summary,
+        info=header.get("info", {}),
+        created_at=header.get("created_at", 0.0),
+    )
+
+
+def list_snapshots(directory: str) -> Sequence[str]:
+    """Snapshot files in a directory, sorted by name."""
+    if not os.path.isdir(directory):
+        return []
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.endswith(SNAPSHOT_SUFFIX)
+    ]
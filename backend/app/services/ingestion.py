@@ -1,10 +1,13 @@
-import yt_dlp
-import requests
-import json
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
 import re
 from typing import List, Optional
-import os
+
+from backend.app.core import config, metrics
+from backend.app.services.caption_dedup import DedupStats, NearDuplicateFilter, dedupe_segments, drop_near_duplicates
+from backend.app.services.chunker import TranscriptChunker
+from backend.app.services.transcript import Transcript
+from backend.app.services.transcript_cache import TranscriptCache
+from backend.app.services.transcript_fetcher import TranscriptFetcher
 
 class IngestionService:
     """
@@ -15,12 +18,32 @@ class IngestionService:
     """
     
     def __init__(self):
-        """Initialize text splitter with optimized chunk parameters for semantic search."""
+        """Initialize the chunker with optimized chunk parameters for semantic search."""
         # Chunk size balances context window and retrieval precision
         # 200-char overlap ensures semantic continuity across chunks
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
+        # Spans are offsets into the transcript buffer, mapping each chunk back to video time
+        self.chunker = TranscriptChunker(
+            chunk_size=config.CHUNK_SIZE,
+            chunk_overlap=config.CHUNK_OVERLAP,
+        )
+
+        # Parsed transcripts survive across ingests so repeat videos skip yt-dlp
+        self.transcript_cache = None
+        if config.TRANSCRIPT_CACHE_ENABLED:
+            self.transcript_cache = TranscriptCache(
+                directory=config.TRANSCRIPT_CACHE_DIR,
+                ttl_seconds=config.TRANSCRIPT_CACHE_TTL_SECONDS,
+                max_bytes=config.TRANSCRIPT_CACHE_MAX_BYTES,
+            )
+
+        # Repeated caption text is removed before chunking; near-duplicate chunks are not embedded
+        self.near_duplicates = NearDuplicateFilter(threshold=config.CAPTION_DEDUP_NEAR_THRESHOLD)
+
+        # One fetch client for the service's lifetime: cookies and HTTP pool are set up once
+        self.fetcher = TranscriptFetcher(
+            timeout_s=config.TRANSCRIPT_HTTP_TIMEOUT_SECONDS,
+            retries=config.TRANSCRIPT_HTTP_RETRIES,
+            pool_size=config.TRANSCRIPT_HTTP_POOL_SIZE,
         )
 
     def _extract_video_id(self, url: str) -> Optional[str]:
@@ -44,140 +67,180 @@ class IngestionService:
             return match.group(1)
         return None
 
-    def get_transcript(self, url: str) -> str:
+    def get_transcript(self, url: str) -> Transcript:
         """
-        Fetch video transcript using yt-dlp with cookie-based authentication.
+        Return the video transcript, from the on-disk cache when possible.
+        
+        A cache hit (same video, fresh entry) skips yt-dlp and the subtitle
+        download entirely. Misses are fetched and written back to the cache.
+        Concurrent calls for the same video share one lookup and fetch.
         
-        Strategy:
-            1. Load cookies from environment (production) or filesystem (local)
-            2. Use browser-like headers to avoid bot detection
-            3. Extract JSON3 subtitle format for best quality
-            4. Parse and concatenate all text segments
-            
         Args:
             url: YouTube video URL
             
         Returns:
-            Full transcript as concatenated string
+            Transcript with the concatenated text and per-segment timing
             
         Raises:
             Exception: If no subtitles found or extraction fails
-            
-        Note:
-            Cookies are required for videos that trigger YouTube's bot detection.
-            In Cloud Run, cookies are loaded from YOUTUBE_COOKIES_BASE64 env var.
         """
-        ydl_opts = {
-            'writesubtitles': True,
-            'writeautomaticsub': True,
-            'skip_download': True,
-            'quiet': False,
-            'no_warnings': False,
-            # Mimic Chrome browser to avoid bot detection
-            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'referer': 'https://www.youtube.com/',
-            'nocheckcertificate': True,
-        }
-
-        # Cookie authentication strategy for production deployment
-        # Cookies stored as base64-encoded env var to avoid file system dependencies
-        youtube_cookies = os.getenv('YOUTUBE_COOKIES_BASE64')
+        video_id = self._extract_video_id(url)
+        if not video_id:
+            return self.fetcher.fetch(url)[0]
+        transcript, shared = self.fetcher.flights.do(video_id, lambda: self._load_transcript(video_id, url))
+        metrics.TRANSCRIPT_FETCHES.labels("coalesced" if shared else "leader").inc()
+        if shared:
+            print(f"✓ Joined in-flight transcript fetch for {video_id}")
+        return transcript
+
+    def _load_transcript(self, video_id: str, url: str) -> Transcript:
+        """
+        Cache lookup, then fetch and write-back on a miss (run once per in-flight video).
         
-        if youtube_cookies:
-            try:
-                import base64
-                # Decode and write to /tmp (only writable location in Cloud Run)
-                cookies_content = base64.b64decode(youtube_cookies).decode('utf-8')
-                cookie_file = '/tmp/cookies.txt'
-                
-                with open(cookie_file, 'w') as f:
-                    f.write(cookies_content)
-                
-                ydl_opts['cookiefile'] = cookie_file
-                print(f"✓ Loaded cookies from environment variable to {cookie_file}")
-            except Exception as e:
-                print(f"⚠ Error loading cookies from env: {e}")
-        else:
-            # Local development fallback - check multiple possible locations
-            cookie_paths = [
-                'cookies.txt',
-                '/workspace/cookies.txt',
-                os.path.join(os.path.dirname(__file__), '../../../../cookies.txt'),
-            ]
-            
-            cookie_found = False
-            for cookie_path in cookie_paths:
-                abs_path = os.path.abspath(cookie_path)
-                print(f"Checking for cookies at: {abs_path}")
-                if os.path.exists(abs_path):
-                    ydl_opts['cookiefile'] = abs_path
-                    print(f"✓ Using cookies from: {abs_path}")
-                    cookie_found = True
-                    break
-            
-            if not cookie_found:
-                print("⚠ WARNING: No cookies found! Set YOUTUBE_COOKIES_BASE64 env var or include cookies.txt")
-                print(f"Current working directory: {os.getcwd()}")
-
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                
-                # Prefer manual subtitles over auto-generated for accuracy
-                subtitles = info.get('subtitles') or info.get('automatic_captions')
-                if not subtitles:
-                    raise Exception("No subtitles found for this video.")
-
-                # Language selection priority: English variants, then first available
-                lang = 'en'
-                if lang not in subtitles:
-                    lang = next((l for l in subtitles if l.startswith('en')), None)
-                
-                if not lang:
-                    lang = list(subtitles.keys())[0]
-
-                subs = subtitles[lang]
-                
-                # JSON3 format provides best quality with proper timing and formatting
-                json3_sub = next((s for s in subs if s['ext'] == 'json3'), None)
-                
-                if json3_sub:
-                    response = requests.get(json3_sub['url'])
-                    response.raise_for_status()
-                    data = response.json()
-
-                    # Parse JSON3 structure: events -> segs -> utf8 text
-                    full_text = []
-                    if 'events' in data:
-                        for event in data['events']:
-                            if 'segs' in event:
-                                for seg in event['segs']:
-                                    if 'utf8' in seg and seg['utf8'] != '\n':
-                                        full_text.append(seg['utf8'])
-                    return " ".join(full_text)
-                
-                raise Exception(f"No suitable subtitle format found for language {lang}")
-
-        except Exception as e:
-            raise Exception(f"Failed to fetch transcript: {str(e)}")
-
-    def process_video(self, url: str) -> List[str]:
+        Note:
+            Cached variants are ranked like the fetcher's track selection
+            (manual first, then the preferred language and its variants), but
+            any fresh variant is accepted on purpose: which tracks a video
+            has is only known after a yt-dlp extract, the very call the cache
+            exists to skip. A manual or preferred-language track added after
+            the cached one was fetched is picked up once the entry expires
+            (TRANSCRIPT_CACHE_TTL_SECONDS).
+        """
+        if self.transcript_cache:
+            with metrics.stage("ingest", "transcript_cache"):
+                entry = self.transcript_cache.get(video_id, preferred_language=self.fetcher.preferred_language)
+            if entry is not None:
+                print(f"✓ Transcript cache hit for {video_id} ({entry['language']}, {entry['kind']})")
+                return Transcript.from_dict(entry["transcript"])
+
+        transcript, metadata = self.fetcher.fetch(url)
+        if self.transcript_cache:
+            self.transcript_cache.put(
+                video_id, metadata["language"], metadata["kind"], transcript.to_dict(), metadata
+            )
+        return transcript
+
+    def process_video(
+        self,
+        url: str,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        dedup_stats: Optional[DedupStats] = None,
+    ) -> List[Document]:
         """
-        Orchestrate full ingestion pipeline: validate URL -> fetch transcript -> chunk text.
+        Orchestrate full ingestion pipeline: validate URL -> fetch transcript -> dedup -> chunk text.
         
         Args:
             url: YouTube video URL
+            chunk_size: Per-request chunk size override (None = service default)
+            chunk_overlap: Per-request chunk overlap override (None = service default)
+            dedup_stats: Receives what caption dedup removed (if enabled)
             
         Returns:
-            List of text chunks ready for embedding
+            Chunk Documents ready for embedding; metadata carries the chunk's
+            start_offset/end_offset in the transcript and start_ms/end_ms in the video
             
         Raises:
-            ValueError: If URL format is invalid
+            ValueError: If URL format or chunk parameters are invalid
             Exception: If transcript extraction fails
         """
         if not self._extract_video_id(url):
              raise ValueError("Invalid YouTube URL")
 
+        chunker = self.chunker_for(chunk_size, chunk_overlap)
         transcript = self.get_transcript(url)
-        chunks = self.text_splitter.split_text(transcript)
+        return self.prepare_chunks(transcript, chunker, dedup_stats)
+
+    def prepare_chunks(
+        self,
+        transcript: Transcript,
+        chunker: Optional[TranscriptChunker] = None,
+        dedup_stats: Optional[DedupStats] = None,
+    ) -> List[Document]:
+        """
+        Deduplicate (when CAPTION_DEDUP_ENABLED) and chunk a transcript.
+        
+        Repeated caption segments are removed before chunking, then chunks
+        nearly duplicating an earlier chunk are dropped so they are never
+        embedded.
+        
+        Args:
+            transcript: Parsed transcript
+            chunker: Chunker to use (None = service default)
+            dedup_stats: Receives what was removed, including the embeddings saved
+            
+        Returns:
+            Chunk Documents ready for embedding, in transcript order
+        """
+        chunker = chunker or self.chunker
+        if not config.CAPTION_DEDUP_ENABLED:
+            with metrics.stage("ingest", "chunking"):
+                return self.chunk_transcript(transcript, chunker)
+
+        stats = dedup_stats if dedup_stats is not None else DedupStats()
+        with metrics.stage("ingest", "dedup"):
+            deduped = dedupe_segments(transcript, stats, min_words=config.CAPTION_DEDUP_MIN_WORDS)
+        with metrics.stage("ingest", "chunking"):
+            chunks = self.chunk_transcript(deduped, chunker)
+        baseline_chunks = len(chunks)
+        if deduped is not transcript:
+            # The rebuilt text has single spaces between words; compare against
+            # the same normalization with the repeats left in, so only the
+            # removed repeats count as saved embeddings
+            with metrics.stage("ingest", "dedup"):
+                baseline_chunks = len(chunker.split(" ".join(transcript.text.split())))
+        with metrics.stage("ingest", "dedup"):
+            chunks = drop_near_duplicates(chunks, self.near_duplicates, stats)
+        stats.embeddings_saved += max(0, baseline_chunks - len(chunks))
+
+        metrics.DEDUP_SAVED.labels("chars").inc(stats.chars_saved)
+        metrics.DEDUP_SAVED.labels("embeddings").inc(stats.embeddings_saved)
+        if stats.chars_saved:
+            print(
+                f"Caption dedup: {stats.segments_dropped} segments dropped, {stats.segments_trimmed} trimmed, "
+                f"{stats.chunks_skipped} near-duplicate chunks skipped; saved {stats.chars_saved} chars, "
+                f"{stats.embeddings_saved} embeddings"
+            )
+        return chunks
+
+    def chunker_for(self, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None) -> TranscriptChunker:
+        """
+        The default chunker, or one with the given overrides applied.
+        
+        Raises:
+            ValueError: If the resulting chunk parameters are invalid
+        """
+        chunker = self.chunker
+        if chunk_size is not None or chunk_overlap is not None:
+            size = chunk_size if chunk_size is not None else chunker.chunk_size
+            if chunk_overlap is None:
+                # Keep the default overlap unless it no longer fits the smaller chunks
+                chunk_overlap = chunker.chunk_overlap if chunker.chunk_overlap < size else size // 5
+            chunker = TranscriptChunker(chunk_size=size, chunk_overlap=chunk_overlap)
+        return chunker
+
+    def chunk_transcript(self, transcript: Transcript, chunker: Optional[TranscriptChunker] = None) -> List[Document]:
+        """
+        Split a transcript into chunk Documents carrying offset and timing metadata.
+        
+        Args:
+            transcript: Parsed transcript
+            chunker: Chunker to use (None = service default)
+            
+        Returns:
+            One Document per chunk span, in transcript order
+        """
+        text = transcript.text
+        chunks = []
+        for start_offset, end_offset in (chunker or self.chunker).split(text):
+            start_ms, end_ms = transcript.time_span(start_offset, end_offset)
+            chunks.append(Document(
+                page_content=text[start_offset:end_offset],
+                metadata={
+                    "start_offset": start_offset,
+                    "end_offset": end_offset,
+                    "start_ms": start_ms,
+                    "end_ms": end_ms,
+                },
+            ))
         return chunks
@@ -0,0 +1,191 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Optional, Tuple
+import threading
+import time
+import uuid
+
+from backend.app.core import metrics
+from backend.app.services.admission import AdmissionPool, Overloaded, WaitStats, retry_after_seconds
+
+
+@dataclass
+class IngestionJob:
+    """Status record for one background ingestion."""
+    job_id: str
+    video_id: str
+    url: str
+    chunk_size: Optional[int] = None
+    chunk_overlap: Optional[int] = None
+    build_summary: Optional[bool] = None
+    status: str = "queued"          # queued | running | succeeded | failed
+    stage: str = "queued"           # queued | fetching_transcript | embedding | summarizing | done
+    chunks_total: int = 0
+    chunks_embedded: int = 0
+    dedup: Optional[Dict[str, int]] = None  # DedupStats.to_dict() once chunked
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    chat_ready_at: Optional[float] = None  # when the video became searchable (may precede finished_at)
+    finished_at: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class IngestionJobQueue:
+    """
+    Bounded worker pool running ingestion jobs off the request path.
+
+    Submitting a video that already has a queued or running job returns that
+    job instead of starting another one. Finished jobs are retained (up to a
+    limit) so clients can poll their final status.
+
+    At most max_queued jobs wait for a worker (jobs a free worker can take
+    at once are not counted); further submissions are shed with Overloaded.
+    A started job holds off while the yield_to pool has requests queued,
+    for at most max_yield_s.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[IngestionJob], None],
+        max_workers: int,
+        history_limit: int = 500,
+        max_queued: Optional[int] = None,
+        yield_to: Optional[AdmissionPool] = None,
+        max_yield_s: float = 0.0,
+    ):
+        """
+        Args:
+            runner: Performs the ingestion, updating the job's stage/progress fields
+            max_workers: Concurrent ingestions
+            history_limit: Finished jobs kept for status polling
+            max_queued: Jobs allowed to wait for a worker (None = unbounded)
+            yield_to: Higher-priority (chat) pool whose queued requests go first
+            max_yield_s: Longest a job defers to yield_to at each yield point
+        """
+        self.runner = runner
+        self.history_limit = history_limit
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.yield_to = yield_to
+        self.max_yield_s = max_yield_s
+        self.stats = WaitStats("ingest")
+        self._queued = 0
+        self._running = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._active_by_video: Dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        video_id: str,
+        url: str,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        build_summary: Optional[bool] = None,
+    ) -> Tuple[IngestionJob, bool]:
+        """
+        Queue an ingestion, collapsing duplicates onto the active job.
+
+        Chunking and summary overrides are carried on the job; a duplicate
+        submission reuses the active job together with its original settings.
+
+        Returns:
+            (job, created) where created is False if an active job was reused
+        """
+        with self._lock:
+            existing = self._active_by_video.get(video_id)
+            if existing is not None and existing.active:
+                return existing, False
+            # Only jobs beyond the free workers count against max_queued
+            if self.max_queued is not None and self._running + self._queued >= self.max_workers + self.max_queued:
+                self.stats.shed("queue_full")
+                raise Overloaded(
+                    "ingest", "queue_full",
+                    retry_after_seconds(self.stats.hold_s, self._queued, self.max_workers, cap=600),
+                )
+
+            job = IngestionJob(
+                job_id=uuid.uuid4().hex, video_id=video_id, url=url,
+                chunk_size=chunk_size, chunk_overlap=chunk_overlap, build_summary=build_summary,
+            )
+            self._jobs[job.job_id] = job
+            self._active_by_video[video_id] = job
+            self._queued += 1
+            self._gauges()
+            self._trim_history()
+
+        self._executor.submit(self._run, job)
+        return job, True
+
+    def status(self) -> Dict[str, Any]:
+        """Queue depth, running jobs and recent queue wait times."""
+        return {
+            "active": self._running,
+            "queued": self._queued,
+            "max_concurrency": self.max_workers,
+            "max_queue": self.max_queued,
+            **self.stats.snapshot(),
+        }
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active_for(self, video_id: str) -> Optional[IngestionJob]:
+        """The video's queued or running job, if any."""
+        with self._lock:
+            return self._active_by_video.get(video_id)
+
+    def _gauges(self):
+        metrics.ADMISSION_ACTIVE.labels("ingest").set(self._running)
+        metrics.ADMISSION_QUEUE_DEPTH.labels("ingest").set(self._queued)
+
+    def yield_to_priority(self) -> float:
+        """Hold off while higher-priority work is waiting (called between ingest stages)."""
+        if self.yield_to is None:
+            return 0.0
+        return self.yield_to.wait_until_idle(self.max_yield_s)
+
+    def _run(self, job: IngestionJob):
+        # Picked up by a worker: no longer queued, even while yielding to chat
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._gauges()
+        self.yield_to_priority()
+        job.status = "running"
+        job.started_at = time.time()
+        self.stats.waited(job.started_at - job.created_at)
+        try:
+            self.runner(job)
+            job.stage = "done"
+            job.status = "succeeded"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            print(f"Ingestion job {job.job_id} for {job.video_id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            self.stats.held(job.finished_at - job.started_at)
+            with self._lock:
+                self._running -= 1
+                self._gauges()
+                if self._active_by_video.get(job.video_id) is job:
+                    del self._active_by_video[job.video_id]
+
+    def _trim_history(self):
+        """Forget the oldest finished jobs beyond the history limit. Caller holds the lock."""
+        excess = len(self._jobs) - self.history_limit
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, job in self._jobs.items() if not job.active][:excess]:
+            del self._jobs[job_id]
@@ -0,0 +1,142 @@
+from array import array
+from collections import Counter
+from langchain_core.documents import Document
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+import re
+
+import numpy as np
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Question words and fillers that carry no lexical signal in captions
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be because been but by can could did do does
+doing for from had has have he her here him his how i if in into is it its just like me more
+most my no not of on or our out over said say says she so some than that the their them then
+there these they this those to too up us very was we were what when where which who whom why
+will with would you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords (numbers are kept)."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index over one video's chunks.
+
+    Postings are per-term int32 arrays of (chunk position, term frequency),
+    built once at ingest. Scoring touches only the postings of the query's
+    terms, so exact-term lookups (names, numbers) need no embedding call.
+    """
+
+    def __init__(self, chunks: Sequence[Document], k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            chunks: Chunk Documents in transcript order (position = chunk index)
+            k1: Term-frequency saturation
+            b: Length normalization strength
+        """
+        self.chunks = list(chunks)
+        self.k1 = k1
+        self.b = b
+
+        postings: Dict[str, Tuple[array, array]] = {}
+        lengths = np.zeros(len(self.chunks), dtype=np.float32)
+        for position, chunk in enumerate(self.chunks):
+            tokens = tokenize(chunk.page_content)
+            lengths[position] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                docs, tfs = postings.setdefault(term, (array("i"), array("i")))
+                docs.append(position)
+                tfs.append(tf)
+
+        n = len(self.chunks)
+        average = float(lengths.mean()) if n else 0.0
+        # Per-chunk length factor of the BM25 denominator, computed once
+        self._norm = k1 * (1 - b + b * lengths / average) if average else np.full(n, k1, np.float32)
+        self._postings = {
+            term: (np.frombuffer(docs, dtype=np.int32), np.frombuffer(tfs, dtype=np.int32).astype(np.float32))
+            for term, (docs, tfs) in postings.items()
+        }
+        self._idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, (docs, _) in self._postings.items()
+        }
+        # Unseen terms get the idf of a term appearing in no chunk
+        self._max_idf = math.log(1 + (n + 0.5) / 0.5)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def search(self, query: str, k: int = 4) -> Tuple[List[Tuple[int, float]], float]:
+        """
+        Rank chunks for a free-text query.
+
+        Returns:
+            (hits, coverage): hits are (chunk index, BM25 score) best first,
+            coverage is the share of the query's idf mass matched by the top
+            hit (terms absent from the transcript count as unmatched)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.chunks:
+            return [], 0.0
+
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        for term in terms:
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            docs, tfs = entry
+            scores[docs] += self._idf[term] * tfs * (self.k1 + 1) / (tfs + self._norm[docs])
+
+        matched = np.flatnonzero(scores)
+        if not len(matched):
+            return [], 0.0
+        if k < len(matched):
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        ranked = matched[np.argsort(-scores[matched])]
+        hits = [(int(i), float(scores[i])) for i in ranked]
+
+        top = hits[0][0]
+        total = sum(self._idf.get(term, self._max_idf) for term in terms)
+        covered = sum(
+            self._idf[term] for term in terms
+            if term in self._postings and self._contains(term, top)
+        )
+        return hits, covered / total
+
+    def _contains(self, term: str, position: int) -> bool:
+        docs = self._postings[term][0]
+        i = int(np.searchsorted(docs, position))
+        return i < len(docs) and docs[i] == position
+
+    def document(self, position: int) -> Document:
+        """Chunk Document at a position, tagged with its chunk index as id."""
+        chunk = self.chunks[position]
+        return Document(id=str(position), page_content=chunk.page_content, metadata=dict(chunk.metadata))
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = 60, limit: Optional[int] = None
+) -> List[Tuple[str, float]]:
+    """
+    Fuse several best-first rankings of ids with reciprocal-rank fusion.
+
+    Each id scores sum(1 / (k + rank)) over the rankings it appears in
+    (rank starting at 1), so agreement between rankings beats a single
+    high placement.
+
+    Returns:
+        (id, fused score) pairs, best first, at most limit of them
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank)
+    ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return ordered[:limit] if limit is not None else ordered
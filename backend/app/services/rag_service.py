@@ -1,11 +1,98 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
 
+from backend.app.core import config, metrics
 from backend.app.services.vector_store import VectorStoreService 
+from backend.app.services.admission import PrioritySlots
+from backend.app.services.answer_cache import CachedAnswer, SemanticAnswerCache
+from backend.app.services.context_assembly import ContextAssembler
+from backend.app.services.fake_providers import create_fake_llm
+from backend.app.services.summary_index import SummaryTree, SummaryTreeBuilder, is_broad_question
+from backend.app.services.transcript import format_timestamp
+from langchain_core.documents import Document
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+import asyncio
 import os
 
+# System prompt engineering for "Video Twin" persona
+# Key constraints: context-only answers, speaker's tone, first-person perspective
+VIDEO_TWIN_TEMPLATE = """You are the "Video Twin" — an AI agent that embodies the speaker of the YouTube video.
+
+            Your ONLY source of truth is the transcript chunks provided in the context.  
+            You must answer using information from the transcript, and you must imitate the speaker's tone and communication style.
+
+            ====================
+            STRICT RULES
+            ====================
+
+            1. Use ONLY the transcript context to answer factual questions.
+            2. NEVER use external knowledge or information not present in the transcript.
+            3. If the question cannot be answered using the transcript, respond:
+               "I don't have enough information from the video to answer that."
+            4. Do NOT repeat full transcript sentences unless they directly answer the question.
+            5. Maintain the speaker's tone:
+               - If the speaker sounds friendly, you sound friendly.
+               - If the speaker is professional, you answer professionally.
+               - If the speaker is motivational, you sound motivational.
+            6. SPEAK IN THE FIRST PERSON ("I", "me", "my").
+               - Act as if YOU are the one who spoke the words in the transcript.
+               - Example: Instead of "The speaker says...", say "I mentioned that..." or "In my video, I explained..."
+            7. For greetings like "Hi", "Hello", "Hey", respond naturally using the speaker's tone,  
+               but DO NOT invent any factual information.
+            8. Ignore previous conversation. Only the current context + user message matters.
+            9. If the user asks something outside the transcript, do NOT guess or add information.
+
+            ====================
+            YOUR JOB
+            ====================
+
+            Provide short, clear, transcript-grounded answers  
+            that reflect the narrator's tone and personality  
+            while strictly avoiding hallucination.
+
+            If no transcript context is provided or nothing is relevant,  
+            say: "I don't have enough information from the video to answer that."
+
+            Context:
+            {context}
+
+            Question:
+            {question}
+
+            Answer:"""
+
+
+@dataclass
+class RAGAnswer:
+    """Generated (or cached) answer plus how it was produced."""
+    answer: str
+    cached: bool = False
+    sources: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    coverage: float = 1.0  # fraction of the video's chunks searchable when it was answered
+
+@dataclass
+class StreamedAnswer:
+    """Token iterator for a streaming answer; cached answers arrive as one token."""
+    tokens: Iterator[str]
+    cached: bool = False
+    sources: List[Dict[str, Any]] = field(default_factory=list)
+    coverage: float = 1.0
+
+@dataclass
+class _Prepared:
+    """Outcome of the pre-generation stage: a cache hit or retrieved context."""
+    vector: Optional[List[float]]
+    cached: Optional[CachedAnswer] = None
+    context: str = ""
+    sources: List[Dict[str, Any]] = field(default_factory=list)
+    prompt_tokens: int = 0
+    coverage: float = 1.0
+    generation: Optional[int] = None  # answer cache generation read before retrieval
+
 class RAGService:
     """
     Orchestrates Retrieval-Augmented Generation pipeline for video Q&A.
@@ -14,140 +101,498 @@ class RAGService:
     to provide accurate, context-grounded answers that mimic the video speaker's tone.
     """
     
-    def __init__(self):
-        """Initialize vector store and LLM with production-ready configuration."""
-        self.vector_store_service = VectorStoreService()
-        
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY environment variable is not set")
-
-        # Gemini 2.0 Flash: Fast, cost-effective model optimized for conversational AI
-        # Temperature 0.7 balances creativity with factual accuracy
-        self.llm = ChatGoogleGenerativeAI(
-            model="models/gemini-2.0-flash",
-            temperature=0.7,
-            google_api_key=api_key,
-            convert_system_message_to_human=True  # Required for Gemini API compatibility
+    def __init__(
+        self,
+        vector_store_service: Optional[VectorStoreService] = None,
+        llm: Optional[BaseChatModel] = None,
+    ):
+        """
+        Initialize vector store and LLM with production-ready configuration.
+        
+        Args:
+            vector_store_service: Optional override (e.g. built with fake embeddings)
+            llm: Optional chat model override; defaults to LLM_PROVIDER (Gemini 2.0
+                Flash, or the fake chat model for offline runs)
+        """
+        self.vector_store_service = vector_store_service or VectorStoreService()
+        
+        if llm is None and config.LLM_PROVIDER == "fake":
+            llm = create_fake_llm()
+        if llm is None:
+            api_key = os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError("GOOGLE_API_KEY environment variable is not set")
+
+            # Deferred like the embeddings provider (slow SDK import)
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            # Gemini 2.0 Flash: Fast, cost-effective model optimized for conversational AI
+            # Temperature 0.7 balances creativity with factual accuracy
+            llm = ChatGoogleGenerativeAI(
+                model="models/gemini-2.0-flash",
+                temperature=0.7,
+                google_api_key=api_key,
+                convert_system_message_to_human=True  # Required for Gemini API compatibility
+            )
+        self.llm = llm
+
+        # Blocking retrieval + LLM calls run here, never on the event loop.
+        # The slots cap concurrent Gemini calls across all chat paths; summary
+        # building uses llm_slots.background and yields to waiting chat calls.
+        self.executor = ThreadPoolExecutor(max_workers=config.CHAT_WORKERS, thread_name_prefix="chat")
+        self.llm_slots = PrioritySlots(config.LLM_MAX_CONCURRENCY)
+
+        # Generation half of the pipeline; retrieval runs separately so callers
+        # (e.g. streaming) know exactly when context is ready
+        self.prompt = PromptTemplate.from_template(VIDEO_TWIN_TEMPLATE)
+        self.generation_chain = self.prompt | self.llm | StrOutputParser()
+
+        # Retrieved chunks are merged, de-duplicated and trimmed to a token budget
+        self.context_assembler = ContextAssembler(
+            token_budget=config.CONTEXT_TOKEN_BUDGET,
+            min_chunks=config.CONTEXT_MIN_CHUNKS,
+            score_gap=config.CONTEXT_SCORE_GAP,
+            dedup_similarity=config.CONTEXT_DEDUP_SIMILARITY,
+            chars_per_token=config.CHARS_PER_TOKEN,
         )
+        self._template_tokens = self.context_assembler.tokens(VIDEO_TWIN_TEMPLATE)
+
+        # Near-identical questions on the same video reuse a stored answer
+        self.answer_cache = None
+        if config.ANSWER_CACHE_ENABLED:
+            self.answer_cache = SemanticAnswerCache(
+                similarity_threshold=config.ANSWER_CACHE_SIMILARITY,
+                ttl_seconds=config.ANSWER_CACHE_TTL_SECONDS,
+                max_per_video=config.ANSWER_CACHE_MAX_PER_VIDEO,
+                max_entries=config.ANSWER_CACHE_MAX_ENTRIES,
+            )
 
-    def ingest_chunks(self, chunks: list[str]):
+    def ingest_chunks(self, video_id: str, chunks: List[Document], on_progress=None, on_searchable=None):
         """
         Store transcript chunks in vector database for semantic retrieval.
         
         Args:
-            chunks: List of text segments from video transcript
+            video_id: YouTube video ID the chunks belong to
+            chunks: Transcript chunk Documents (with start_ms/end_ms metadata)
+            on_progress: Optional callback(chunks_embedded, total) for job tracking
+            on_searchable: Optional callback() once the video can be chatted with,
+                which may be before all chunks are embedded (CHAT_MIN_INDEXED_FRACTION)
             
         Note:
             This must be called before ask_question() to populate the knowledge base.
+            Cached answers for the video are invalidated since the transcript changed.
         """
-        self.vector_store_service.create_vector_store(chunks)
+        self.vector_store_service.create_vector_store(
+            video_id, chunks, on_progress=on_progress, on_searchable=on_searchable
+        )
+        if self.answer_cache:
+            self.answer_cache.invalidate(video_id)
+
+    def build_summary(self, video_id: str, chunks: List[Document]) -> SummaryTree:
+        """
+        Build and attach the video's hierarchical summary index.
+        
+        Section summaries of SUMMARY_SECTION_CHUNKS consecutive chunks are
+        rolled up SUMMARY_FANOUT at a time into one video summary, using the
+        chat model under the shared LLM concurrency cap.
+        
+        Args:
+            video_id: YouTube video ID (must already be ingested)
+            chunks: The same chunk Documents passed to ingest_chunks()
+            
+        Returns:
+            The SummaryTree now used to answer broad questions
+            
+        Raises:
+            ValueError: If the video is not ingested (or was evicted)
+        """
+        builder = SummaryTreeBuilder(
+            self.llm,
+            section_chunks=config.SUMMARY_SECTION_CHUNKS,
+            fanout=config.SUMMARY_FANOUT,
+            sentences=config.SUMMARY_SENTENCES,
+            max_workers=config.SUMMARY_CONCURRENCY,
+            llm_slots=self.llm_slots.background,
+        )
+        with metrics.stage("embed", "summary_tree"):
+            tree = builder.build(chunks)
+        self.vector_store_service.set_summary(video_id, tree)
+        if self.answer_cache:
+            self.answer_cache.invalidate(video_id)
+        print(
+            f"Summary index for {video_id}: {' -> '.join(str(len(level)) for level in tree.levels)} "
+            f"nodes per level, {tree.llm_calls} LLM calls"
+        )
+        return tree
 
     def _format_docs(self, docs):
         """
         Concatenate retrieved documents into single context string.
         
+        Each chunk is prefixed with its video timestamp (e.g. "[12:34]") when
+        the chunk carries timing metadata, so answers can reference it.
+        
         Args:
             docs: List of LangChain Document objects from retriever
             
         Returns:
             Formatted context string with double newlines between chunks
         """
-        return "\n\n".join(doc.page_content for doc in docs)
+        parts = []
+        for doc in docs:
+            if "start_ms" in doc.metadata:
+                parts.append(f"[{format_timestamp(doc.metadata['start_ms'])}] {doc.page_content}")
+            else:
+                parts.append(doc.page_content)
+        return "\n\n".join(parts)
 
-    def ask_question(self, question: str) -> str:
+    @staticmethod
+    def _sources(docs) -> List[Dict[str, Any]]:
+        """Timestamp citations for the retrieved chunks, in retrieval order."""
+        return [
+            {
+                "start_ms": doc.metadata["start_ms"],
+                "end_ms": doc.metadata["end_ms"],
+                "timestamp": format_timestamp(doc.metadata["start_ms"]),
+            }
+            for doc in docs
+            if "start_ms" in doc.metadata
+        ]
+
+    def _prepare(self, question: str, video_id: str) -> _Prepared:
+        """
+        Retrieve context for a question, or reuse a cached answer.
+        
+        Broad whole-video questions are answered from the precomputed summary
+        index when one exists, and clear keyword questions take the lexical
+        fast path (neither embeds the question nor uses the answer cache).
+        Otherwise the question is embedded once, used for the answer cache
+        lookup and for hybrid BM25 + vector retrieval.
+        
+        While the video is still being embedded, the coverage read before
+        retrieval is carried on the result (and the answer is not cached).
+        The answer cache generation is read at the same point, so an answer
+        retrieved from an index that a re-ingest has since replaced is not
+        cached either.
+        
+        Raises:
+            ValueError: If the video is not ingested (or was evicted)
+        """
+        summarized = self._summary_route(question, video_id, log_for=video_id)
+        if summarized is not None:
+            return summarized
+
+        coverage = self.vector_store_service.coverage(video_id)
+        generation = self.answer_cache.generation(video_id) if self.answer_cache else None
+        k = config.CONTEXT_CANDIDATES
+        if config.LEXICAL_FAST_PATH_ENABLED:
+            with metrics.stage("chat", "lexical_fast_path"):
+                scored = self.vector_store_service.lexical_fast_path(video_id, question, k=k)
+            if scored is not None:
+                metrics.RETRIEVAL_PATHS.labels("lexical").inc()
+                return self._with_context(
+                    question, None, scored, log_for=video_id, coverage=coverage, generation=generation
+                )
+
+        with metrics.stage("chat", "embed_query"):
+            vector = self.vector_store_service.embed_query(question)
+        if self.answer_cache:
+            with metrics.stage("chat", "answer_cache"):
+                hit = self.answer_cache.lookup(video_id, vector)
+            if hit is not None:
+                return _Prepared(vector=vector, cached=hit)
+        with metrics.stage("chat", "retrieval"):
+            scored = self.vector_store_service.hybrid_search(video_id, question, vector, k=k)
+        metrics.RETRIEVAL_PATHS.labels("hybrid").inc()
+        return self._with_context(
+            question, vector, scored, log_for=video_id, coverage=coverage, generation=generation
+        )
+
+    def _summary_route(self, question: str, video_id: str, log_for: Optional[str] = None) -> Optional[_Prepared]:
+        """
+        Context from the summary index for broad questions ("summarize the video").
+        
+        Returns None (use chunk retrieval) unless routing is enabled, the
+        video has a summary tree and the question is about the whole video.
+        The context is the video summary plus the most detailed summary
+        level that fits the context token budget, so its size does not grow
+        with video length.
+        """
+        if not config.SUMMARY_ROUTING_ENABLED:
+            return None
+        tree = self.vector_store_service.summary(video_id)
+        if tree is None or not is_broad_question(question):
+            return None
+        metrics.RETRIEVAL_PATHS.labels("summary").inc()
+        docs = tree.context_docs(self.context_assembler.token_budget, self.context_assembler.tokens)
+        context = self._format_docs(docs)
+        prompt_tokens = (
+            self._template_tokens
+            + self.context_assembler.tokens(context)
+            + self.context_assembler.tokens(question)
+        )
+        if log_for is not None:
+            print(f"Context for {log_for}: {len(docs)} summaries, ~{prompt_tokens} prompt tokens")
+        return _Prepared(vector=None, context=context, sources=self._sources(docs), prompt_tokens=prompt_tokens)
+
+    def _with_context(
+        self,
+        question: str,
+        vector: Optional[List[float]],
+        scored,
+        log_for: Optional[str] = None,
+        coverage: float = 1.0,
+        generation: Optional[int] = None,
+    ) -> _Prepared:
+        """
+        Assemble the budgeted context for scored retrieval hits.
+        
+        Args:
+            question: The user's question (counted towards prompt tokens)
+            vector: Question embedding, None on the lexical fast path
+            scored: (Document, score) hits, best first
+            log_for: Video ID to log prompt token counts for (None = no log)
+            coverage: Fraction of the video's chunks the hits were searched from
+            generation: Answer cache generation read before the search
+        """
+        with metrics.stage("chat", "context_assembly"):
+            assembled = self.context_assembler.assemble(scored)
+            context = self._format_docs(assembled.docs)
+        prompt_tokens = (
+            self._template_tokens
+            + self.context_assembler.tokens(context)
+            + self.context_assembler.tokens(question)
+        )
+        if log_for is not None:
+            print(
+                f"Context for {log_for}: {len(assembled.docs)} passages from "
+                f"{assembled.selected}/{assembled.candidates} chunks, ~{prompt_tokens} prompt tokens "
+                f"(budget {self.context_assembler.token_budget} context tokens)"
+                + (f", {coverage:.0%} of the video indexed" if coverage < 1.0 else "")
+            )
+        return _Prepared(
+            vector=vector, context=context, sources=self._sources(assembled.docs), prompt_tokens=prompt_tokens,
+            coverage=coverage, generation=generation,
+        )
+
+    def _prepare_many(self, questions: List[str], video_id: str) -> List[_Prepared]:
+        """
+        Batch form of _prepare(): one embedding request and one vector search for the whole batch.
+        
+        Summary-routed and lexical fast-path questions skip embedding; the rest are embedded
+        together, checked against the answer cache, and retrieved with a
+        single batched hybrid search.
+        
+        Raises:
+            ValueError: If the video is not ingested (or was evicted)
+        """
+        vector_store = self.vector_store_service
+        coverage = vector_store.coverage(video_id)
+        generation = self.answer_cache.generation(video_id) if self.answer_cache else None
+        k = config.CONTEXT_CANDIDATES
+        prepared: List[Optional[_Prepared]] = [None] * len(questions)
+        pending = []
+        for i, question in enumerate(questions):
+            summarized = self._summary_route(question, video_id)
+            if summarized is not None:
+                prepared[i] = summarized
+                continue
+            if config.LEXICAL_FAST_PATH_ENABLED:
+                scored = vector_store.lexical_fast_path(video_id, question, k=k)
+                if scored is not None:
+                    metrics.RETRIEVAL_PATHS.labels("lexical").inc()
+                    prepared[i] = self._with_context(
+                        question, None, scored, coverage=coverage, generation=generation
+                    )
+                    continue
+            pending.append(i)
+        if not pending:
+            self._log_batch_tokens(video_id, prepared)
+            return prepared
+
+        with metrics.stage("chat", "batch_embed_queries"):
+            vectors = vector_store.embed_queries([questions[i] for i in pending])
+        to_search = []
+        for i, vector in zip(pending, vectors):
+            hit = self.answer_cache.lookup(video_id, vector) if self.answer_cache else None
+            if hit is not None:
+                prepared[i] = _Prepared(vector=vector, cached=hit)
+            else:
+                to_search.append((i, vector))
+
+        if to_search:
+            with metrics.stage("chat", "batch_retrieval"):
+                scored_lists = vector_store.hybrid_search_many(
+                    video_id, [questions[i] for i, _ in to_search], [vector for _, vector in to_search], k=k
+                )
+            metrics.RETRIEVAL_PATHS.labels("hybrid").inc(len(to_search))
+            for (i, vector), scored in zip(to_search, scored_lists):
+                prepared[i] = self._with_context(
+                    questions[i], vector, scored, coverage=coverage, generation=generation
+                )
+        self._log_batch_tokens(video_id, prepared)
+        return prepared
+
+    @staticmethod
+    def _log_batch_tokens(video_id: str, prepared: List[_Prepared]):
+        """One summary line of prompt token counts for a batch (per-item logging would flood)."""
+        counts = [item.prompt_tokens for item in prepared if item.cached is None]
+        if counts:
+            print(
+                f"Batch context for {video_id}: {len(counts)} prompts, ~{sum(counts)} prompt tokens "
+                f"(mean ~{sum(counts) // len(counts)}, max ~{max(counts)})"
+            )
+
+    def _generate(self, question: str, video_id: str, prepared: _Prepared) -> str:
+        """Prompt → LLM → parser over retrieved context, under the LLM concurrency cap."""
+        with self.llm_slots, metrics.stage("chat", "generation"):
+            answer = self.generation_chain.invoke({"context": prepared.context, "question": question})
+        self._remember(video_id, question, prepared, answer)
+        return answer
+
+    def _remember(self, video_id: str, question: str, prepared: _Prepared, answer: str):
+        """
+        Store a freshly generated answer in the semantic cache (needs the question vector).
+        
+        Answers drawn from a partly indexed video are not stored: the rest
+        of the video may hold a better answer. Neither are answers whose
+        video was re-ingested (its cache invalidated) since retrieval.
+        """
+        if self.answer_cache and answer and prepared.vector is not None and prepared.coverage >= 1.0:
+            self.answer_cache.store(
+                video_id, question, prepared.vector, answer, prepared.sources, generation=prepared.generation
+            )
+
+    def ask_question(self, question: str, video_id: str) -> RAGAnswer:
         """
         Execute RAG pipeline: retrieve relevant context + generate grounded answer.
         
         Pipeline stages:
-            1. Semantic search: Find most relevant transcript chunks
-            2. Context formatting: Prepare retrieved text for LLM
-            3. Prompt construction: Inject context + question into template
-            4. LLM generation: Generate answer following strict grounding rules
-            5. Output parsing: Extract clean text response
+            0. Summary route: Whole-video questions use the precomputed summaries
+            1. Lexical fast path: Clear keyword hits skip embedding entirely
+            2. Question embedding: Embed once, reused for cache lookup and search
+            3. Answer cache: Reuse the answer to a near-identical earlier question
+            4. Hybrid search: Fuse BM25 and vector rankings of transcript chunks
+            5. Prompt construction: Inject context + question into template
+            6. LLM generation: Generate answer following strict grounding rules
             
         Args:
             question: User's question about the video
+            video_id: YouTube video ID whose transcript grounds the answer
             
         Returns:
-            AI-generated answer grounded in transcript context
-            
-        Raises:
-            ValueError: If vector store not initialized (no video ingested)
-            Exception: If LLM generation fails
+            RAGAnswer with the answer text, whether it came from the cache,
+            timestamp citations of the chunks used as context and the
+            fraction of the video indexed (below 1.0 while still ingesting)
             
         Note:
             System prompt enforces strict context adherence to prevent hallucination.
             Answers are designed to mimic the video speaker's tone and perspective.
+            Errors are returned as answer text, matching the chat UI's expectations.
         """
         try:
-            # Retrieve semantically similar chunks from vector store
-            retriever = self.vector_store_service.get_retriever()
-
-            # System prompt engineering for "Video Twin" persona
-            # Key constraints: context-only answers, speaker's tone, first-person perspective
-            template = """You are the "Video Twin" — an AI agent that embodies the speaker of the YouTube video.
-
-            Your ONLY source of truth is the transcript chunks provided in the context.  
-            You must answer using information from the transcript, and you must imitate the speaker's tone and communication style.
-
-            ====================
-            STRICT RULES
-            ====================
-
-            1. Use ONLY the transcript context to answer factual questions.
-            2. NEVER use external knowledge or information not present in the transcript.
-            3. If the question cannot be answered using the transcript, respond:
-               "I don't have enough information from the video to answer that."
-            4. Do NOT repeat full transcript sentences unless they directly answer the question.
-            5. Maintain the speaker's tone:
-               - If the speaker sounds friendly, you sound friendly.
-               - If the speaker is professional, you answer professionally.
-               - If the speaker is motivational, you sound motivational.
-            6. SPEAK IN THE FIRST PERSON ("I", "me", "my").
-               - Act as if YOU are the one who spoke the words in the transcript.
-               - Example: Instead of "The speaker says...", say "I mentioned that..." or "In my video, I explained..."
-            7. For greetings like "Hi", "Hello", "Hey", respond naturally using the speaker's tone,  
-               but DO NOT invent any factual information.
-            8. Ignore previous conversation. Only the current context + user message matters.
-            9. If the user asks something outside the transcript, do NOT guess or add information.
+            with metrics.stage("chat", "total"):
+                prepared = self._prepare(question, video_id)
+                if prepared.cached is not None:
+                    return RAGAnswer(answer=prepared.cached.answer, cached=True, sources=prepared.cached.sources)
+                
+                answer = self._generate(question, video_id, prepared)
+                return RAGAnswer(answer=answer, sources=prepared.sources, coverage=prepared.coverage)
 
-            ====================
-            YOUR JOB
-            ====================
-
-            Provide short, clear, transcript-grounded answers  
-            that reflect the narrator's tone and personality  
-            while strictly avoiding hallucination.
+        except ValueError as ve:
+            # Vector store not initialized - user needs to ingest video first
+            return RAGAnswer(answer=str(ve))
+        except Exception as e:
+            # Catch-all for LLM API errors, network issues, etc.
+            return RAGAnswer(answer=f"Error generating answer: {str(e)}")
 
-            If no transcript context is provided or nothing is relevant,  
-            say: "I don't have enough information from the video to answer that."
+    async def aask_question(self, question: str, video_id: str) -> RAGAnswer:
+        """
+        Event-loop friendly ask_question(): runs the blocking pipeline on the chat executor.
+        
+        Lets one uvicorn worker serve many chats concurrently; concurrent
+        Gemini calls are still capped by LLM_MAX_CONCURRENCY.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.ask_question, question, video_id)
 
-            Context:
-            {context}
+    async def aask_batch(self, questions: List[str], video_id: str) -> List[RAGAnswer]:
+        """
+        Answer many questions about one video, in order, with per-item errors.
+        
+        Retrieval runs once for the batch (see _prepare_many); generations
+        then run concurrently on the chat executor, at most
+        CHAT_BATCH_CONCURRENCY at a time for this batch (and within the
+        global LLM_MAX_CONCURRENCY cap). Repeated questions are answered once.
+        
+        Args:
+            questions: Questions in client order
+            video_id: YouTube video ID whose transcript grounds the answers
+            
+        Returns:
+            One RAGAnswer per question; failures set error instead of raising
+        """
+        loop = asyncio.get_running_loop()
+        unique = list(dict.fromkeys(questions))
+        try:
+            prepared = await loop.run_in_executor(self.executor, self._prepare_many, unique, video_id)
+        except ValueError as ve:
+            return [RAGAnswer(answer="", error=str(ve)) for _ in questions]
+        except Exception as e:
+            # e.g. the batched embedding request failed: every item is affected
+            return [RAGAnswer(answer="", error=f"Error retrieving context: {str(e)}") for _ in questions]
 
-            Question:
-            {question}
+        limit = asyncio.Semaphore(config.CHAT_BATCH_CONCURRENCY)
 
-            Answer:"""
+        async def answer_one(question: str, item: _Prepared) -> RAGAnswer:
+            if item.cached is not None:
+                return RAGAnswer(answer=item.cached.answer, cached=True, sources=item.cached.sources)
+            async with limit:
+                try:
+                    answer = await loop.run_in_executor(self.executor, self._generate, question, video_id, item)
+                except Exception as e:
+                    return RAGAnswer(
+                        answer="", sources=item.sources, error=f"Error generating answer: {str(e)}",
+                        coverage=item.coverage,
+                    )
+            return RAGAnswer(answer=answer, sources=item.sources, coverage=item.coverage)
 
-            prompt = PromptTemplate.from_template(template)
+        results = await asyncio.gather(*(answer_one(q, item) for q, item in zip(unique, prepared)))
+        by_question = dict(zip(unique, results))
+        return [by_question[question] for question in questions]
 
-            # LangChain Expression Language (LCEL) chain composition
-            # Parallel execution: retriever + question passthrough → prompt → LLM → parser
-            rag_chain = (
-                {"context": retriever | self._format_docs, "question": RunnablePassthrough()}
-                | prompt
-                | self.llm
-                | StrOutputParser()
-            )
+    def stream_answer(self, question: str, video_id: str) -> StreamedAnswer:
+        """
+        Streaming variant of ask_question(): yield answer tokens as Gemini produces them.
+        
+        This call blocks for question embedding and retrieval; the returned
+        iterator then yields tokens as generated, so the caller's
+        time-to-first-token covers retrieval plus the LLM's first chunk.
+        
+        Args:
+            question: User's question about the video
+            video_id: YouTube video ID whose transcript grounds the answer
+            
+        Returns:
+            StreamedAnswer whose tokens are text fragments in generation order
             
-            # Execute chain and return generated answer
-            return rag_chain.invoke(question)
+        Raises:
+            ValueError: If the video is not ingested (or was evicted)
+            Exception: If LLM generation fails mid-stream
+        """
+        prepared = self._prepare(question, video_id)
+        if prepared.cached is not None:
+            return StreamedAnswer(
+                tokens=iter([prepared.cached.answer]), cached=True, sources=prepared.cached.sources
+            )
 
-        except ValueError as ve:
-            # Vector store not initialized - user needs to ingest video first
-            return str(ve)
-        except Exception as e:
-            # Catch-all for LLM API errors, network issues, etc.
-            return f"Error generating answer: {str(e)}"
\ No newline at end of file
+        def tokens():
+            parts = []
+            with self.llm_slots, metrics.stage("chat", "stream_generation"):
+                for token in self.generation_chain.stream({"context": prepared.context, "question": question}):
+                    if token:
+                        parts.append(token)
+                        yield token
+            self._remember(video_id, question, prepared, "".join(parts))
+
+        return StreamedAnswer(tokens=tokens(), sources=prepared.sources, coverage=prepared.coverage)
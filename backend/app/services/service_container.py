@@ -0,0 +1,129 @@
+from typing import Any, Dict, Optional
+import asyncio
+import threading
+import time
+
+
+class ServiceContainer:
+    """
+    Lazily constructed ingestion and RAG service singletons.
+
+    Nothing heavy is imported or built until a service is first used (or
+    warm_up() runs), so the server binds its port and answers /health and
+    the static frontend without waiting for langchain, the Google SDK or
+    yt-dlp. Construction is guarded by a lock: concurrent first requests
+    build each service exactly once. Warm-up state has its own lock, never
+    held across a build, so the /ready probe can run on the event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._ingestion = None
+        self._rag = None
+        self._state = "cold"  # cold | warming | ready | failed
+        self._error: Optional[str] = None
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._build_ms: Dict[str, float] = {}
+
+    @property
+    def ingestion(self):
+        """IngestionService, built on first access."""
+        if self._ingestion is None:
+            with self._lock:
+                if self._ingestion is None:
+                    started = time.perf_counter()
+                    from backend.app.services.ingestion import IngestionService
+                    self._ingestion = IngestionService()
+                    self._record("ingestion", started)
+        return self._ingestion
+
+    @property
+    def rag(self):
+        """RAGService (and its VectorStoreService), built on first access."""
+        if self._rag is None:
+            with self._lock:
+                if self._rag is None:
+                    started = time.perf_counter()
+                    from backend.app.core import config
+                    from backend.app.services.rag_service import RAGService
+                    rag = RAGService()
+                    # Snapshotted videos are searchable before the first request
+                    if config.SNAPSHOT_DIR:
+                        rag.vector_store_service.restore_snapshots(
+                            config.SNAPSHOT_DIR, verify=config.SNAPSHOT_VERIFY_CHECKSUM
+                        )
+                    self._rag = rag
+                    self._record("rag", started)
+        return self._rag
+
+    async def aingestion(self):
+        """ingestion for async endpoints: a first-time build runs off the event loop."""
+        if self._ingestion is None:
+            return await asyncio.get_running_loop().run_in_executor(None, lambda: self.ingestion)
+        return self._ingestion
+
+    async def arag(self):
+        """rag for async endpoints: a first-time build runs off the event loop."""
+        if self._rag is None:
+            return await asyncio.get_running_loop().run_in_executor(None, lambda: self.rag)
+        return self._rag
+
+    def _record(self, name: str, started: float):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._build_ms[name] = round(elapsed_ms, 1)
+        print(f"Built {name} service in {elapsed_ms:.0f}ms")
+
+    def warm_up(self):
+        """
+        Build both services and pre-import yt-dlp, recording the outcome.
+
+        Errors (e.g. a missing GOOGLE_API_KEY) are kept for status() rather
+        than raised; the failing service is retried on its next use.
+        """
+        started = time.perf_counter()
+        with self._state_lock:
+            self._state = "warming"
+        try:
+            self.ingestion
+            self.rag
+            imported = time.perf_counter()
+            import yt_dlp  # noqa: F401  (otherwise paid by the first ingest)
+            self._build_ms["yt_dlp_import"] = round((time.perf_counter() - imported) * 1000, 1)
+        except Exception as e:
+            with self._state_lock:
+                self._state = "failed"
+                self._error = str(e)
+            print(f"Warm-up failed: {e}")
+            return
+        with self._state_lock:
+            self._state = "ready"
+            self._error = None
+        print(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def start_warm_up(self) -> bool:
+        """
+        Run warm_up() in a daemon thread unless one is running or has finished.
+
+        Never waits on a service build (only the warm-up state lock), so it
+        is safe to call from async handlers.
+
+        Returns:
+            True if a new warm-up thread was started
+        """
+        with self._state_lock:
+            if self._state in ("warming", "ready"):
+                return False
+            self._state = "warming"
+            self._warmup_thread = threading.Thread(target=self.warm_up, name="warm-up", daemon=True)
+            self._warmup_thread.start()
+            return True
+
+    @property
+    def ready(self) -> bool:
+        return self._ingestion is not None and self._rag is not None
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness state, last warm-up error and per-service build times."""
+        state = "ready" if self.ready and self._state != "warming" else self._state
+        return {"status": state, "error": self._error, "build_ms": dict(self._build_ms)}
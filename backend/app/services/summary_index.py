@@ -0,0 +1,211 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Sequence
+import re
+
+from backend.app.services.lexical_index import tokenize
+
+SECTION_SUMMARY_TEMPLATE = """Summarize this excerpt of a video transcript in at most {sentences} sentences.
+Keep the speaker's concrete claims, names and numbers. Do not add anything that is not in the excerpt.
+
+Excerpt:
+{text}
+
+Summary:"""
+
+ROLLUP_SUMMARY_TEMPLATE = """Below are summaries of consecutive parts of one video, in order.
+Combine them into one summary of at most {sentences} sentences covering the main points in order.
+Do not add anything that is not in the summaries.
+
+Summaries:
+{text}
+
+Summary:"""
+
+_BROAD_QUESTION_RE = re.compile(
+    r"\b(summar(y|ies|ise|ize|ized|ization)|tl;?dr|overview|recap|gist|outline"
+    r"|(main|key|big|important) (points?|ideas?|topics?|takeaways?|messages?|themes?|lessons?)"
+    r"|takeaways?"
+    r"|what('?s| is| was) (this|the) (whole |entire )?(video|talk|episode|podcast|lecture|session) about"
+    r"|what (do|did) you (talk|speak) about)\b",
+    re.IGNORECASE,
+)
+
+# Words a broad question may contain besides the trigger phrase; anything
+# else beyond a couple of terms means the user is asking about a specific part
+_BROAD_VOCABULARY = frozenset("""
+summary summaries summarise summarize summarized summarization tl dr tldr overview recap gist outline
+main key big important point points idea ideas topic topics takeaway takeaways message messages theme
+themes lesson lessons video talk episode podcast lecture session whole entire give tell please briefly
+short quick cover covered discuss discussed talk talked speak
+""".split())
+
+
+def is_broad_question(question: str, max_specific_terms: int = 2) -> bool:
+    """
+    Whether a question asks about the whole video ("summarize the video",
+    "what are the main points") rather than a specific passage.
+
+    A trigger phrase must be present, and at most max_specific_terms other
+    content words, so "summarize the part about gradient descent clipping"
+    still goes to chunk retrieval.
+    """
+    if not _BROAD_QUESTION_RE.search(question):
+        return False
+    specific = [t for t in tokenize(question) if t not in _BROAD_VOCABULARY]
+    return len(specific) <= max_specific_terms
+
+
+@dataclass
+class SummaryTree:
+    """
+    Hierarchical summaries of one video.
+
+    levels[0] holds one summary per section of consecutive chunks, each
+    higher level summarizes groups of the level below, and the last level
+    is the single whole-video summary. Every node is a Document with
+    start_ms/end_ms (when the chunks carry timing) plus level metadata.
+    """
+    levels: List[List[Document]] = field(default_factory=list)
+    llm_calls: int = 0
+
+    @property
+    def root(self) -> Optional[Document]:
+        return self.levels[-1][0] if self.levels else None
+
+    def context_docs(self, token_budget: int, tokens: Callable[[str], int]) -> List[Document]:
+        """
+        Summaries to answer a broad question with, within a token budget.
+
+        The whole-video summary always comes first; it is followed by the
+        most detailed level (in video order) that still fits the budget.
+        """
+        root = self.root
+        if root is None:
+            return []
+        remaining = token_budget - tokens(root.page_content)
+        for level in self.levels[:-1]:
+            if sum(tokens(doc.page_content) for doc in level) <= remaining:
+                return [root] + level
+        return [root]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "llm_calls": self.llm_calls,
+            "levels": [[{"text": doc.page_content, "metadata": doc.metadata} for doc in level] for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SummaryTree":
+        return cls(
+            levels=[
+                [Document(page_content=node["text"], metadata=node["metadata"]) for node in level]
+                for level in data["levels"]
+            ],
+            llm_calls=data.get("llm_calls", 0),
+        )
+
+
+class SummaryTreeBuilder:
+    """
+    Builds a SummaryTree from a video's chunks with the chat model.
+
+    Sections of section_chunks consecutive chunks are summarized
+    concurrently; summaries are then rolled up fanout at a time until one
+    remains. A video of N chunks costs about N / section_chunks *
+    (1 + 1 / (fanout - 1)) LLM calls, paid once at ingest.
+    """
+
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        section_chunks: int = 8,
+        fanout: int = 6,
+        sentences: int = 4,
+        max_workers: int = 4,
+        llm_slots: Optional[ContextManager] = None,
+    ):
+        """
+        Args:
+            llm: Chat model used for the summaries
+            section_chunks: Consecutive chunks per leaf section
+            fanout: Summaries combined per roll-up call
+            sentences: Target summary length in sentences
+            max_workers: Concurrent summary calls
+            llm_slots: Shared LLM concurrency cap (e.g. RAGService.llm_slots.background)
+
+        Raises:
+            ValueError: If section_chunks < 1 or fanout < 2
+        """
+        if section_chunks < 1 or fanout < 2:
+            raise ValueError("section_chunks must be >= 1 and fanout >= 2")
+        self.section_chunks = section_chunks
+        self.fanout = fanout
+        self.sentences = sentences
+        self.max_workers = max_workers
+        self.llm_slots = llm_slots
+        self.section_chain = PromptTemplate.from_template(SECTION_SUMMARY_TEMPLATE) | llm | StrOutputParser()
+        self.rollup_chain = PromptTemplate.from_template(ROLLUP_SUMMARY_TEMPLATE) | llm | StrOutputParser()
+
+    @staticmethod
+    def _section_text(chunks: Sequence[Document]) -> str:
+        """Join consecutive chunks, dropping the overlap between them when offsets are known."""
+        parts, end = [], None
+        for chunk in chunks:
+            text = chunk.page_content
+            start = chunk.metadata.get("start_offset")
+            if end is not None and start is not None and start < end:
+                text = text[end - start:]
+            parts.append(text)
+            end = chunk.metadata.get("end_offset", end)
+        return " ".join(part.strip() for part in parts if part.strip())
+
+    @staticmethod
+    def _span(level: int, nodes: Sequence[Document]) -> Dict[str, Any]:
+        metadata: Dict[str, Any] = {"summary_level": level}
+        if all("start_ms" in node.metadata for node in nodes):
+            metadata["start_ms"] = min(node.metadata["start_ms"] for node in nodes)
+            metadata["end_ms"] = max(node.metadata["end_ms"] for node in nodes)
+        return metadata
+
+    def _summarize(self, chain, text: str) -> str:
+        if self.llm_slots is None:
+            return chain.invoke({"text": text, "sentences": self.sentences}).strip()
+        with self.llm_slots:
+            return chain.invoke({"text": text, "sentences": self.sentences}).strip()
+
+    def build(self, chunks: Sequence[Document]) -> SummaryTree:
+        """
+        Summarize chunks (in transcript order) into a tree.
+
+        Raises:
+            Exception: Any LLM error; a partial tree is never returned
+        """
+        tree = SummaryTree()
+        if not chunks:
+            return tree
+
+        groups = [chunks[i : i + self.section_chunks] for i in range(0, len(chunks), self.section_chunks)]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="summary") as pool:
+            texts = list(pool.map(lambda group: self._summarize(self.section_chain, self._section_text(group)), groups))
+            tree.llm_calls += len(groups)
+            level = [Document(page_content=text, metadata=self._span(0, group)) for text, group in zip(texts, groups)]
+            tree.levels.append(level)
+
+            while len(level) > 1:
+                groups = [level[i : i + self.fanout] for i in range(0, len(level), self.fanout)]
+                # A trailing group of one is carried up as-is rather than re-summarized
+                texts = list(pool.map(
+                    lambda group: group[0].page_content if len(group) == 1
+                    else self._summarize(self.rollup_chain, "\n\n".join(doc.page_content for doc in group)),
+                    groups,
+                ))
+                tree.llm_calls += sum(1 for group in groups if len(group) > 1)
+                depth = len(tree.levels)
+                level = [Document(page_content=text, metadata=self._span(depth, group)) for text, group in zip(texts, groups)]
+                tree.levels.append(level)
+        return tree
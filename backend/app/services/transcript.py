@@ -0,0 +1,203 @@
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Tuple
+import base64
+import io
+import json
+import os
+import re
+
+_CUE_TIMING_RE = re.compile(
+    r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})\s*-->\s*(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})"
+)
+# Inline markup: <c>, <i>, voice spans and YouTube's per-word <00:00:01.500> stamps
+_CUE_TAG_RE = re.compile(r"<[^>]*>")
+
+SUBTITLE_EXTENSIONS = (".json3", ".vtt", ".srt")
+
+
+def _cue_ms(hours, minutes, seconds, millis) -> int:
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis.ljust(3, "0"))
+
+
+class Transcript:
+    """
+    Compact caption transcript: one text buffer plus array-backed timing columns.
+
+    Segment i occupies text[offsets[i]:offsets[i + 1] - 1] (segments are
+    joined by a single space) and is shown from starts_ms[i] for
+    durations_ms[i]. Columns are int32 arrays (4 bytes per value) instead of a
+    dict or object per segment, so multi-hour videos stay small and any
+    character span maps back to video time with a binary search.
+    """
+
+    __slots__ = ("text", "starts_ms", "durations_ms", "offsets")
+
+    def __init__(self, text: str, starts_ms: array, durations_ms: array, offsets: array):
+        self.text = text
+        self.starts_ms = starts_ms
+        self.durations_ms = durations_ms
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def from_json3(cls, data: Dict[str, Any]) -> "Transcript":
+        """
+        Build from a YouTube JSON3 caption payload (events -> segs -> utf8).
+
+        Newline-only segments are skipped; text is streamed into a single
+        buffer rather than collected as a list of small strings.
+        """
+        buffer = io.StringIO()
+        starts = array("i")
+        durations = array("i")
+        offsets = array("i")
+        # Local bindings keep the per-segment loop tight on multi-hour payloads
+        write, add_start, add_duration, add_offset = (
+            buffer.write, starts.append, durations.append, offsets.append
+        )
+        position = 0
+
+        for event in data.get("events", ()):
+            segs = event.get("segs")
+            if not segs:
+                continue
+            event_start = event.get("tStartMs", 0)
+            event_duration = event.get("dDurationMs", 0)
+            for seg in segs:
+                text = seg.get("utf8")
+                if text is None or text == "\n":
+                    continue
+                if offsets:
+                    write(" ")
+                    position += 1
+                add_offset(position)
+                add_start(event_start + seg.get("tOffsetMs", 0))
+                add_duration(event_duration)
+                position += write(text)
+
+        return cls(buffer.getvalue(), starts, durations, offsets)
+
+    @classmethod
+    def from_subtitles(cls, content: str) -> "Transcript":
+        """
+        Build from WebVTT or SubRip text (the cue format is the same shape).
+
+        Each cue line becomes a segment timed by its cue. Markup tags are
+        stripped, and a line repeating the previous one (rolling auto
+        captions) is skipped. Headers, cue numbers and NOTE/STYLE blocks
+        carry no timing line and are ignored.
+        """
+        buffer = io.StringIO()
+        starts = array("i")
+        durations = array("i")
+        offsets = array("i")
+        position = 0
+        cue_start = cue_duration = None
+        previous = None
+
+        for raw in content.splitlines():
+            line = raw.strip()
+            if not line:
+                cue_start = None
+                continue
+            timing = _CUE_TIMING_RE.search(line)
+            if timing:
+                groups = timing.groups()
+                cue_start = _cue_ms(*groups[:4])
+                cue_duration = max(0, _cue_ms(*groups[4:]) - cue_start)
+                continue
+            if cue_start is None:
+                continue
+            text = " ".join(_CUE_TAG_RE.sub("", line).split())
+            if not text or text == previous:
+                continue
+            previous = text
+            if offsets:
+                buffer.write(" ")
+                position += 1
+            offsets.append(position)
+            starts.append(cue_start)
+            durations.append(cue_duration)
+            position += buffer.write(text)
+
+        return cls(buffer.getvalue(), starts, durations, offsets)
+
+    @classmethod
+    def from_file(cls, path: str) -> "Transcript":
+        """
+        Load a local caption file by extension (.json3, .vtt or .srt).
+
+        Raises:
+            ValueError: If the extension is not a supported subtitle format
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in SUBTITLE_EXTENSIONS:
+            raise ValueError(f"Unsupported subtitle file {path}: expected one of {', '.join(SUBTITLE_EXTENSIONS)}")
+        with open(path, encoding="utf-8-sig") as f:
+            if extension == ".json3":
+                return cls.from_json3(json.load(f))
+            return cls.from_subtitles(f.read())
+
+    def segment_at(self, offset: int) -> int:
+        """Index of the segment containing a character offset."""
+        return max(0, bisect_right(self.offsets, offset) - 1)
+
+    def time_span(self, start_offset: int, end_offset: int) -> Tuple[int, int]:
+        """
+        Video time (ms) covered by a character span of the text buffer.
+
+        Returns:
+            (start_ms, end_ms) from the first segment's start to the last
+            segment's end; (0, 0) for an empty transcript
+        """
+        if not self.offsets:
+            return 0, 0
+        first = self.segment_at(start_offset)
+        last = self.segment_at(max(start_offset, end_offset - 1))
+        return self.starts_ms[first], self.starts_ms[last] + self.durations_ms[last]
+
+    @staticmethod
+    def _pack(values: array) -> str:
+        return base64.b64encode(values.tobytes()).decode("ascii")
+
+    @staticmethod
+    def _unpack(encoded: str) -> array:
+        values = array("i")
+        values.frombytes(base64.b64decode(encoded))
+        return values
+
+    def to_dict(self) -> Dict[str, str]:
+        """JSON-safe form with the columns as base64-packed int32 arrays."""
+        return {
+            "text": self.text,
+            "starts_ms": self._pack(self.starts_ms),
+            "durations_ms": self._pack(self.durations_ms),
+            "offsets": self._pack(self.offsets),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> "Transcript":
+        return cls(
+            data["text"],
+            cls._unpack(data["starts_ms"]),
+            cls._unpack(data["durations_ms"]),
+            cls._unpack(data["offsets"]),
+        )
+
+    def nbytes(self) -> int:
+        """Approximate payload size: text plus timing columns."""
+        columns = (self.starts_ms, self.durations_ms, self.offsets)
+        return len(self.text) + sum(c.itemsize * len(c) for c in columns)
+
+
+def format_timestamp(ms: int) -> str:
+    """Render milliseconds as m:ss or h:mm:ss for citations."""
+    seconds = int(ms // 1000)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
@@ -0,0 +1,157 @@
+from typing import Any, Dict, List, Optional
+import gzip
+import json
+import os
+import threading
+import time
+
+from backend.app.core import metrics
+
+
+class TranscriptCache:
+    """
+    On-disk cache of parsed transcripts keyed by (video_id, language, caption kind).
+
+    Each entry is one gzip-compressed JSON file holding the compact parsed
+    transcript (see Transcript.to_dict) and the video metadata. Entries
+    expire after a TTL and the directory is kept under a byte budget by
+    evicting least-recently-used files (recency is tracked through the file
+    mtime, bumped on every hit).
+    """
+
+    # Caption kinds in preference order, mirroring yt-dlp extraction
+    KINDS = ("manual", "auto")
+
+    def __init__(self, directory: str, ttl_seconds: float, max_bytes: int):
+        """
+        Args:
+            directory: Cache directory (created if missing)
+            ttl_seconds: Entry lifetime before a re-fetch is required
+            max_bytes: Upper bound on total cache size
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, video_id: str, language: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{video_id}.{language}.{kind}.json.gz")
+
+    @staticmethod
+    def _rank(language: str, kind: str, preferred_language: str = "en") -> tuple:
+        """Sort key matching extraction preference: manual first, then preferred language, its variants, others."""
+        if language == preferred_language:
+            lang_rank = 0
+        elif language.startswith(preferred_language):
+            lang_rank = 1
+        else:
+            lang_rank = 2
+        return (TranscriptCache.KINDS.index(kind), lang_rank)
+
+    def _candidates(self, video_id: str) -> List[tuple]:
+        """(language, kind, path) for every cached entry of a video."""
+        prefix = f"{video_id}."
+        found = []
+        for name in os.listdir(self.directory):
+            if not (name.startswith(prefix) and name.endswith(".json.gz")):
+                continue
+            parts = name[len(prefix):-len(".json.gz")].rsplit(".", 1)
+            if len(parts) == 2 and parts[1] in self.KINDS:
+                found.append((parts[0], parts[1], os.path.join(self.directory, name)))
+        return found
+
+    def get(
+        self,
+        video_id: str,
+        language: Optional[str] = None,
+        kind: Optional[str] = None,
+        preferred_language: str = "en",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the best fresh cached transcript for a video.
+
+        Args:
+            video_id: YouTube video ID
+            language: Restrict to one caption language (None = preferred order)
+            kind: Restrict to "manual" or "auto" captions (None = manual first)
+            preferred_language: Language ranked first when language is None,
+                as in the fetcher's track selection
+
+        Returns:
+            Entry dict with "transcript", "metadata", "language", "kind", or None
+        """
+        with self._lock:
+            candidates = [
+                c for c in self._candidates(video_id)
+                if (language is None or c[0] == language) and (kind is None or c[1] == kind)
+            ]
+            for lang, knd, path in sorted(candidates, key=lambda c: self._rank(c[0], c[1], preferred_language)):
+                try:
+                    with gzip.open(path, "rt", encoding="utf-8") as f:
+                        entry = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠ Dropping unreadable transcript cache entry {path}: {e}")
+                    self._unlink(path)
+                    continue
+                # Entries written before the compact transcript format are stale
+                if "transcript" not in entry or time.time() - entry.get("fetched_at", 0) > self.ttl_seconds:
+                    self._unlink(path)
+                    continue
+                os.utime(path)  # Mark as recently used for eviction
+                self.hits += 1
+                metrics.cache_result("transcript", 1, 0)
+                return entry
+            self.misses += 1
+            metrics.cache_result("transcript", 0, 1)
+            return None
+
+    def put(self, video_id: str, language: str, kind: str, transcript: Dict[str, Any], metadata: Dict[str, Any]):
+        """Store a parsed transcript (Transcript.to_dict() form) and enforce the size budget."""
+        entry = {
+            "video_id": video_id,
+            "language": language,
+            "kind": kind,
+            "fetched_at": time.time(),
+            "metadata": metadata,
+            "transcript": transcript,
+        }
+        path = self._path(video_id, language, kind)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            # Write-then-rename so readers never see a partial file
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _unlink(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Remove least-recently-used files until under budget. Caller holds the lock."""
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json.gz"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._unlink(path)
+            total -= size
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for diagnostics."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,225 @@
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+import base64
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.app.core import metrics
+from backend.app.services.transcript import Transcript
+
+T = TypeVar("T")
+
+# Mimic Chrome browser to avoid bot detection
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+REFERER = "https://www.youtube.com/"
+
+# Local development fallback locations for an exported cookies.txt
+COOKIE_PATHS = (
+    "cookies.txt",
+    "/workspace/cookies.txt",
+    os.path.join(os.path.dirname(__file__), "../../../../cookies.txt"),
+)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key onto one execution.
+
+    The first caller for a key runs the function; callers arriving while
+    it is in flight wait for and share its result (or its exception).
+    Nothing is cached once the call finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Returns:
+            (result, shared) where shared is True if another caller's run was reused
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result(), True
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return future.result(), False
+
+
+class TranscriptFetcher:
+    """
+    Long-lived YouTube transcript client, one per process.
+
+    Cookies are resolved once at construction (YOUTUBE_COOKIES_BASE64 is
+    decoded to /tmp, or a local cookies.txt is found). Subtitle downloads
+    go through one pooled requests.Session with timeouts and retries on
+    connection errors and 429/5xx, and each thread reuses its YoutubeDL
+    instance. Concurrent fetches of the same video share one fetch.
+    """
+
+    def __init__(self, timeout_s: float = 15.0, retries: int = 3, pool_size: int = 10, preferred_language: str = "en"):
+        """
+        Args:
+            timeout_s: Connect and read timeout for yt-dlp and subtitle downloads
+            retries: Retries per subtitle download (exponential backoff) and per yt-dlp request
+            pool_size: Pooled HTTP connections kept per host
+            preferred_language: Caption language picked first (then its regional
+                variants, then the first available)
+        """
+        self.timeout_s = timeout_s
+        self.preferred_language = preferred_language
+        self.retries = retries
+        self.cookie_file = self._prepare_cookies()
+        self.flights = SingleFlight()
+        self._local = threading.local()
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT, "Referer": REFERER})
+
+    @staticmethod
+    def _prepare_cookies() -> Optional[str]:
+        """
+        Resolve the cookie file yt-dlp should use.
+
+        Note:
+            Cookies are required for videos that trigger YouTube's bot detection.
+            In Cloud Run, cookies are loaded from YOUTUBE_COOKIES_BASE64 env var
+            and written to /tmp (the only writable location).
+        """
+        youtube_cookies = os.getenv("YOUTUBE_COOKIES_BASE64")
+        if youtube_cookies:
+            try:
+                cookie_file = "/tmp/cookies.txt"
+                with open(cookie_file, "w") as f:
+                    f.write(base64.b64decode(youtube_cookies).decode("utf-8"))
+                print(f"✓ Loaded cookies from environment variable to {cookie_file}")
+                return cookie_file
+            except Exception as e:
+                print(f"⚠ Error loading cookies from env: {e}")
+                return None
+
+        for cookie_path in COOKIE_PATHS:
+            abs_path = os.path.abspath(cookie_path)
+            if os.path.exists(abs_path):
+                print(f"✓ Using cookies from: {abs_path}")
+                return abs_path
+        print("⚠ WARNING: No cookies found! Set YOUTUBE_COOKIES_BASE64 env var or include cookies.txt")
+        print(f"Current working directory: {os.getcwd()}")
+        return None
+
+    def _ydl(self):
+        """This thread's YoutubeDL instance (YoutubeDL is not safe to share across threads)."""
+        ydl = getattr(self._local, "ydl", None)
+        if ydl is None:
+            # Imported on first fetch: yt-dlp loads hundreds of extractor modules
+            import yt_dlp
+
+            ydl_opts = {
+                'writesubtitles': True,
+                'writeautomaticsub': True,
+                'skip_download': True,
+                'quiet': False,
+                'no_warnings': False,
+                'user_agent': USER_AGENT,
+                'referer': REFERER,
+                'nocheckcertificate': True,
+                'socket_timeout': self.timeout_s,
+                'extractor_retries': self.retries,
+            }
+            if self.cookie_file:
+                ydl_opts['cookiefile'] = self.cookie_file
+            ydl = self._local.ydl = yt_dlp.YoutubeDL(ydl_opts)
+        return ydl
+
+    def fetch(self, url: str) -> Tuple[Transcript, Dict[str, Any]]:
+        """
+        Fetch a video's transcript with yt-dlp and the pooled session.
+
+        Strategy:
+            1. Extract video info (caption tracks) with this thread's YoutubeDL
+            2. Prefer manual subtitles, English variants, JSON3 format
+            3. Download and parse the JSON3 track into a compact Transcript
+
+        Args:
+            url: YouTube video URL
+
+        Returns:
+            (transcript, metadata): metadata holds title/duration/language/kind
+            of the caption track used
+
+        Raises:
+            Exception: If no subtitles found or extraction fails
+        """
+        try:
+            with metrics.stage("ingest", "yt_dlp_extract"):
+                info = self._ydl().extract_info(url, download=False)
+
+            # Prefer manual subtitles over auto-generated for accuracy
+            kind = 'manual' if info.get('subtitles') else 'auto'
+            subtitles = info.get('subtitles') or info.get('automatic_captions')
+            if not subtitles:
+                raise Exception("No subtitles found for this video.")
+
+            # Language selection priority: preferred language and its variants, then first available
+            lang = self.preferred_language
+            if lang not in subtitles:
+                lang = next((l for l in subtitles if l.startswith(self.preferred_language)), None)
+            if not lang:
+                lang = list(subtitles.keys())[0]
+
+            # JSON3 format provides best quality with proper timing and formatting
+            json3_sub = next((s for s in subtitles[lang] if s['ext'] == 'json3'), None)
+            if not json3_sub:
+                raise Exception(f"No suitable subtitle format found for language {lang}")
+
+            with metrics.stage("ingest", "subtitle_download"):
+                response = self.session.get(json3_sub['url'], timeout=self.timeout_s)
+                response.raise_for_status()
+                data = response.json()
+
+            # Parse JSON3 structure: events -> segs -> utf8 text (+ timing)
+            with metrics.stage("ingest", "parse"):
+                transcript = Transcript.from_json3(data)
+
+            metadata = {
+                'title': info.get('title'),
+                'duration': info.get('duration'),
+                'channel': info.get('channel') or info.get('uploader'),
+                'language': lang,
+                'kind': kind,
+            }
+            return transcript, metadata
+
+        except Exception as e:
+            raise Exception(f"Failed to fetch transcript: {str(e)}")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,538 @@
+from abc import ABC, abstractmethod
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+
+import numpy as np
+
+from backend.app.core import config
+
+
+class VectorIndex(ABC):
+    """
+    One video's chunk vectors plus their text and metadata.
+
+    Chunks are addressed by their position in the transcript (chunk index),
+    so batches may arrive in any order. Search results carry the chunk index
+    as Document.id.
+    """
+
+    # Which build of the video this is (set by the backend when storage is per build)
+    generation: Optional[str] = None
+
+    @abstractmethod
+    def add(
+        self,
+        ids: Sequence[int],
+        vectors: Sequence[Sequence[float]],
+        texts: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+    ):
+        """Insert embedded chunks (parallel sequences)."""
+
+    @abstractmethod
+    def search(self, vector: Sequence[float], k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        Top-k chunks for a query vector.
+
+        Returns:
+            (Document, cosine similarity) pairs, most similar first
+        """
+
+    def search_many(self, vectors: Sequence[Sequence[float]], k: int = 4) -> List[List[Tuple[Document, float]]]:
+        """Top-k chunks for several query vectors, one result list per query."""
+        return [self.search(vector, k=k) for vector in vectors]
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of chunks stored."""
+
+    @abstractmethod
+    def export(self) -> Tuple[List[int], np.ndarray, List[str], List[Dict[str, Any]]]:
+        """(chunk ids, vectors, texts, metadatas) in storage order, e.g. for snapshots."""
+
+
+class VectorBackend(ABC):
+    """Creates, persists and drops per-video indexes."""
+
+    name = "base"
+
+    @abstractmethod
+    def create(self, video_id: str) -> VectorIndex:
+        """
+        Start an empty index for a video.
+
+        Any previous index of the video is left untouched (it may still be
+        serving searches); it is released with drop() once replaced.
+        """
+
+    @abstractmethod
+    def drop(self, video_id: str, index: Optional[VectorIndex] = None):
+        """Release one index of a video (catalog eviction or replacement), or all of them."""
+
+    def finalize(self, video_id: str, index: VectorIndex):
+        """Called once every chunk is added; backends may persist here."""
+
+
+QUANTIZATION_MODES = ("none", "float16", "int8")
+
+# Quantized rows are dequantized this many at a time during the approximate scan
+_SCAN_BLOCK_ROWS = 4096
+
+
+class NumpyFlatIndex(VectorIndex):
+    """
+    Exact in-process index: an L2-normalized float32 matrix searched by matmul.
+
+    Rows are normalized on insert, so one matrix-vector product gives cosine
+    similarities and argpartition selects the top k without a full sort.
+    Capacity grows geometrically while batches stream in. save()/load()
+    store the matrix as .npy, loaded back memory-mapped.
+
+    With quantization ("float16", or "int8" with a per-row scale) compact()
+    keeps a compact copy of the rows resident and can hand the float32 rows
+    over to a memory-mapped file. Searches then scan the compact rows for
+    rerank_candidates approximate hits and re-score those exactly against
+    the float32 rows, so only a few full-precision rows are paged in.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    CHUNKS_FILE = "chunks.json"
+
+    def __init__(self, quantization: str = "none", rerank_candidates: int = 32):
+        """
+        Args:
+            quantization: "none", "float16" or "int8"
+            rerank_candidates: Approximate hits re-scored exactly per query (at least 4 * k)
+
+        Raises:
+            ValueError: For an unknown quantization mode
+        """
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization: {quantization!r} (expected one of {QUANTIZATION_MODES})")
+        self.quantization = quantization
+        self.rerank_candidates = rerank_candidates
+        self._matrix: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._size = 0
+        self._ids: List[int] = []
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _reserve(self, rows: int, dim: int):
+        """Ensure room for rows more vectors. Caller holds the lock."""
+        needed = self._size + rows
+        if self._matrix is not None and needed <= self._matrix.shape[0]:
+            return
+        capacity = max(needed, 64, 2 * (self._matrix.shape[0] if self._matrix is not None else 0))
+        grown = np.empty((capacity, dim), dtype=np.float32)
+        if self._size:
+            grown[: self._size] = self._matrix[: self._size]
+        self._matrix = grown
+
+    def add(self, ids, vectors, texts, metadatas):
+        if not len(ids):
+            return
+        block = self._normalize(np.asarray(vectors, dtype=np.float32))
+        with self._lock:
+            if self._matrix is not None and block.shape[1] != self._matrix.shape[1]:
+                raise ValueError(
+                    f"Vector dimension {block.shape[1]} does not match index dimension {self._matrix.shape[1]}"
+                )
+            # Growing a compacted index: exact search (the float32 rows are
+            # copied back into memory by _reserve) until the next compact()
+            self._codes = self._scales = None
+            self._reserve(len(block), block.shape[1])
+            self._matrix[self._size : self._size + len(block)] = block
+            self._size += len(block)
+            self._ids.extend(int(i) for i in ids)
+            self._texts.extend(texts)
+            self._metadatas.extend(dict(m or {}) for m in metadatas)
+
+    def search(self, vector, k: int = 4) -> List[Tuple[Document, float]]:
+        return self.search_many([vector], k=k)[0]
+
+    def compact(self, backing: Optional[np.ndarray] = None):
+        """
+        Build the quantized rows used for search (no-op without quantization).
+
+        Args:
+            backing: The same float32 rows on disk (e.g. a memory-mapped .npy
+                or snapshot); when given it replaces the in-memory matrix, so
+                only the compact rows stay resident
+        """
+        if self.quantization == "none":
+            return
+        with self._lock:
+            if not self._size:
+                return
+            rows = self._matrix[: self._size]
+            codes, scales = [], []
+            for start in range(0, self._size, _SCAN_BLOCK_ROWS):
+                block = np.asarray(rows[start : start + _SCAN_BLOCK_ROWS], dtype=np.float32)
+                if self.quantization == "float16":
+                    codes.append(block.astype(np.float16))
+                else:
+                    # Symmetric per-row scale: the largest component maps to +/-127
+                    scale = np.abs(block).max(axis=1) / 127.0
+                    scale[scale == 0] = 1.0
+                    codes.append(np.round(block / scale[:, None]).astype(np.int8))
+                    scales.append(scale.astype(np.float32))
+            self._codes = np.concatenate(codes)
+            self._scales = np.concatenate(scales) if scales else None
+            if backing is not None:
+                if backing.shape != rows.shape:
+                    raise ValueError(f"Backing rows {backing.shape} do not match index rows {rows.shape}")
+                self._matrix = backing
+
+    def _approximate_scores(self, queries: np.ndarray, codes: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+        """Query x row similarities from the quantized rows, dequantizing one block at a time."""
+        scores = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), _SCAN_BLOCK_ROWS):
+            end = start + _SCAN_BLOCK_ROWS
+            scores[:, start:end] = queries @ codes[start:end].astype(np.float32).T
+        if scales is not None:
+            scores *= scales
+        return scores
+
+    def search_many(self, vectors, k: int = 4) -> List[List[Tuple[Document, float]]]:
+        """All queries in one matrix product; top-k per row via argpartition."""
+        with self._lock:
+            matrix, size, codes, scales = self._matrix, self._size, self._codes, self._scales
+        if not size or k <= 0:
+            return [[] for _ in vectors]
+        queries = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1))
+        if codes is not None:
+            return self._search_quantized(queries, matrix, codes, scales, k)
+        scores = queries @ matrix[:size].T
+        if k < size:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(size), scores.shape)
+        rows = np.arange(len(scores))[:, None]
+        order = np.argsort(-scores[rows, top], axis=1)
+        top = top[rows, order]
+        return [
+            [(self._document(i), float(row_scores[i])) for i in row_top]
+            for row_top, row_scores in zip(top, scores)
+        ]
+
+    def _search_quantized(self, queries, matrix, codes, scales, k: int) -> List[List[Tuple[Document, float]]]:
+        """Approximate top candidates from the compact rows, then exact top-k over just those."""
+        size = len(codes)
+        candidates = min(size, max(self.rerank_candidates, 4 * k))
+        approx = self._approximate_scores(queries, codes, scales)
+        if candidates < size:
+            shortlist = np.argpartition(-approx, candidates - 1, axis=1)[:, :candidates]
+        else:
+            shortlist = np.broadcast_to(np.arange(size), approx.shape)
+        results = []
+        for query, rows in zip(queries, shortlist):
+            # Sorted row order keeps reads from the memory-mapped rows sequential
+            rows = np.sort(rows)
+            exact = np.asarray(matrix[rows], dtype=np.float32) @ query
+            best = np.argsort(-exact)[:k]
+            results.append([(self._document(int(rows[i])), float(exact[i])) for i in best])
+        return results
+
+    def _document(self, row: int) -> Document:
+        return Document(id=str(self._ids[row]), page_content=self._texts[row], metadata=dict(self._metadatas[row]))
+
+    def export(self) -> Tuple[List[int], np.ndarray, List[str], List[Dict[str, Any]]]:
+        """Rows as stored: vectors are the normalized matrix (no copy)."""
+        with self._lock:
+            matrix = self._matrix[: self._size] if self._matrix is not None else np.empty((0, 0), np.float32)
+            return list(self._ids), matrix, list(self._texts), list(self._metadatas)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        ids: List[int],
+        matrix: np.ndarray,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        quantization: str = "none",
+        rerank_candidates: int = 32,
+    ) -> "NumpyFlatIndex":
+        """
+        Wrap already-normalized rows (e.g. a memory-mapped snapshot) without copying.
+
+        With quantization the compact rows are built right away and matrix
+        stays the (on-disk) source for exact re-scoring.
+        """
+        index = cls(quantization=quantization, rerank_candidates=rerank_candidates)
+        if len(matrix):
+            index._matrix = matrix
+            index._size = len(matrix)
+        index._ids = list(ids)
+        index._texts = list(texts)
+        index._metadatas = list(metadatas)
+        index.compact()
+        return index
+
+    def nbytes(self) -> int:
+        """Resident vector bytes (excluding text): compact rows when quantized, else float32 rows."""
+        if self._codes is not None:
+            return self._codes.nbytes + (self._scales.nbytes if self._scales is not None else 0)
+        return 0 if self._matrix is None else self._size * self._matrix.shape[1] * 4
+
+    def save(self, directory: str):
+        """Write vectors (.npy) and chunk text/metadata (JSON) to a directory."""
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            matrix = self._matrix[: self._size] if self._matrix is not None else np.empty((0, 0), np.float32)
+            chunks = {"ids": list(self._ids), "texts": list(self._texts), "metadatas": list(self._metadatas)}
+        np.save(os.path.join(directory, self.VECTORS_FILE), matrix)
+        with open(os.path.join(directory, self.CHUNKS_FILE), "w", encoding="utf-8") as f:
+            json.dump(chunks, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True, **options) -> "NumpyFlatIndex":
+        """
+        Load a saved index; with mmap the vectors stay on disk and page in on demand.
+
+        Args:
+            options: quantization / rerank_candidates, as for from_arrays()
+        """
+        matrix = np.load(os.path.join(directory, cls.VECTORS_FILE), mmap_mode="r" if mmap else None)
+        with open(os.path.join(directory, cls.CHUNKS_FILE), encoding="utf-8") as f:
+            chunks = json.load(f)
+        return cls.from_arrays(chunks["ids"], matrix, chunks["texts"], chunks["metadatas"], **options)
+
+
+class NumpyBackend(VectorBackend):
+    """
+    NumPy flat indexes held in process memory.
+
+    With a directory, finished indexes are also saved there (one
+    sub-directory per video and build, <video_id>/<generation>) and removed
+    again when evicted or replaced. With quantization, a finished index
+    keeps only its compact rows resident and re-scores against the saved
+    float32 rows, memory-mapped (without a directory the float32 rows stay
+    in memory). A re-ingest saves to a new generation, so the files behind
+    the index still being served are never rewritten.
+    """
+
+    name = "numpy"
+
+    def __init__(self, directory: Optional[str] = None, quantization: str = "none", rerank_candidates: int = 32):
+        self.directory = directory
+        self.quantization = quantization
+        self.rerank_candidates = rerank_candidates
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, video_id: str, generation: Optional[str] = None) -> str:
+        path = os.path.join(self.directory, video_id)
+        return os.path.join(path, generation) if generation else path
+
+    def new_index(self) -> NumpyFlatIndex:
+        return NumpyFlatIndex(quantization=self.quantization, rerank_candidates=self.rerank_candidates)
+
+    def create(self, video_id: str) -> VectorIndex:
+        index = self.new_index()
+        index.generation = uuid.uuid4().hex[:12]
+        return index
+
+    def finalize(self, video_id: str, index: VectorIndex):
+        backing = None
+        if self.directory and index.generation:
+            # Written aside and renamed into place: a crash never leaves a
+            # half-written generation behind
+            path = self._path(video_id, index.generation)
+            staging = f"{path}.tmp"
+            shutil.rmtree(staging, ignore_errors=True)
+            index.save(staging)
+            os.replace(staging, path)
+            if self.quantization != "none":
+                backing = np.load(os.path.join(path, NumpyFlatIndex.VECTORS_FILE), mmap_mode="r")
+        index.compact(backing)
+
+    def drop(self, video_id: str, index: Optional[VectorIndex] = None):
+        if not self.directory:
+            return
+        if index is None:
+            shutil.rmtree(self._path(video_id), ignore_errors=True)
+            return
+        if not index.generation:
+            return  # e.g. restored from a snapshot: nothing saved here
+        shutil.rmtree(self._path(video_id, index.generation), ignore_errors=True)
+        try:
+            os.rmdir(self._path(video_id))  # Only succeeds once no generation is left
+        except OSError:
+            pass
+
+    def load(self, video_id: str, generation: str, mmap: bool = True) -> NumpyFlatIndex:
+        """Load a previously saved build of a video's index."""
+        index = NumpyFlatIndex.load(
+            self._path(video_id, generation), mmap=mmap,
+            quantization=self.quantization, rerank_candidates=self.rerank_candidates,
+        )
+        index.generation = generation
+        return index
+
+
+class ChromaIndex(VectorIndex):
+    """A per-video Chroma collection (cosine space) behind the VectorIndex interface."""
+
+    def __init__(self, video_id: str, store, collection, generation: Optional[str] = None):
+        self.video_id = video_id
+        self.store = store
+        self.collection = collection
+        self.generation = generation
+
+    def __len__(self) -> int:
+        return self.collection.count()
+
+    def add(self, ids, vectors, texts, metadatas):
+        self.collection.add(
+            ids=[f"{self.video_id}-{i}" for i in ids],
+            embeddings=np.asarray(vectors, dtype=np.float32).tolist(),
+            documents=list(texts),
+            metadatas=[m or None for m in metadatas],
+        )
+
+    def search(self, vector, k: int = 4) -> List[Tuple[Document, float]]:
+        return self.search_many([vector], k=k)[0]
+
+    def export(self) -> Tuple[List[int], np.ndarray, List[str], List[Dict[str, Any]]]:
+        rows = self.collection.get(include=["embeddings", "documents", "metadatas"])
+        if not rows["ids"]:
+            return [], np.empty((0, 0), np.float32), [], []
+        return (
+            [int(chunk_id.rsplit("-", 1)[1]) for chunk_id in rows["ids"]],
+            np.asarray(rows["embeddings"], dtype=np.float32),
+            list(rows["documents"]),
+            [dict(m or {}) for m in rows["metadatas"]],
+        )
+
+    def search_many(self, vectors, k: int = 4) -> List[List[Tuple[Document, float]]]:
+        """One Chroma query call for all vectors."""
+        count = self.collection.count()
+        if not count or k <= 0:
+            return [[] for _ in vectors]
+        results = self.collection.query(
+            query_embeddings=[list(v) for v in vectors],
+            n_results=min(k, count),
+            include=["documents", "metadatas", "distances"],
+        )
+        # Chroma reports cosine distance; convert to similarity
+        return [
+            [
+                (Document(id=chunk_id.rsplit("-", 1)[1], page_content=text, metadata=metadata or {}), 1.0 - distance)
+                for chunk_id, text, metadata, distance in zip(ids, texts, metadatas, distances)
+            ]
+            for ids, texts, metadatas, distances in zip(
+                results["ids"], results["documents"], results["metadatas"], results["distances"]
+            )
+        ]
+
+
+class ChromaBackend(VectorBackend):
+    """
+    Chroma persistent client with one collection per video build.
+
+    Every create() gets a fresh collection, so a re-ingest embeds into a
+    new collection while the previous one keeps serving searches until it
+    is replaced in the catalog and dropped. The persist directory is wiped
+    once at construction to avoid stale SQLite locks after an instance
+    restart.
+    """
+
+    name = "chroma"
+
+    def __init__(self, persist_dir: str, embeddings: Optional[Embeddings] = None):
+        """
+        Args:
+            persist_dir: Chroma data directory (cleared on startup)
+            embeddings: Embedding function attached to the LangChain wrapper
+        """
+        # Deferred so the NumPy backend never pays for the Chroma import
+        import chromadb
+        from langchain_community.vectorstores import Chroma
+
+        self._chroma_cls = Chroma
+        self.embeddings = embeddings
+        if os.path.exists(persist_dir):
+            try:
+                shutil.rmtree(persist_dir)
+            except Exception as e:
+                print(f"Warning: Could not clear {persist_dir}: {e}")
+        self.client = chromadb.PersistentClient(path=persist_dir)
+
+    @staticmethod
+    def _collection_name(video_id: str, generation: str) -> str:
+        """
+        Chroma collection name for one build of a video.
+
+        Chroma requires names to start and end with an alphanumeric character,
+        while YouTube IDs may end with '-' or '_', hence the generation suffix.
+        """
+        return f"video_{video_id}_g{generation}"
+
+    def create(self, video_id: str) -> VectorIndex:
+        # A new, empty collection per build: re-ingest never duplicates chunks
+        # and never touches the collection the catalog is still serving
+        generation = uuid.uuid4().hex[:12]
+        name = self._collection_name(video_id, generation)
+        store = self._chroma_cls(
+            client=self.client,
+            embedding_function=self.embeddings,
+            collection_name=name,
+            collection_metadata={"hnsw:space": "cosine"},
+        )
+        return ChromaIndex(video_id, store, self.client.get_collection(name), generation=generation)
+
+    def drop(self, video_id: str, index: Optional[VectorIndex] = None):
+        if index is not None:
+            names = [self._collection_name(video_id, index.generation)] if index.generation else []
+        else:
+            pattern = re.compile(re.escape(f"video_{video_id}_g") + "[0-9a-f]+")
+            names = [
+                name for name in (getattr(c, "name", c) for c in self.client.list_collections())
+                if pattern.fullmatch(name)
+            ]
+        for name in names:
+            try:
+                self.client.delete_collection(name)
+            except Exception:
+                pass  # Collection did not exist
+
+
+def create_backend(name: str, embeddings: Optional[Embeddings] = None) -> VectorBackend:
+    """
+    Build the configured vector backend.
+
+    Args:
+        name: "numpy" (default, in-process) or "chroma"
+        embeddings: Embedding function for backends that keep one
+
+    Raises:
+        ValueError: For an unknown backend name
+    """
+    if name == "numpy":
+        return NumpyBackend(
+            config.VECTOR_INDEX_DIR or None,
+            quantization=config.VECTOR_QUANTIZATION,
+            rerank_candidates=config.VECTOR_RERANK_CANDIDATES,
+        )
+    if name == "chroma":
+        return ChromaBackend(config.CHROMA_PERSIST_DIR, embeddings)
+    raise ValueError(f"Unknown vector backend: {name!r} (expected 'numpy' or 'chroma')")
@@ -1,108 +1,641 @@
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_community.vectorstores import Chroma
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+import asyncio
+import math
 import os
+import threading
 import time
-from typing import List, Any
-import shutil
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from backend.app.core import config, metrics
+from backend.app.services.video_catalog import VideoCatalog, CatalogEntry
+from backend.app.services.embedding_cache import EmbeddingCache, CachedEmbeddings
+from backend.app.services.embedding_pipeline import AdaptiveRateLimiter, EmbeddingPipeline
+from backend.app.services.index_snapshot import (
+    IndexSnapshot, SnapshotError, list_snapshots, read_snapshot, snapshot_path, write_snapshot,
+)
+from backend.app.services.fake_providers import create_fake_embeddings
+from backend.app.services.lexical_index import BM25Index, reciprocal_rank_fusion
+from backend.app.services.summary_index import SummaryTree
+from backend.app.services.vector_index import NumpyBackend, NumpyFlatIndex, VectorBackend, VectorIndex, create_backend
+
+
+class VideoRetriever(BaseRetriever):
+    """LangChain retriever over one video's index in a VectorStoreService."""
+
+    service: Any
+    video_id: str
+    k: int = 4
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        vector = self.service.embed_query(query)
+        return self.service.similarity_search_by_vector(self.video_id, vector, k=self.k)
+
 
 class VectorStoreService:
     """
-    Manages ChromaDB vector store for semantic search over video transcripts.
-    
+    Manages per-video vector indexes for semantic search over video transcripts.
+
     Handles embedding generation, batch processing with rate limiting,
-    and retrieval operations for the RAG pipeline.
+    and retrieval operations for the RAG pipeline. Each ingested video gets
+    its own index in the configured backend (in-process NumPy or Chroma),
+    tracked in an LRU catalog so many videos can stay warm on one instance
+    at the same time.
     """
-    
-    def __init__(self):
-        """Initialize embedding model with Google's latest text-embedding-004."""
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY environment variable is not set")
-
-        # Use text-embedding-004 optimized for document retrieval tasks
-        # task_type parameter improves embedding quality for semantic search
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/text-embedding-004",
-            task_type="retrieval_document",
-            google_api_key=api_key
+
+    def __init__(self, embeddings: Optional[Embeddings] = None, backend: Optional[VectorBackend] = None):
+        """
+        Initialize embedding model, vector backend and the per-video catalog.
+
+        Args:
+            embeddings: Optional provider override (e.g. local fakes for benchmarks);
+                defaults to EMBEDDING_PROVIDER (Google text-embedding-004, or
+                the deterministic fake for offline runs)
+            backend: Optional vector backend override; defaults to VECTOR_BACKEND
+        """
+        model = "models/text-embedding-004"
+        task_type = "retrieval_document"
+        if embeddings is None and config.EMBEDDING_PROVIDER == "fake":
+            embeddings = create_fake_embeddings()
+        if embeddings is None:
+            api_key = os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError("GOOGLE_API_KEY environment variable is not set")
+
+            # Deferred: the Google SDK takes over a second to import, which
+            # should not be paid before the server accepts connections
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+            # Use text-embedding-004 optimized for document retrieval tasks
+            # task_type parameter improves embedding quality for semantic search
+            embeddings = GoogleGenerativeAIEmbeddings(
+                model=model,
+                task_type=task_type,
+                google_api_key=api_key
+            )
+        else:
+            # Keep injected providers in their own cache namespace
+            model = getattr(embeddings, "model", None) or type(embeddings).__name__
+            task_type = getattr(embeddings, "task_type", None)
+        self.embeddings = embeddings
+        # Identifies the vector space; snapshots must match it to be restored
+        self.embedding_model = model
+
+        # Concurrent ingest stage over the raw provider (cache lookups happen
+        # before it). One limiter per process so concurrent ingests share
+        # (and adapt to) the same API quota
+        self.rate_limiter = AdaptiveRateLimiter(
+            requests_per_second=config.EMBED_REQUESTS_PER_SECOND,
+            max_requests_per_second=config.EMBED_MAX_REQUESTS_PER_SECOND,
+            concurrency=config.EMBED_CONCURRENCY,
+            max_concurrency=config.EMBED_MAX_CONCURRENCY,
+            batch_size=config.EMBED_BATCH_SIZE,
+            min_batch_size=config.EMBED_MIN_BATCH_SIZE,
+            max_batch_size=config.EMBED_MAX_BATCH_SIZE,
+        )
+        self.pipeline = EmbeddingPipeline(
+            self.embeddings, self.rate_limiter, max_retries=config.EMBED_MAX_RETRIES
+        )
+
+        # Content-addressed disk cache: re-ingests and shared caption text
+        # only send cache misses to the embedding API
+        self.embedding_cache = None
+        if config.EMBEDDING_CACHE_ENABLED:
+            self.embedding_cache = EmbeddingCache(
+                path=config.EMBEDDING_CACHE_PATH,
+                max_bytes=config.EMBEDDING_CACHE_MAX_BYTES,
+            )
+            self.embeddings = CachedEmbeddings(
+                self.embeddings, self.embedding_cache, model=model, task_type=task_type
+            )
+
+        # Per-video indexes; the Chroma backend clears its stale database once
+        # per process, individual ingests never wipe other videos
+        self.backend = backend or create_backend(config.VECTOR_BACKEND, self.embeddings)
+        self.catalog = VideoCatalog(
+            max_videos=config.VECTOR_CATALOG_MAX_VIDEOS,
+            max_bytes=config.VECTOR_CATALOG_MAX_BYTES,
+            on_evict=self._drop_index,
+            on_replace=self._release_index,
         )
-        self.vector_store = None
+        # BM25 index per resident video, built at ingest for hybrid retrieval
+        self.lexical_indexes: Dict[str, BM25Index] = {}
+        # Optional hierarchical summaries per resident video (see set_summary)
+        self.summaries: Dict[str, SummaryTree] = {}
+        # (chunks indexed, total) for videos searchable while still embedding
+        self.partial: Dict[str, Tuple[int, int]] = {}
+
+    @staticmethod
+    def _estimate_size_bytes(index: VectorIndex, texts: List[str]) -> int:
+        """Approximate resident footprint: raw text plus vectors (compact rows when quantized)."""
+        text_bytes = sum(len(text.encode("utf-8")) for text in texts)
+        if isinstance(index, NumpyFlatIndex):
+            vector_bytes = index.nbytes()
+        else:
+            vector_bytes = len(texts) * config.EMBEDDING_DIMENSIONS * 4
+        return text_bytes + vector_bytes
+
+    def _drop_index(self, entry: CatalogEntry):
+        """Catalog eviction callback: release the video's indexes."""
+        self.lexical_indexes.pop(entry.video_id, None)
+        self.summaries.pop(entry.video_id, None)
+        self.partial.pop(entry.video_id, None)
+        self._release_index(entry)
+
+    def _release_index(self, entry: CatalogEntry):
+        """Catalog replace callback (and part of eviction): drop the entry's backend index."""
+        try:
+            self.backend.drop(entry.video_id, entry.store)
+        except Exception as e:
+            print(f"Warning: Could not drop index for {entry.video_id}: {e}")
+
+    def has_video(self, video_id: str) -> bool:
+        """
+        Whether a video's index is resident in the catalog.
 
-    def create_vector_store(self, chunks: List[str]):
+        With SNAPSHOT_DIR set, a video that is not resident (evicted, or
+        ingested by an earlier instance) is restored from its snapshot first.
         """
-        Initialize ChromaDB and ingest transcript chunks with rate limit handling.
-        
+        if video_id in self.catalog:
+            return True
+        if not config.SNAPSHOT_DIR:
+            return False
+        path = snapshot_path(config.SNAPSHOT_DIR, video_id)
+        if not os.path.isfile(path):
+            return False
+        try:
+            self.restore_snapshot(path, verify=config.SNAPSHOT_VERIFY_CHECKSUM)
+        except Exception as e:
+            print(f"Warning: Could not restore snapshot {path}: {e}")
+            return False
+        return True
+
+    async def ahas_video(self, video_id: str) -> bool:
+        """
+        has_video() for async endpoints.
+
+        A resident video is answered inline; a snapshot restore (checksum
+        pass, memmap load) runs in a worker thread, off the event loop.
+        """
+        if video_id in self.catalog:
+            return True
+        if not config.SNAPSHOT_DIR:
+            return False
+        return await asyncio.get_running_loop().run_in_executor(None, self.has_video, video_id)
+
+    def create_vector_store(
+        self,
+        video_id: str,
+        chunks: List[Document],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        on_searchable: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Build the video's vector index and ingest transcript chunks with rate limit handling.
+
+        Embedded batches are committed to the index as they land. Once
+        CHAT_MIN_INDEXED_FRACTION of the chunks are in, a video that is not
+        already resident is published to the catalog and can be searched
+        while the rest is embedded (see coverage()); the lexical index,
+        finalize and snapshot follow when every chunk is in.
+
         Args:
-            chunks: List of text chunks from video transcript
-            
+            video_id: YouTube video ID the chunks belong to
+            chunks: Transcript chunk Documents; metadata (e.g. start_ms/end_ms)
+                is stored alongside each vector
+            on_progress: Called as on_progress(chunks_embedded, total) as batches land
+            on_searchable: Called once the video can be searched (at once when
+                an earlier index of it is resident)
+
+        Raises:
+            EmbeddingPipelineError: If some chunks could not be embedded after retries;
+                a partially published index is withdrawn
+
         Note:
-            - Uses /tmp directory for Cloud Run compatibility (read-only root filesystem)
-            - Implements exponential backoff for Google AI API rate limits
-            - Batch size optimized for free tier (~15 requests/minute)
-        """
-        batch_size = 20  # Balanced for API limits and processing speed
-        
-        # Cloud Run instances have read-only root filesystem
-        # /tmp is the only writable location for ephemeral storage
-        persist_dir = "/tmp/chroma_db"
-        
-        # Remove stale database to prevent SQLite lock issues on instance restart
-        if os.path.exists(persist_dir):
-            try:
-                shutil.rmtree(persist_dir)
-            except Exception as e:
-                print(f"Warning: Could not clear {persist_dir}: {e}")
+            - Re-ingesting a resident video keeps serving the previous index
+              until the new one is complete, then swaps it in
+            - Cached vectors are written immediately; only misses hit the API
+            - Misses are embedded concurrently under the adaptive rate limiter
+            - Registering the video may evict least-recently-used videos
+        """
+        started = time.perf_counter()
+        total = len(chunks)
+        texts = [chunk.page_content for chunk in chunks]
+        threshold = max(1, math.ceil(config.CHAT_MIN_INDEXED_FRACTION * total))
+        # Guards published/finished: the early publish happens at most once
+        # and never after the build was registered or withdrawn
+        publish_lock = threading.Lock()
+        published = finished = False
+        resident = video_id in self.catalog
+        if resident and on_searchable:
+            on_searchable()
+
+        # Backends start from an empty index so re-ingest never duplicates chunks;
+        # summaries of the previous transcript no longer apply
+        index = self.backend.create(video_id)
+        self.summaries.pop(video_id, None)
+
+        def progress(done: int, total: int):
+            nonlocal published
+            just_published = False
+            with publish_lock:
+                if finished:
+                    pass
+                elif published:
+                    self.partial[video_id] = (done, total)
+                elif not resident and threshold <= done < total and video_id not in self.catalog:
+                    self._publish_partial(video_id, index, texts, done)
+                    published = just_published = True
+            if just_published:
+                metrics.TIME_TO_SEARCHABLE.observe(time.perf_counter() - started)
+                if on_searchable:
+                    on_searchable()
+            if on_progress:
+                on_progress(done, total)
+
+        print(f"Ingesting {total} chunks for video {video_id} using text-embedding-004...")
+        try:
+            self.embed_chunks(index, chunks, on_progress=progress)
+        except Exception:
+            # Withdraw this build; a previously resident index keeps serving
+            with publish_lock:
+                finished = True
+                if published:
+                    self.catalog.remove(video_id)
+                else:
+                    self.backend.drop(video_id, index)
+                self.partial.pop(video_id, None)
+            raise
+
+        with metrics.stage("embed", "index_finalize"):
+            self.backend.finalize(video_id, index)
+        with publish_lock:
+            finished = True
+            self._register(video_id, index, chunks)
+            self.partial.pop(video_id, None)
+        if not resident and not published:
+            metrics.TIME_TO_SEARCHABLE.observe(time.perf_counter() - started)
+            if on_searchable:
+                on_searchable()
+        if config.SNAPSHOT_DIR:
+            self._snapshot_quietly(video_id)
 
-        self.vector_store = Chroma(
-            embedding_function=self.embeddings,
-            collection_name="video_transcript",
-            persist_directory=persist_dir
+    def _publish_partial(self, video_id: str, index: VectorIndex, texts: List[str], indexed: int):
+        """Make a still-growing index searchable (vector search only until _register)."""
+        self.lexical_indexes.pop(video_id, None)
+        self.partial[video_id] = (indexed, len(texts))
+        self.catalog.put(
+            video_id, index, size_bytes=self._estimate_size_bytes(index, texts), num_chunks=len(texts)
         )
-        
+        print(f"Video {video_id} searchable at {indexed}/{len(texts)} chunks; embedding the rest")
+
+    def coverage(self, video_id: str) -> float:
+        """Fraction of the video's chunks searchable now (1.0 once ingest has finished)."""
+        indexed, total = self.partial.get(video_id, (1, 1))
+        return indexed / total if total else 1.0
+
+    def embed_chunks(
+        self,
+        index: VectorIndex,
+        chunks: List[Document],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        """
+        Embed chunks into an index: embedding cache first, then the shared rate-limited pipeline.
+
+        Chunk i is stored under id i. Safe to call from several threads at
+        once; all callers share this service's rate limiter and API quota.
+
+        Raises:
+            EmbeddingPipelineError: If some chunks could not be embedded after retries
+        """
+        texts = [chunk.page_content for chunk in chunks]
         total_chunks = len(chunks)
-        print(f"Ingesting {total_chunks} chunks using text-embedding-004...")
-        
-        # Process in batches to respect API rate limits
-        for i in range(0, total_chunks, batch_size):
-            batch = chunks[i : i + batch_size]
-            batch_num = i // batch_size + 1
-            total_batches = (total_chunks + batch_size - 1) // batch_size
-            
-            print(f"Processing batch {batch_num}/{total_batches}...")
-            
-            # Exponential backoff retry strategy for rate limit errors (429)
-            max_retries = 5
-            for attempt in range(max_retries):
-                try:
-                    self.vector_store.add_texts(texts=batch)
-                    break  # Success - proceed to next batch
-                except Exception as e:
-                    if "429" in str(e):
-                        # Rate limit hit - wait with exponential backoff
-                        wait_time = (2 ** attempt) * 2  # 2s, 4s, 8s, 16s, 32s
-                        print(f"  Rate limit hit. Waiting {wait_time}s before retry...")
-                        time.sleep(wait_time)
-                    else:
-                        # Non-recoverable error - log and continue
-                        print(f"  Critical Error on batch {batch_num}: {e}")
-                        break
-            
-            # Brief pause between batches to avoid hitting rate limits
-            time.sleep(1)
-
-    def get_retriever(self) -> Any:
-        """
-        Returns LangChain retriever for semantic search.
-        
+        embedded = 0
+        progress_lock = threading.Lock()
+
+        def add_batch(indices: List[int], vectors: List[List[float]]):
+            nonlocal embedded
+            index.add(
+                indices,
+                vectors,
+                [texts[i] for i in indices],
+                [chunks[i].metadata for i in indices],
+            )
+            with progress_lock:
+                embedded += len(indices)
+                done = embedded
+            if on_progress:
+                on_progress(done, total_chunks)
+
+        # Serve what we can from the embedding cache before touching the API
+        missing = list(range(total_chunks))
+        if self.embedding_cache:
+            with metrics.stage("embed", "cache_lookup"):
+                cached = self.embeddings.cached_vectors(texts)
+                hits = [i for i, vector in enumerate(cached) if vector is not None]
+                missing = [i for i, vector in enumerate(cached) if vector is None]
+                if hits:
+                    add_batch(hits, [cached[i] for i in hits])
+                    metrics.CHUNKS_EMBEDDED.labels("cache").inc(len(hits))
+
+        print(f"  {total_chunks - len(missing)} cached, {len(missing)} to embed")
+
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+
+            def on_batch(start: int, vectors: List[List[float]]):
+                batch_texts = missing_texts[start : start + len(vectors)]
+                add_batch(missing[start : start + len(vectors)], vectors)
+                metrics.CHUNKS_EMBEDDED.labels("api").inc(len(vectors))
+                if self.embedding_cache:
+                    self.embeddings.remember(batch_texts, vectors)
+
+            # Includes rate-limit waits and retry backoff (see the pipeline counters)
+            with metrics.stage("embed", "embedding"):
+                self.pipeline.embed(missing_texts, on_batch=on_batch)
+
+        if self.embedding_cache:
+            print(f"Embedding cache: {self.embedding_cache.stats()}")
+
+    def _register(self, video_id: str, index: VectorIndex, chunks: List[Document]):
+        """Make a finished index searchable: lexical index plus catalog entry."""
+        if config.HYBRID_SEARCH_ENABLED:
+            with metrics.stage("embed", "lexical_index"):
+                self.lexical_indexes[video_id] = BM25Index(chunks)
+        else:
+            self.lexical_indexes.pop(video_id, None)
+        self.catalog.put(
+            video_id,
+            index,
+            size_bytes=self._estimate_size_bytes(index, [chunk.page_content for chunk in chunks]),
+            num_chunks=len(chunks),
+        )
+
+    def set_summary(self, video_id: str, tree: SummaryTree):
+        """
+        Attach a video's summary tree (re-snapshotting the video when
+        snapshots are enabled, so the tree survives restarts).
+
+        Raises:
+            ValueError: If the video is not ingested (or was evicted)
+        """
+        if video_id not in self.catalog:
+            raise ValueError(f"Video {video_id} not ingested")
+        self.summaries[video_id] = tree
+        if config.SNAPSHOT_DIR:
+            self._snapshot_quietly(video_id)
+
+    def save_snapshot(self, video_id: str, directory: str) -> str:
+        """
+        Write a resident video's index and summary tree to one snapshot file.
+
         Returns:
-            Retriever instance configured for similarity search
-            
+            Path of the snapshot (directory/<video_id>.vtidx)
+
         Raises:
-            ValueError: If vector store hasn't been initialized via create_vector_store()
+            ValueError: If the video is not ingested (or was evicted)
         """
-        if not self.vector_store:
+        ids, vectors, texts, metadatas = self._index(video_id).export()
+        tree = self.summaries.get(video_id)
+        snapshot = IndexSnapshot(
+            video_id=video_id,
+            embedding_model=self.embedding_model,
+            ids=ids,
+            vectors=vectors,
+            texts=texts,
+            metadatas=metadatas,
+            summary=tree.to_dict() if tree else None,
+        )
+        path = snapshot_path(directory, video_id)
+        with metrics.stage("embed", "snapshot_write"):
+            size = write_snapshot(path, snapshot)
+        print(f"Snapshot for {video_id}: {len(ids)} chunks, {size / 2**20:.1f} MiB -> {path}")
+        return path
+
+    def _snapshot_quietly(self, video_id: str):
+        """Snapshot after ingest; a failed write is logged, never fails the ingest."""
+        try:
+            self.save_snapshot(video_id, config.SNAPSHOT_DIR)
+        except Exception as e:
+            print(f"Warning: Could not snapshot {video_id}: {e}")
+
+    def restore_snapshot(self, path: str, verify: bool = True) -> str:
+        """
+        Make a snapshotted video searchable without re-embedding.
+
+        With the NumPy backend the snapshot's vectors are used in place,
+        memory-mapped from the file; other backends get a copy.
+
+        Returns:
+            The restored video ID
+
+        Raises:
+            SnapshotError: If the file is invalid, fails its checksum or was
+                built with a different embedding model than this service's
+        """
+        with metrics.stage("embed", "snapshot_restore"):
+            snapshot = read_snapshot(path, verify=verify)
+            if snapshot.embedding_model != self.embedding_model:
+                raise SnapshotError(
+                    f"{path}: built with {snapshot.embedding_model}, server uses {self.embedding_model}"
+                )
+            video_id = snapshot.video_id
+            if isinstance(self.backend, NumpyBackend):
+                index = NumpyFlatIndex.from_arrays(
+                    snapshot.ids, snapshot.vectors, snapshot.texts, snapshot.metadatas,
+                    quantization=self.backend.quantization,
+                    rerank_candidates=self.backend.rerank_candidates,
+                )
+            else:
+                index = self.backend.create(video_id)
+                index.add(snapshot.ids, snapshot.vectors, snapshot.texts, snapshot.metadatas)
+                self.backend.finalize(video_id, index)
+            # Lexical positions must follow transcript order (chunk id), not row order
+            chunks = sorted(
+                (
+                    Document(id=str(i), page_content=text, metadata=metadata)
+                    for i, text, metadata in zip(snapshot.ids, snapshot.texts, snapshot.metadatas)
+                ),
+                key=lambda chunk: int(chunk.id),
+            )
+            self._register(video_id, index, chunks)
+            if snapshot.summary:
+                self.summaries[video_id] = SummaryTree.from_dict(snapshot.summary)
+            else:
+                self.summaries.pop(video_id, None)
+        return video_id
+
+    def restore_snapshots(self, directory: str, verify: bool = True) -> List[str]:
+        """
+        Restore every snapshot in a directory (e.g. SNAPSHOT_DIR at startup).
+
+        Invalid, corrupt or mismatched snapshots are reported and skipped.
+        Restoring more videos than the catalog budget allows evicts the
+        earliest ones again; they are restored on demand (see has_video).
+
+        Returns:
+            Video IDs restored, in restore order
+        """
+        restored = []
+        started = time.perf_counter()
+        for path in list_snapshots(directory):
+            try:
+                restored.append(self.restore_snapshot(path, verify=verify))
+            except Exception as e:
+                print(f"Warning: Could not restore snapshot {path}: {e}")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"Restored {len(restored)} snapshots from {directory} in {elapsed_ms:.0f}ms")
+        return restored
+
+    def summary(self, video_id: str) -> Optional[SummaryTree]:
+        """The video's summary tree, if one was built."""
+        return self.summaries.get(video_id)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a user question (served from the embedding cache when possible)."""
+        return self.embeddings.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many questions with one batched request (cache misses only).
+
+        The provider is configured with a single task type, so batched
+        document embedding yields the same vectors as embed_query().
+        """
+        return self.embeddings.embed_documents(texts)
+
+    def _index(self, video_id: str):
+        entry = self.catalog.get(video_id)
+        if entry is None:
             raise ValueError(
-                "Vector store not initialized. "
+                f"Video {video_id} is not ingested. "
                 "Call create_vector_store() with transcript chunks first."
             )
-        return self.vector_store.as_retriever()
\ No newline at end of file
+        return entry.store
+
+    def similarity_search_with_scores(
+        self, video_id: str, vector: List[float], k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """
+        Nearest chunks of one video with their cosine similarity, best first.
+
+        Raises:
+            ValueError: If the video hasn't been ingested or was evicted
+        """
+        return self._index(video_id).search(vector, k=k)
+
+    def similarity_search_by_vector(self, video_id: str, vector: List[float], k: int = 4) -> List[Document]:
+        """
+        Nearest chunks of one video for a precomputed query vector.
+
+        Lets callers embed a question once and reuse the vector (e.g. for the
+        semantic answer cache) instead of embedding again inside a retriever.
+
+        Raises:
+            ValueError: If the video hasn't been ingested or was evicted
+        """
+        return [doc for doc, _ in self.similarity_search_with_scores(video_id, vector, k=k)]
+
+    def lexical_fast_path(
+        self, video_id: str, question: str, k: int = 4
+    ) -> Optional[List[Tuple[Document, float]]]:
+        """
+        BM25-only retrieval for questions with a clear keyword match.
+
+        Taken when the top chunk covers at least LEXICAL_FAST_PATH_COVERAGE
+        of the question's idf mass and outscores the runner-up by
+        LEXICAL_FAST_PATH_RATIO, so exact-term questions (names, numbers)
+        never wait on the embedding API.
+
+        Returns:
+            The top-k lexical chunks with BM25 scores, or None when the hit is
+            not confident (or the video has no lexical index)
+
+        Raises:
+            ValueError: If the video hasn't been ingested or was evicted
+        """
+        self._index(video_id)
+        lexical = self.lexical_indexes.get(video_id)
+        if lexical is None:
+            return None
+        hits, coverage = lexical.search(question, k=k)
+        if not hits or coverage < config.LEXICAL_FAST_PATH_COVERAGE:
+            return None
+        if len(hits) > 1 and hits[0][1] < config.LEXICAL_FAST_PATH_RATIO * hits[1][1]:
+            return None
+        return [(lexical.document(position), score) for position, score in hits]
+
+    def hybrid_search(
+        self, video_id: str, question: str, vector: List[float], k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """
+        Fuse BM25 and vector rankings of one video's chunks with reciprocal-rank fusion.
+
+        Falls back to plain vector search when the video has no lexical index.
+
+        Returns:
+            (Document, score) pairs best first: fused RRF scores, or cosine
+            similarity for plain vector search
+
+        Raises:
+            ValueError: If the video hasn't been ingested or was evicted
+        """
+        return self.hybrid_search_many(video_id, [question], [vector], k=k)[0]
+
+    def hybrid_search_many(
+        self, video_id: str, questions: List[str], vectors: List[List[float]], k: int = 4
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        hybrid_search() for several questions: the vector side runs as one batched search.
+
+        Raises:
+            ValueError: If the video hasn't been ingested or was evicted
+        """
+        candidates = max(k, config.HYBRID_CANDIDATES)
+        dense_lists = self._index(video_id).search_many(vectors, k=candidates)
+        lexical = self.lexical_indexes.get(video_id)
+        return [
+            self._fuse(lexical, question, dense, k)
+            for question, dense in zip(questions, dense_lists)
+        ]
+
+    @staticmethod
+    def _fuse(
+        lexical: Optional[BM25Index], question: str, dense: List[Tuple[Document, float]], k: int
+    ) -> List[Tuple[Document, float]]:
+        """RRF of one question's vector hits with its BM25 hits."""
+        if lexical is None:
+            return dense[:k]
+
+        hits, _ = lexical.search(question, k=max(k, config.HYBRID_CANDIDATES))
+        docs = {doc.id: doc for doc, _ in dense}
+        fused = reciprocal_rank_fusion(
+            [[doc.id for doc, _ in dense], [str(position) for position, _ in hits]],
+            k=config.RRF_K,
+            limit=k,
+        )
+        return [
+            (docs[chunk_id] if chunk_id in docs else lexical.document(int(chunk_id)), score)
+            for chunk_id, score in fused
+        ]
+
+    def get_retriever(self, video_id: str) -> Any:
+        """
+        Returns LangChain retriever for semantic search over one video.
+
+        Args:
+            video_id: YouTube video ID to search
+
+        Returns:
+            Retriever instance configured for similarity search
+
+        Raises:
+            ValueError: If the video hasn't been ingested or was evicted
+        """
+        self._index(video_id)
+        return VideoRetriever(service=self, video_id=video_id)
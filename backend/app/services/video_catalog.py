@@ -0,0 +1,144 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import threading
+import time
+
+
+@dataclass
+class CatalogEntry:
+    """A warm per-video index plus the bookkeeping used for eviction."""
+    video_id: str
+    store: Any
+    size_bytes: int
+    num_chunks: int
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+
+
+class VideoCatalog:
+    """
+    LRU catalog of per-video vector indexes.
+
+    Keeps many videos warm on one instance while bounding the total
+    footprint. Entries are evicted least-recently-used first once either
+    the video count or the estimated byte budget is exceeded.
+    """
+
+    def __init__(
+        self,
+        max_videos: int,
+        max_bytes: int,
+        on_evict: Optional[Callable[[CatalogEntry], None]] = None,
+        on_replace: Optional[Callable[[CatalogEntry], None]] = None,
+    ):
+        """
+        Args:
+            max_videos: Maximum number of videos kept resident
+            max_bytes: Estimated memory/disk budget across all videos
+            on_evict: Callback invoked with each evicted entry (e.g. drop collection)
+            on_replace: Callback invoked with an entry put() swapped out for a
+                different store of the same video, once the new one is in place
+        """
+        self.max_videos = max_videos
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.on_replace = on_replace
+        self._entries: "OrderedDict[str, CatalogEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+    def __contains__(self, video_id: str) -> bool:
+        with self._lock:
+            return video_id in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def get(self, video_id: str) -> Optional[CatalogEntry]:
+        """Return the entry for a video and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                return None
+            entry.last_access = time.time()
+            self._entries.move_to_end(video_id)
+            return entry
+
+    def put(self, video_id: str, store: Any, size_bytes: int, num_chunks: int) -> CatalogEntry:
+        """
+        Register (or replace) a video's index and enforce the budget.
+
+        The entry being inserted is never evicted by its own insertion, so a
+        single oversized video still stays usable until the next ingest.
+        Replacing a video does not invoke on_evict; the replaced entry goes to
+        on_replace (if its store differs) only after the new entry is visible,
+        so searches never see the video missing.
+        """
+        with self._lock:
+            replaced = self._entries.pop(video_id, None)
+            if replaced is not None and replaced.store is store:
+                replaced = None
+            entry = CatalogEntry(
+                video_id=video_id,
+                store=store,
+                size_bytes=size_bytes,
+                num_chunks=num_chunks,
+            )
+            self._entries[video_id] = entry
+            evicted = self._evict_over_budget(keep=video_id)
+
+        # Callbacks run outside the lock; they may do slow disk I/O
+        if replaced is not None and self.on_replace:
+            self.on_replace(replaced)
+        for old in evicted:
+            if self.on_evict:
+                self.on_evict(old)
+        return entry
+
+    def remove(self, video_id: str) -> Optional[CatalogEntry]:
+        """Drop a video from the catalog, invoking the eviction callback."""
+        with self._lock:
+            entry = self._entries.pop(video_id, None)
+        if entry is not None and self.on_evict:
+            self.on_evict(entry)
+        return entry
+
+    def video_ids(self) -> List[str]:
+        """Video IDs ordered from least to most recently used."""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of catalog occupancy for diagnostics."""
+        with self._lock:
+            return {
+                "videos": len(self._entries),
+                "max_videos": self.max_videos,
+                "bytes": sum(e.size_bytes for e in self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+    def _evict_over_budget(self, keep: str) -> List[CatalogEntry]:
+        """Pop LRU entries until within budget. Caller must hold the lock."""
+        evicted = []
+        total = sum(e.size_bytes for e in self._entries.values())
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_videos or total > self.max_bytes
+        ):
+            oldest_id = next(iter(self._entries))
+            if oldest_id == keep:
+                break
+            entry = self._entries.pop(oldest_id)
+            total -= entry.size_bytes
+            self.evictions += 1
+            evicted.append(entry)
+            print(f"Evicted video {oldest_id} from catalog ({entry.size_bytes} bytes)")
+        return evicted
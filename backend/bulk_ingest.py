@@ -0,0 +1,227 @@
+"""
+Bulk offline ingest: pre-build per-video index snapshots for the API server.
+
+Inputs are YouTube URLs and/or local caption files (.json3, .vtt, .srt),
+given as arguments or one per line in --list files. Transcripts are fetched
+or parsed and then chunked in a process pool. Chunks from every video are
+embedded in this process through one shared pipeline (embedding cache, then
+the adaptive rate limiter), so concurrent videos never exceed the API quota.
+Each finished video becomes one snapshot file, the same format the server
+writes after an API ingest:
+
+    OUT/<video_id>.vtidx
+
+Set SNAPSHOT_DIR=OUT on the server to restore them at startup without
+re-embedding. Snapshots are written to a temporary file and renamed into
+place, so an interrupted run leaves no partial files; re-running skips
+videos whose snapshot already exists and is valid (--force rebuilds them).
+
+Usage:
+    python -m backend.bulk_ingest --out /data/snapshots https://youtu.be/VIDEO_ID talk.vtt
+    python -m backend.bulk_ingest --out /data/snapshots --list catalog.txt --workers 8
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import os
+import re
+import sys
+import time
+
+load_dotenv(dotenv_path="backend/.env")
+
+from backend.app.services.caption_dedup import DedupStats
+from backend.app.services.index_snapshot import IndexSnapshot, SnapshotError, read_header, snapshot_path, write_snapshot
+from backend.app.services.ingestion import IngestionService
+from backend.app.services.transcript import SUBTITLE_EXTENSIONS, Transcript
+from backend.app.services.vector_index import NumpyBackend, NumpyFlatIndex
+from backend.app.services.vector_store import VectorStoreService
+
+# One IngestionService per pool process, built on its first task
+_worker_service: Optional[IngestionService] = None
+
+
+def _is_url(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+def _video_id(ingestion: IngestionService, source: str) -> Optional[str]:
+    """YouTube ID for URLs; the sanitized file name (without extension) for local files."""
+    if _is_url(source):
+        return ingestion._extract_video_id(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return re.sub(r"[^0-9A-Za-z_-]", "_", stem) or None
+
+
+def _prepare_source(
+    source: str, chunk_size: Optional[int], chunk_overlap: Optional[int]
+) -> Tuple[List[Tuple[str, Dict[str, Any]]], Dict[str, float]]:
+    """
+    Process-pool task: fetch or parse one input, dedup and chunk it.
+
+    Returns:
+        (chunks as (text, metadata) pairs, timing and size stats)
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = IngestionService()
+    started = time.perf_counter()
+    if _is_url(source):
+        transcript = _worker_service.get_transcript(source)
+    else:
+        transcript = Transcript.from_file(source)
+    parsed = time.perf_counter()
+    dedup = DedupStats()
+    chunks = _worker_service.prepare_chunks(transcript, _worker_service.chunker_for(chunk_size, chunk_overlap), dedup)
+    stats = {
+        "parse_s": parsed - started,
+        "chunk_s": time.perf_counter() - parsed,
+        "chars": len(transcript.text),
+        "chars_saved": dedup.chars_saved,
+        "embeddings_saved": dedup.embeddings_saved,
+    }
+    return [(chunk.page_content, chunk.metadata) for chunk in chunks], stats
+
+
+def _build_snapshot(
+    vector_store: VectorStoreService,
+    out_dir: str,
+    video_id: str,
+    source: str,
+    chunk_data: List[Tuple[str, Dict[str, Any]]],
+    stats: Dict[str, float],
+) -> Dict[str, Any]:
+    """Embed one video's chunks and write its snapshot."""
+    chunks = [Document(page_content=text, metadata=metadata) for text, metadata in chunk_data]
+    index = NumpyFlatIndex()
+    started = time.perf_counter()
+    vector_store.embed_chunks(index, chunks)
+    embed_s = time.perf_counter() - started
+
+    ids, vectors, texts, metadatas = index.export()
+    write_snapshot(snapshot_path(out_dir, video_id), IndexSnapshot(
+        video_id=video_id,
+        embedding_model=vector_store.embedding_model,
+        ids=ids,
+        vectors=vectors,
+        texts=texts,
+        metadatas=metadatas,
+        info={"source": source, "chars": stats["chars"]},
+    ))
+    return {**stats, "embed_s": embed_s, "chunks": len(chunks)}
+
+
+def _already_built(out_dir: str, video_id: str) -> bool:
+    """Whether a complete snapshot exists (a truncated or foreign file is rebuilt)."""
+    path = snapshot_path(out_dir, video_id)
+    if not os.path.isfile(path):
+        return False
+    try:
+        read_header(path)
+    except SnapshotError:
+        return False
+    return True
+
+
+def _read_inputs(args) -> List[str]:
+    sources = list(args.sources)
+    for path in args.list or ():
+        with open(path, encoding="utf-8") as f:
+            sources.extend(line.strip() for line in f if line.strip() and not line.lstrip().startswith("#"))
+    return list(dict.fromkeys(sources))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="*", help="YouTube URLs or .json3/.vtt/.srt files")
+    parser.add_argument("--list", action="append", help="file with one URL or path per line (repeatable)")
+    parser.add_argument("--out", required=True, help="snapshot directory (the server's SNAPSHOT_DIR)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="fetch/parse/chunk processes")
+    parser.add_argument("--embed-workers", type=int, default=2, help="videos embedded concurrently")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--chunk-overlap", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="rebuild snapshots that already exist")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    ingestion = IngestionService()
+    # Validate chunk overrides once, before any work is queued
+    ingestion.chunker_for(args.chunk_size, args.chunk_overlap)
+
+    pending: Dict[str, str] = {}
+    skipped, failed = [], []
+    for source in _read_inputs(args):
+        if not _is_url(source) and not source.lower().endswith(SUBTITLE_EXTENSIONS):
+            failed.append((source, f"not a URL or {'/'.join(SUBTITLE_EXTENSIONS)} file"))
+            continue
+        video_id = _video_id(ingestion, source)
+        if not video_id:
+            failed.append((source, "could not derive a video ID"))
+        elif video_id in pending.values():
+            failed.append((source, f"duplicate video ID {video_id}"))
+        elif not args.force and _already_built(args.out, video_id):
+            skipped.append(video_id)
+        else:
+            pending[source] = video_id
+    print(f"{len(pending)} to build, {len(skipped)} already built, {len(failed)} rejected")
+    if not pending:
+        for source, error in failed:
+            print(f"FAILED {source}: {error}")
+        return 1 if failed else 0
+
+    # Memory-only backend: snapshots are written by _build_snapshot, not the backend
+    vector_store = VectorStoreService(backend=NumpyBackend())
+    started = time.perf_counter()
+    built_chunks = chars_saved = embeddings_saved = 0
+    print(f"{'video_id':<24} {'chunks':>7} {'chars':>10} {'parse s':>8} {'embed s':>8} {'chunks/s':>9}")
+    with ProcessPoolExecutor(max_workers=args.workers) as processes, \
+            ThreadPoolExecutor(max_workers=args.embed_workers, thread_name_prefix="snapshot") as embedders:
+        prepared = {
+            processes.submit(_prepare_source, source, args.chunk_size, args.chunk_overlap): source
+            for source in pending
+        }
+        building = {}
+        for future in as_completed(prepared):
+            source = prepared[future]
+            try:
+                chunk_data, stats = future.result()
+            except Exception as e:
+                failed.append((source, f"transcript: {e}"))
+                continue
+            video_id = pending[source]
+            building[embedders.submit(_build_snapshot, vector_store, args.out, video_id, source, chunk_data, stats)] = source
+
+        for future in as_completed(building):
+            source = building[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failed.append((source, f"embedding: {e}"))
+                continue
+            built_chunks += result["chunks"]
+            chars_saved += result["chars_saved"]
+            embeddings_saved += result["embeddings_saved"]
+            rate = result["chunks"] / result["embed_s"] if result["embed_s"] else 0.0
+            print(
+                f"{pending[source]:<24} {result['chunks']:>7} {result['chars']:>10} "
+                f"{result['parse_s'] + result['chunk_s']:>8.2f} {result['embed_s']:>8.2f} {rate:>9.1f}"
+            )
+
+    elapsed = time.perf_counter() - started
+    built = len(pending) - sum(1 for source, _ in failed if source in pending)
+    print(
+        f"Built {built} snapshots ({built_chunks} chunks) in {elapsed:.1f}s "
+        f"({built_chunks / elapsed if elapsed else 0:.1f} chunks/s), "
+        f"{len(skipped)} skipped, {len(failed)} failed; "
+        f"dedup saved {chars_saved} chars and {embeddings_saved} embeddings"
+    )
+    for source, error in failed:
+        print(f"FAILED {source}: {error}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,12 +3,22 @@ FastAPI application entry point for Single-Video Twin AI.
 
 Serves both the REST API for video ingestion/chat and the static frontend UI.
 Configured for deployment on Google Cloud Run with CORS support.
+
+Heavy services are built lazily (see ServiceContainer), so the port binds
+quickly on scale-from-zero. /health is pure liveness; /ready reports whether
+the services are built and starts a warm-up if none is running.
 """
 
+import time
+
+# Measured from here: everything below is the app's own import/startup cost
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from dotenv import load_dotenv
 import os
 
@@ -16,10 +26,25 @@ import os
 # In production (Cloud Run), env vars are injected via deployment config
 load_dotenv(dotenv_path="backend/.env")
 
+from backend.app.core import config
+
+_startup_ms = 0.0
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Log startup time and kick off the optional background warm-up."""
+    global _startup_ms
+    _startup_ms = (time.perf_counter() - _import_started) * 1000
+    print(f"Startup: app imported and accepting connections in {_startup_ms:.0f}ms")
+    if config.WARMUP_ON_STARTUP:
+        services.start_warm_up()
+    yield
+
 app = FastAPI(
     title="Single-Video Twin API",
     description="Transform YouTube videos into conversational AI agents using RAG",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration for cross-origin requests
@@ -33,9 +58,19 @@ app.add_middleware(
 )
 
 # Import and register API routes
-from backend.app.api.endpoints import router
+from backend.app.api.endpoints import router, services
+from backend.app.services.admission import Overloaded
 app.include_router(router)
 
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request, exc: Overloaded):
+    """Shed load: 503 with a Retry-After hint instead of a slow timeout."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "pool": exc.pool, "reason": exc.reason},
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
 # Static file serving for frontend assets
 # Must be mounted BEFORE catch-all routes to ensure proper routing precedence
 app.mount("/static", StaticFiles(directory="frontend"), name="static")
@@ -54,3 +89,23 @@ async def health_check():
         dict: Status indicator for service health
     """
     return {"status": "healthy"}
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe: 200 once the ingestion and RAG services are built.
+    
+    Unlike /health, this waits on the lazily built services. While they are
+    cold, warming or failed it returns 503 (starting a warm-up if none is
+    running), so a load balancer can hold traffic until chat is fast.
+    
+    Returns:
+        dict: status (cold | warming | ready | failed), last warm-up error,
+            per-service build times and the app's import-to-serve time
+    """
+    status = services.status()
+    status["startup_ms"] = round(_startup_ms, 1)
+    if status["status"] != "ready":
+        services.start_warm_up()
+        return JSONResponse(status_code=503, content=status)
+    return status
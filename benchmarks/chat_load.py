@@ -0,0 +1,101 @@
+"""
+Concurrent chat load benchmark using local fake embedding and LLM providers.
+
+Compares the old inline path (blocking ask_question() called on the event
+loop, as /chat used to) with the executor-offloaded aask_question() used by
+/chat now, at several concurrency levels. Reports throughput and
+p50/p95/p99 latency per level.
+
+Usage:
+    python -m benchmarks.chat_load --requests 200 --concurrency 1,8,32 \\
+        --embed-latency 0.02 --llm-latency 0.3
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import isolated_env, latency_summary
+
+
+def build_service(args):
+    """Build a RAGService wired to fakes with the requested latencies."""
+    isolated_env(
+        EMBEDDING_CACHE_ENABLED="false",
+        ANSWER_CACHE_ENABLED="false",
+        LLM_MAX_CONCURRENCY=str(args.llm_slots),
+        CHAT_WORKERS=str(args.workers),
+    )
+    from langchain_core.documents import Document
+    from backend.app.services.fake_providers import FakeChatModel, FakeEmbeddings
+    from backend.app.services.rag_service import RAGService
+    from backend.app.services.vector_store import VectorStoreService
+
+    embeddings = FakeEmbeddings(size=64, latency_s=args.embed_latency)
+    rag = RAGService(
+        vector_store_service=VectorStoreService(embeddings=embeddings),
+        llm=FakeChatModel(latency_s=args.llm_latency),
+    )
+    chunks = [
+        Document(
+            page_content=f"chunk {i} of the benchmark transcript about topic {i % 17}",
+            metadata={"start_ms": i * 30000, "end_ms": (i + 1) * 30000},
+        )
+        for i in range(args.chunks)
+    ]
+
+    # Ingest without simulated latency so setup stays fast
+    embeddings.latency_s = 0.0
+    rag.ingest_chunks("benchvideo0", chunks)
+    embeddings.latency_s = args.embed_latency
+    return rag
+
+
+async def run_level(rag, mode: str, concurrency: int, total: int):
+    """Fire `total` chats with at most `concurrency` in flight; return wall time and latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            question = f"question number {i}?"
+            if mode == "inline":
+                rag.ask_question(question, "benchvideo0")
+            else:
+                await rag.aask_question(question, "benchvideo0")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - started, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--chunks", type=int, default=300)
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="seconds per embedding call")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per LLM call")
+    parser.add_argument("--llm-slots", type=int, default=16, help="LLM_MAX_CONCURRENCY")
+    parser.add_argument("--workers", type=int, default=64, help="CHAT_WORKERS")
+    parser.add_argument("--modes", default="inline,offloaded")
+    args = parser.parse_args()
+
+    rag = build_service(args)
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    print(f"{'mode':<10} {'conc':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for mode in args.modes.split(","):
+        for concurrency in levels:
+            wall, latencies = asyncio.run(run_level(rag, mode, concurrency, args.requests))
+            summary = latency_summary(latencies)
+            print(
+                f"{mode:<10} {concurrency:>5} {args.requests / wall:>8.1f} "
+                f"{summary['p50_ms']:>8.0f} {summary['p95_ms']:>8.0f} {summary['p99_ms']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Chunking benchmark: RecursiveCharacterTextSplitter vs offset-based TranscriptChunker.
+
+Chunks the text of a synthetic caption transcript (3 hours by default) with:
+  - recursive: RecursiveCharacterTextSplitter.create_documents(add_start_index=True),
+               the splitter ingestion used before
+  - spans:     TranscriptChunker.split (offset spans only)
+  - documents: IngestionService.chunk_transcript (spans -> Documents with timing)
+
+Reports best-of-N time, chunk count, mean chunk length and tracemalloc peak.
+
+Usage:
+    python -m benchmarks.chunker --hours 3 --repeat 5
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from benchmarks.common import isolated_env
+
+isolated_env(TRANSCRIPT_CACHE_ENABLED="false")
+
+from benchmarks.fixtures import synthetic_json3  # noqa: E402
+from backend.app.services.chunker import TranscriptChunker  # noqa: E402
+from backend.app.services.ingestion import IngestionService  # noqa: E402
+from backend.app.services.transcript import Transcript  # noqa: E402
+
+
+def measure(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    args = parser.parse_args()
+
+    transcript = Transcript.from_json3(synthetic_json3(int(args.hours * 3600)))
+    text = transcript.text
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap, add_start_index=True
+    )
+    chunker = TranscriptChunker(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    service = IngestionService()
+
+    cases = {
+        "recursive": lambda: [
+            (d.metadata["start_index"], d.metadata["start_index"] + len(d.page_content))
+            for d in splitter.create_documents([text])
+        ],
+        "spans": lambda: chunker.split(text),
+        "documents": lambda: [
+            (d.metadata["start_offset"], d.metadata["end_offset"])
+            for d in service.chunk_transcript(transcript, chunker)
+        ],
+    }
+
+    print(f"Fixture: {args.hours:g}h, {len(text) / 1000:.0f}k chars, {len(transcript)} segments")
+    print(f"{'splitter':<10} {'best ms':>9} {'chunks':>7} {'mean len':>9} {'peak MiB':>9}")
+    for name, fn in cases.items():
+        best, peak, spans = measure(fn, args.repeat)
+        mean_len = sum(end - start for start, end in spans) / max(1, len(spans))
+        print(f"{name:<10} {best * 1000:>9.1f} {len(spans):>7} {mean_len:>9.0f} {peak / 2**20:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
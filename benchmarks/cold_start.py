@@ -0,0 +1,104 @@
+"""
+Cold-start benchmark: import time, time to first /health and time to /ready.
+
+Each run starts a fresh uvicorn process (fake providers, so no API key is
+needed) and polls until /health and then /ready return 200, mimicking a
+Cloud Run scale-from-zero. Also reports `import backend.main` time in a
+fresh interpreter.
+
+Usage:
+    python -m benchmarks.cold_start --runs 5
+    python -m benchmarks.cold_start --runs 5 --no-warmup
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from benchmarks.common import percentile
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _env(warmup: bool) -> dict:
+    workdir = tempfile.mkdtemp(prefix="videotwin-cold-")
+    env = dict(os.environ)
+    env.update(
+        EMBEDDING_PROVIDER="fake",
+        LLM_PROVIDER="fake",
+        WARMUP_ON_STARTUP="true" if warmup else "false",
+        VECTOR_INDEX_DIR=os.path.join(workdir, "vector_index"),
+        CHROMA_PERSIST_DIR=os.path.join(workdir, "chroma"),
+        EMBEDDING_CACHE_PATH=os.path.join(workdir, "cache", "embeddings.sqlite3"),
+    )
+    return env
+
+
+def import_time_ms(env: dict) -> float:
+    code = "import time; t = time.perf_counter(); import backend.main; print((time.perf_counter() - t) * 1000)"
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _wait_for(url: str, started: float, timeout_s: float) -> float:
+    while time.perf_counter() - started < timeout_s:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return (time.perf_counter() - started) * 1000
+        except requests.RequestException:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(url)
+
+
+def server_run(env: dict, timeout_s: float):
+    """(ms to first healthy /health, ms to 200 on /ready) for one fresh server."""
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        health = _wait_for(f"http://127.0.0.1:{port}/health", started, timeout_s)
+        ready = _wait_for(f"http://127.0.0.1:{port}/ready", started, timeout_s)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return health, ready
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-warmup", action="store_true", help="WARMUP_ON_STARTUP=false (/ready warms on first probe)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    env = _env(warmup=not args.no_warmup)
+    imports, healths, readies = [], [], []
+    for _ in range(args.runs):
+        imports.append(import_time_ms(env))
+        health, ready = server_run(env, args.timeout)
+        healths.append(health)
+        readies.append(ready)
+
+    print(f"{'metric':<24} {'p50 ms':>8} {'max ms':>8}")
+    for name, values in (("import backend.main", imports), ("process -> /health 200", healths),
+                         ("process -> /ready 200", readies)):
+        values.sort()
+        print(f"{name:<24} {percentile(values, 50):>8.0f} {values[-1]:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Shared helpers for the offline benchmarks."""
+
+from typing import Dict, List
+import os
+import tempfile
+
+
+def isolated_env(**overrides: str) -> str:
+    """
+    Point all on-disk state at a fresh temp directory and apply env overrides.
+
+    Must run before importing backend modules, since backend.app.core.config
+    reads the environment at import time.
+
+    Returns:
+        The temp directory used for vector indexes and caches
+    """
+    workdir = tempfile.mkdtemp(prefix="videotwin-bench-")
+    os.environ.setdefault("CHROMA_PERSIST_DIR", os.path.join(workdir, "chroma"))
+    os.environ.setdefault("VECTOR_INDEX_DIR", os.path.join(workdir, "vector_index"))
+    os.environ.setdefault("EMBEDDING_CACHE_PATH", os.path.join(workdir, "cache", "embeddings.sqlite3"))
+    for name, value in overrides.items():
+        os.environ[name] = value
+    return workdir
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def latency_summary(latencies_s: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max in milliseconds."""
+    values = sorted(latencies_s)
+    return {
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": (values[-1] if values else 0.0) * 1000,
+    }
@@ -0,0 +1,97 @@
+"""
+Synthetic YouTube JSON3 caption payloads for offline benchmarks.
+
+FIXTURES names a standard set from 5 minutes to 4 hours. Payloads are
+generated deterministically on demand; write them out as .json3 files with:
+
+    python -m benchmarks.fixtures --out /tmp/caption_fixtures
+"""
+
+from typing import Any, Dict
+import argparse
+import json
+import os
+import random
+
+_WORDS = (
+    "so today we are going to talk about how the model learns from data and "
+    "why that matters for building reliable systems in production you know "
+    "the key idea is really simple but the details make all the difference"
+).split()
+
+# Topic vocabulary rotates every minute or so, giving chunks distinct content
+# (names, numbers, terms) for lexical retrieval and de-duplication to act on
+_TOPICS = (
+    "kubernetes cluster scheduler pods autoscaling 2014 google borg",
+    "gradient descent learning rate momentum adam optimizer 0.001",
+    "database index btree postgres vacuum replication wal",
+    "transformer attention heads embeddings tokens vaswani 2017",
+    "coffee espresso grinder roast ethiopia brewing ratio",
+    "marathon training tempo runs intervals boston qualifier",
+    "startup funding seed series investors runway valuation",
+    "rust ownership borrow checker lifetimes cargo crates",
+    "telescope galaxy redshift hubble nebula exoplanet",
+    "guitar chords pentatonic scale fretboard capo tuning",
+)
+
+# Standard fixture set: name -> duration in seconds
+FIXTURES = {
+    "5m": 5 * 60,
+    "30m": 30 * 60,
+    "1h": 60 * 60,
+    "2h": 2 * 60 * 60,
+    "4h": 4 * 60 * 60,
+}
+
+
+def synthetic_json3(duration_s: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Build a JSON3 payload shaped like YouTube auto-captions.
+
+    Events start every ~2-3 seconds with 3-7 word segments carrying
+    tOffsetMs, interleaved with the newline-only events YouTube emits.
+    """
+    rng = random.Random(seed)
+    events = []
+    t_ms = 0
+    end_ms = duration_s * 1000
+    topic = rng.choice(_TOPICS).split()
+    next_topic_ms = rng.randint(45000, 90000)
+    while t_ms < end_ms:
+        if t_ms >= next_topic_ms:
+            topic = rng.choice(_TOPICS).split()
+            next_topic_ms = t_ms + rng.randint(45000, 90000)
+        duration = rng.randint(2000, 3000)
+        segs = []
+        offset = 0
+        for i in range(rng.randint(3, 7)):
+            word = rng.choice(topic) if rng.random() < 0.3 else rng.choice(_WORDS)
+            segs.append({"utf8": word if i == 0 else f" {word}", "tOffsetMs": offset})
+            offset += rng.randint(150, 450)
+        events.append({"tStartMs": t_ms, "dDurationMs": duration, "wWinId": 1, "segs": segs})
+        events.append({"tStartMs": t_ms + duration, "dDurationMs": 10, "wWinId": 1, "aAppend": 1, "segs": [{"utf8": "\n"}]})
+        t_ms += duration
+    return {"wireMagic": "pb3", "events": events}
+
+
+def fixture(name: str, seed: int = 0) -> Dict[str, Any]:
+    """Payload for a named fixture from FIXTURES (e.g. "1h")."""
+    return synthetic_json3(FIXTURES[name], seed=seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="directory for <name>.json3 files")
+    parser.add_argument("--fixtures", default=",".join(FIXTURES))
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for name in args.fixtures.split(","):
+        path = os.path.join(args.out, f"fixture_{name}.json3")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(fixture(name), f)
+        print(f"{path}: {os.path.getsize(path) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
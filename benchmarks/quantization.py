@@ -0,0 +1,97 @@
+"""
+Quantized vector storage benchmark: float32 vs float16 vs int8 (per-vector scale).
+
+Builds one NumPy flat index per mode over the same synthetic corpus
+(clustered unit vectors, like topical transcript chunks) with the float32
+rows saved and memory-mapped, as in the service. Queries are perturbed
+corpus vectors. Reports resident vector memory, query p50/p95 and
+recall@k of the quantized search (approximate scan + exact re-score of
+the candidates) against exact float32 search, plus recall without the
+re-score step to show what it buys.
+
+Usage:
+    python -m benchmarks.quantization --chunks 5000,50000 --queries 300 --candidates 32
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import isolated_env, latency_summary
+
+isolated_env()
+
+from backend.app.core import config  # noqa: E402
+from backend.app.services.vector_index import NumpyBackend  # noqa: E402
+
+
+def corpus(n: int, dim: int, rng: np.random.Generator, clusters: int = 64):
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build(mode: str, vectors: np.ndarray, candidates: int, batch_size: int):
+    backend = NumpyBackend(config.VECTOR_INDEX_DIR, quantization=mode, rerank_candidates=candidates)
+    video_id = f"bench_{mode}"
+    index = backend.create(video_id)
+    for start in range(0, len(vectors), batch_size):
+        ids = list(range(start, min(start + batch_size, len(vectors))))
+        index.add(ids, vectors[start : start + batch_size], [""] * len(ids), [{"chunk": i} for i in ids])
+    backend.finalize(video_id, index)
+    return backend, video_id, index
+
+
+def search(index, queries: np.ndarray, k: int):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        hits = index.search(query, k=k)
+        latencies.append(time.perf_counter() - started)
+        results.append({doc.metadata["chunk"] for doc, _ in hits})
+    return latency_summary(latencies), results
+
+
+def approximate_only(index, queries: np.ndarray, k: int):
+    """Top-k straight from the quantized scan (no exact re-score), for comparison."""
+    scores = index._approximate_scores(index._normalize(queries), index._codes, index._scales)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", default="5000,50000")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--dim", type=int, default=config.EMBEDDING_DIMENSIONS)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--candidates", type=int, default=config.VECTOR_RERANK_CANDIDATES)
+    parser.add_argument("--batch-size", type=int, default=config.EMBED_BATCH_SIZE)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'chunks':>7} {'mode':<8} {'resident MB':>12} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'recall@k':>9} {'no-rescore':>11}")
+    for n in (int(c) for c in args.chunks.split(",")):
+        vectors = corpus(n, args.dim, rng)
+        picks = rng.integers(0, n, args.queries)
+        queries = vectors[picks] + 0.3 * rng.standard_normal((args.queries, args.dim)).astype(np.float32) / np.sqrt(args.dim) * 10
+        exact = None
+        for mode in ("none", "float16", "int8"):
+            backend, video_id, index = build(mode, vectors, args.candidates, args.batch_size)
+            summary, results = search(index, queries, args.k)
+            if exact is None:
+                exact = results
+            recall = np.mean([len(r & e) / args.k for r, e in zip(results, exact)])
+            no_rescore = "-"
+            if mode != "none":
+                rough = approximate_only(index, queries, args.k)
+                no_rescore = f"{np.mean([len(r & e) / args.k for r, e in zip(rough, exact)]):.3f}"
+            print(f"{n:>7} {mode:<8} {index.nbytes() / 2**20:>12.1f} {summary['p50_ms']:>8.3f} "
+                  f"{summary['p95_ms']:>8.3f} {recall:>9.3f} {no_rescore:>11}")
+            backend.drop(video_id)
+
+
+if __name__ == "__main__":
+    main()
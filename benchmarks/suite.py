@@ -0,0 +1,174 @@
+"""
+Offline benchmark suite: ingest throughput, memory peak and chat latency.
+
+Runs the real pipeline (parse -> chunk -> embed -> index, then retrieval +
+generation) against the standard caption fixtures, with the fake embedding
+and chat providers standing in for Google. Fakes simulate per-request
+latency and 429s, so the adaptive rate limiter and retries are exercised.
+
+Per fixture it reports:
+  - chunks and ingest throughput (chunks/s, embedding + indexing)
+  - embedding requests made by the ingest, and query embeddings made by chat
+  - tracemalloc peak during parse/chunk/ingest
+  - chat p50/p95/p99 at the given concurrency
+
+--json writes the results; --baseline compares against an earlier --json
+file and exits non-zero when throughput drops or latency/memory grow by
+more than --tolerance, so regressions can be caught in CI.
+
+Usage:
+    python -m benchmarks.suite --fixtures 5m,30m,1h --embed-latency 0.05 \\
+        --rate-limit-every 25 --chat-requests 100 --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import isolated_env, latency_summary
+
+
+def build_service(args):
+    isolated_env(
+        EMBEDDING_CACHE_ENABLED="false",
+        ANSWER_CACHE_ENABLED="false",
+        TRANSCRIPT_CACHE_ENABLED="false",
+        EMBED_REQUESTS_PER_SECOND=str(args.embed_rps),
+        EMBED_MAX_REQUESTS_PER_SECOND=str(max(args.embed_rps, 50)),
+    )
+    from backend.app.services.fake_providers import FakeChatModel, FakeEmbeddings
+    from backend.app.services.ingestion import IngestionService
+    from backend.app.services.rag_service import RAGService
+    from backend.app.services.vector_store import VectorStoreService
+
+    embeddings = FakeEmbeddings(
+        size=args.dim,
+        latency_s=args.embed_latency,
+        rate_limit_every=args.rate_limit_every,
+    )
+    llm = FakeChatModel(latency_s=args.llm_latency, rate_limit_every=0)
+    rag = RAGService(vector_store_service=VectorStoreService(embeddings=embeddings), llm=llm)
+    return IngestionService(), rag, embeddings
+
+
+def ingest(ingestion, rag, video_id: str, payload):
+    """Parse, chunk and index one fixture; returns (chunks, seconds, peak bytes)."""
+    from backend.app.services.transcript import Transcript
+
+    tracemalloc.start()
+    transcript = Transcript.from_json3(payload)
+    chunks = ingestion.chunk_transcript(transcript)
+    started = time.perf_counter()
+    rag.ingest_chunks(video_id, chunks)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(chunks), elapsed, peak
+
+
+async def chat_latencies(rag, video_id: str, total: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    questions = [
+        "what does the speaker say about kubernetes autoscaling?",
+        "how should I pick a learning rate?",
+        "what was said about espresso brewing ratio?",
+        "why does this matter for reliable systems in production?",
+        "what is the key idea of the talk?",
+    ]
+
+    async def one(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await rag.aask_question(f"{questions[i % len(questions)]} ({i})", video_id)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return latencies
+
+
+def compare(results, baseline, tolerance: float) -> list:
+    """Regressions versus a baseline run: (fixture, metric, baseline, current)."""
+    regressions = []
+    higher_is_better = {"chunks_per_s"}
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("chunks_per_s", "peak_mib", "chat_p50_ms", "chat_p95_ms", "chat_p99_ms"):
+            if metric not in previous:
+                continue
+            before, now = previous[metric], current[metric]
+            if metric in higher_is_better:
+                worse = now < before * (1 - tolerance)
+            else:
+                worse = now > before * (1 + tolerance)
+            if worse:
+                regressions.append((name, metric, before, now))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default="5m,30m,1h,2h,4h")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--embed-latency", type=float, default=0.05, help="seconds per embedding request")
+    parser.add_argument("--embed-rps", type=float, default=20.0, help="EMBED_REQUESTS_PER_SECOND start rate")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="simulate a 429 every N embedding requests")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per LLM call")
+    parser.add_argument("--chat-requests", type=int, default=100)
+    parser.add_argument("--chat-concurrency", type=int, default=16)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    ingestion, rag, embeddings = build_service(args)
+    from benchmarks.fixtures import fixture
+
+    results = {}
+    print(f"{'fixture':<8} {'chunks':>7} {'ingest s':>9} {'chunks/s':>9} {'peak MiB':>9} "
+          f"{'requests':>9} {'queries':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name in args.fixtures.split(","):
+        video_id = f"fixture{name}"
+        requests_before = embeddings.requests
+        chunks, elapsed, peak = ingest(ingestion, rag, video_id, fixture(name))
+        # Read before chat: FakeEmbeddings.requests also counts embed_query calls
+        requests_after_ingest = embeddings.requests
+        latencies = asyncio.run(chat_latencies(rag, video_id, args.chat_requests, args.chat_concurrency))
+        summary = latency_summary(latencies)
+        results[name] = {
+            "chunks": chunks,
+            "ingest_s": round(elapsed, 3),
+            "chunks_per_s": round(chunks / elapsed, 1) if elapsed else 0.0,
+            "peak_mib": round(peak / 2**20, 2),
+            "embed_requests": requests_after_ingest - requests_before,
+            "chat_query_embeds": embeddings.requests - requests_after_ingest,
+            "chat_p50_ms": round(summary["p50_ms"], 1),
+            "chat_p95_ms": round(summary["p95_ms"], 1),
+            "chat_p99_ms": round(summary["p99_ms"], 1),
+        }
+        r = results[name]
+        print(f"{name:<8} {chunks:>7} {r['ingest_s']:>9.2f} {r['chunks_per_s']:>9.1f} {r['peak_mib']:>9.2f} "
+              f"{r['embed_requests']:>9} {r['chat_query_embeds']:>8} {r['chat_p50_ms']:>8.0f} {r['chat_p95_ms']:>8.0f} {r['chat_p99_ms']:>8.0f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for name, metric, before, now in regressions:
+            print(f"REGRESSION {name} {metric}: {before} -> {now}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} versus {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
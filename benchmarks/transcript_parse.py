@@ -0,0 +1,87 @@
+"""
+JSON3 transcript parse benchmark: legacy string list vs compact Transcript.
+
+Parses a synthetic caption payload (3 hours by default) with:
+  - legacy:  the old loop collecting a list of small strings, then " ".join
+  - dicts:   one {"text", "start_ms", "duration_ms"} dict per segment
+  - compact: Transcript.from_json3 (single buffer + int32 timing columns)
+
+Reports parse time and tracemalloc peak / retained memory for each.
+
+Usage:
+    python -m benchmarks.transcript_parse --hours 3 --repeat 5
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.fixtures import synthetic_json3
+from backend.app.services.transcript import Transcript
+
+
+def parse_legacy(data):
+    full_text = []
+    for event in data["events"]:
+        if "segs" in event:
+            for seg in event["segs"]:
+                if "utf8" in seg and seg["utf8"] != "\n":
+                    full_text.append(seg["utf8"])
+    return " ".join(full_text)
+
+
+def parse_dicts(data):
+    segments = []
+    for event in data["events"]:
+        if "segs" in event:
+            start_ms = event.get("tStartMs", 0)
+            duration_ms = event.get("dDurationMs", 0)
+            for seg in event["segs"]:
+                if "utf8" in seg and seg["utf8"] != "\n":
+                    segments.append({
+                        "text": seg["utf8"],
+                        "start_ms": start_ms + seg.get("tOffsetMs", 0),
+                        "duration_ms": duration_ms,
+                    })
+    return segments
+
+
+PARSERS = {
+    "legacy": parse_legacy,
+    "dicts": parse_dicts,
+    "compact": Transcript.from_json3,
+}
+
+
+def measure(parser, data, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parser(data)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = parser(data)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return min(timings), peak, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = synthetic_json3(int(args.hours * 3600))
+    segments = len(Transcript.from_json3(data))
+    print(f"Fixture: {args.hours:g}h, {len(data['events'])} events, {segments} segments")
+    print(f"{'parser':<8} {'best ms':>9} {'peak MiB':>9} {'retained MiB':>13}")
+    for name, fn in PARSERS.items():
+        best, peak, retained = measure(fn, data, args.repeat)
+        print(f"{name:<8} {best * 1000:>9.1f} {peak / 2**20:>9.2f} {retained / 2**20:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
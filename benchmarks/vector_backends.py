@@ -0,0 +1,86 @@
+"""
+Vector backend benchmark: in-process NumPy flat index vs Chroma.
+
+For each backend, ingests synthetic chunks (random vectors) in
+embedding-sized batches, then runs single-query top-k searches. Reports
+backend startup (once), ingest time, query p50/p95/p99, and recall@k of
+Chroma's approximate HNSW search against the exact NumPy result.
+
+Usage:
+    python -m benchmarks.vector_backends --chunks 500,5000 --queries 500 --dim 768
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import isolated_env, latency_summary
+
+isolated_env()
+
+from backend.app.core import config  # noqa: E402
+from backend.app.services.vector_index import ChromaBackend, NumpyBackend  # noqa: E402
+
+
+def make_backend(name: str):
+    if name == "numpy":
+        return NumpyBackend(config.VECTOR_INDEX_DIR)
+    return ChromaBackend(config.CHROMA_PERSIST_DIR)
+
+
+def run(backend, vectors: np.ndarray, queries: np.ndarray, k: int, batch_size: int):
+    texts = [f"chunk {i}" for i in range(len(vectors))]
+    started = time.perf_counter()
+    index = backend.create("benchvideo0")
+    for start in range(0, len(vectors), batch_size):
+        ids = list(range(start, min(start + batch_size, len(vectors))))
+        index.add(ids, vectors[start : start + batch_size].tolist(), [texts[i] for i in ids],
+                  [{"chunk": i} for i in ids])
+    backend.finalize("benchvideo0", index)
+    ingest = time.perf_counter() - started
+
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        hits = index.search(query.tolist(), k=k)
+        latencies.append(time.perf_counter() - started)
+        results.append({doc.metadata["chunk"] for doc, _ in hits})
+    backend.drop("benchvideo0")
+    return ingest, latency_summary(latencies), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", default="500,5000")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--dim", type=int, default=config.EMBEDDING_DIMENSIONS)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=config.EMBED_BATCH_SIZE)
+    args = parser.parse_args()
+
+    # One backend per process, as in the service (Chroma clears its directory on startup)
+    backends, startup = {}, {}
+    for name in ("numpy", "chroma"):
+        started = time.perf_counter()
+        backends[name] = make_backend(name)
+        startup[name] = time.perf_counter() - started
+
+    rng = np.random.default_rng(0)
+    print(f"{'chunks':>7} {'backend':<7} {'startup ms':>11} {'ingest ms':>10} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'recall@k':>9}")
+    for n in (int(c) for c in args.chunks.split(",")):
+        vectors = rng.standard_normal((n, args.dim)).astype(np.float32)
+        queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+        exact = None
+        for name, backend in backends.items():
+            ingest, summary, results = run(backend, vectors, queries, args.k, args.batch_size)
+            if exact is None:
+                exact = results
+            recall = np.mean([len(r & e) / args.k for r, e in zip(results, exact)])
+            print(f"{n:>7} {name:<7} {startup[name] * 1000:>11.1f} {ingest * 1000:>10.1f} "
+                  f"{summary['p50_ms']:>8.3f} {summary['p95_ms']:>8.3f} {summary['p99_ms']:>8.3f} {recall:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
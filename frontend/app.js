@@ -8,31 +8,27 @@ const chatHistory = document.getElementById('chat-history');
 const userQueryInput = document.getElementById('user-query');
 const sendBtn = document.getElementById('send-btn');
 
+// Video the chat is bound to; set from the /ingest response
+let currentVideoId = null;
+
+// Human-readable labels for the backend's ingestion stages
+const STAGE_LABELS = {
+    queued: "Waiting for a free worker...",
+    fetching_transcript: "Downloading subtitles...",
+    embedding: "Generating embeddings...",
+    summarizing: "Summarizing the video...",
+    done: "Finishing up..."
+};
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
 ingestBtn.addEventListener('click', async () => {
     const url = videoUrlInput.value.trim();
     if (!url) return;
 
     ingestBtn.disabled = true;
     statusMessage.className = "";
-
-    // Simulate progress steps
-    const steps = [
-        "Downloading subtitles...",
-        "Chunking transcript...",
-        "Generating embeddings...",
-        "Storing in vector database..."
-    ];
-
-    let stepIndex = 0;
-    statusMessage.textContent = steps[0];
-
-    // Start a simulated progress interval
-    const progressInterval = setInterval(() => {
-        stepIndex++;
-        if (stepIndex < steps.length) {
-            statusMessage.textContent = steps[stepIndex];
-        }
-    }, 1500); // Change message every 1.5 seconds
+    statusMessage.textContent = "Submitting video...";
 
     try {
         const response = await fetch(`${API_URL}/ingest`, {
@@ -43,17 +39,51 @@ ingestBtn.addEventListener('click', async () => {
             body: JSON.stringify({ url: url })
         });
 
-        clearInterval(progressInterval); // Stop the simulated progress
-
         if (!response.ok) {
             const errorData = await response.json();
             throw new Error(errorData.detail || 'Ingestion failed');
         }
 
         const data = await response.json();
+
+        // Poll the background job until it finishes; chat opens as soon as
+        // the backend reports the video searchable (chat_ready_at)
+        let job = data;
+        while (job.status === 'queued' || job.status === 'running') {
+            await sleep(1000);
+            const jobResponse = await fetch(`${API_URL}/jobs/${data.job_id}`);
+            if (!jobResponse.ok) throw new Error('Lost track of ingestion job');
+            job = await jobResponse.json();
+
+            if (job.chat_ready_at && currentVideoId !== data.video_id) {
+                currentVideoId = data.video_id;
+                chatSection.classList.remove('hidden');
+            }
+
+            let label = STAGE_LABELS[job.stage] || job.stage;
+            if (job.stage === 'embedding' && job.chunks_total) {
+                label += ` (${job.chunks_embedded}/${job.chunks_total} chunks)`;
+            }
+            if (currentVideoId === data.video_id) {
+                label += ' You can start chatting now.';
+            }
+            statusMessage.textContent = label;
+        }
+
+        if (job.status === 'failed') {
+            // A partially indexed video is withdrawn when its ingest fails
+            if (currentVideoId === data.video_id) {
+                currentVideoId = null;
+                chatSection.classList.add('hidden');
+            }
+            throw new Error(job.error || 'Ingestion failed');
+        }
+
+        currentVideoId = data.video_id;
         statusMessage.innerHTML = '<i class="fa-solid fa-circle-check" style="color: #10b981;"></i> Ingestion complete! Now you can chat with the video.';
         statusMessage.style.borderLeftColor = "#10b981"; // Green border
         chatSection.classList.remove('hidden');
+        ingestBtn.disabled = false;
 
         // Auto-hide after 5 seconds
         setTimeout(() => {
@@ -61,7 +91,6 @@ ingestBtn.addEventListener('click', async () => {
         }, 5000);
 
     } catch (error) {
-        clearInterval(progressInterval);
         statusMessage.innerHTML = '<i class="fa-solid fa-circle-exclamation" style="color: #ef4444;"></i> Error: ' + error.message;
         statusMessage.style.borderLeftColor = "#ef4444"; // Red border
         ingestBtn.disabled = false;
@@ -83,12 +112,13 @@ async function sendMessage() {
     sendBtn.disabled = true;
 
     try {
-        const response = await fetch(`${API_URL}/chat`, {
+        const response = await fetch(`${API_URL}/chat/stream`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'Accept': 'text/event-stream',
             },
-            body: JSON.stringify({ question: query })
+            body: JSON.stringify({ question: query, video_id: currentVideoId })
         });
 
         if (!response.ok) {
@@ -96,8 +126,33 @@ async function sendMessage() {
             throw new Error(errorData.detail || 'Chat failed');
         }
 
-        const data = await response.json();
-        appendMessage(data.answer, 'ai');
+        // Render tokens into one AI bubble as they arrive
+        const answerEl = appendMessage('', 'ai');
+        await readEventStream(response, (event, data) => {
+            if (event === 'token') {
+                answerEl.textContent += data.text;
+                chatHistory.scrollTop = chatHistory.scrollHeight;
+            } else if (event === 'done') {
+                // Cite where in the video the answer came from, and label
+                // answers given while the video was still being indexed
+                const notes = [];
+                if (data.sources && data.sources.length) {
+                    const stamps = [...new Set(data.sources.map(s => s.timestamp))];
+                    notes.push('Sources: ' + stamps.join(', '));
+                }
+                if (data.coverage !== undefined && data.coverage < 1) {
+                    notes.push(`Answered from ${Math.round(data.coverage * 100)}% of the video (still indexing)`);
+                }
+                if (notes.length) {
+                    const cite = document.createElement('div');
+                    cite.classList.add('message-sources');
+                    cite.textContent = notes.join(' · ');
+                    answerEl.parentElement.appendChild(cite);
+                }
+            } else if (event === 'error') {
+                throw new Error(data.detail);
+            }
+        });
         sendBtn.disabled = false;
 
     } catch (error) {
@@ -106,7 +161,32 @@ async function sendMessage() {
     }
 }
 
-
+// Minimal SSE parser over a fetch() body (EventSource only supports GET)
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of frame.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
 
 function appendMessage(text, sender) {
     const div = document.createElement('div');
@@ -115,14 +195,18 @@ function appendMessage(text, sender) {
     const contentDiv = document.createElement('div');
     contentDiv.classList.add('message-content');
 
+    // Element that holds the message text; returned so streamed tokens can be appended
+    let textEl = contentDiv;
     if (sender === 'ai') {
-        contentDiv.innerHTML = '<i class="fa-solid fa-robot" style="margin-right: 8px; color: var(--primary-color);"></i> ' + text;
-    } else {
-        contentDiv.textContent = text;
+        contentDiv.innerHTML = '<i class="fa-solid fa-robot" style="margin-right: 8px; color: var(--primary-color);"></i> ';
+        textEl = document.createElement('span');
+        contentDiv.appendChild(textEl);
     }
+    textEl.textContent = text;
 
     div.appendChild(contentDiv);
 
     chatHistory.appendChild(div);
     chatHistory.scrollTop = chatHistory.scrollHeight;
+    return textEl;
 }